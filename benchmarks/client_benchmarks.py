@@ -0,0 +1,123 @@
+"""Measures the client's overhead and throughput against a local Marqo stand-in.
+
+The stand-in server (tests/marqo_stand_in.py) answers in-process with synthetic
+results, so the numbers measure the client, the HTTP stack and the loopback network,
+without a Marqo instance, a GPU or a remote network. With --latency, each request also
+waits that long on the server, to see how well concurrent operations hide the latency.
+
+Each operation runs once to warm up, then --runs times. The median and 95th percentile
+times are reported, with throughput in operations or documents per second.
+
+Usage:
+    python benchmarks/client_benchmarks.py
+    python benchmarks/client_benchmarks.py --runs 50 --docs 1000 --latency 0.01 --json results.json
+    python benchmarks/client_benchmarks.py --only search bulk_search
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(REPO_DIR, "src"), REPO_DIR]
+
+import marqo  # noqa: E402
+from marqo.version import __marqo_version__  # noqa: E402
+from tests.marqo_stand_in import MarqoStandIn  # noqa: E402
+
+INDEX_NAME = "benchmark-index"
+
+
+def _documents(count: int, text_bytes: int) -> List[Dict[str, str]]:
+    return [{"_id": str(i), "title": f"document {i}", "text": "x" * text_bytes} for i in range(count)]
+
+
+def _benchmarks(index: "marqo.index.Index", client: "marqo.Client", args: argparse.Namespace) \
+        -> Dict[str, Tuple[int, Callable[[], None]]]:
+    """The operations to time, with the number of documents or queries each one handles."""
+    documents = _documents(args.docs, args.text_bytes)
+    updates = [{"_id": doc["_id"], "title": "updated"} for doc in documents]
+    ids = [doc["_id"] for doc in documents]
+    queries = [{"index": INDEX_NAME, "q": f"query {i}", "limit": 10} for i in range(args.queries)]
+    return {
+        "search": (1, lambda: index.search("query", limit=10)),
+        "bulk_search": (len(queries), lambda: client.bulk_search(queries)),
+        "add_documents": (len(documents), lambda: index.add_documents(documents, tensor_fields=["text"])),
+        "add_documents_batched": (len(documents), lambda: index.add_documents(
+            documents, tensor_fields=["text"], client_batch_size=args.batch_size)),
+        "get_documents": (len(ids), lambda: index.get_documents(ids)),
+        "update_documents": (len(updates), lambda: index.update_documents(updates)),
+        "update_documents_batched": (len(updates), lambda: index.update_documents(
+            updates, client_batch_size=args.batch_size, client_concurrency=args.concurrency)),
+    }
+
+
+def _time(fn: Callable[[], None], runs: int) -> List[float]:
+    fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(args: argparse.Namespace) -> Dict:
+    results = {}
+    with MarqoStandIn(latency=args.latency, hits_per_query=10, hit_bytes=args.hit_bytes) as server:
+        client = marqo.Client(server.url)
+        # batched operations log every batch at INFO
+        marqo.set_log_level(logging.WARNING)
+        client.create_index(INDEX_NAME)
+        index = client.index(INDEX_NAME)
+        for name, (items, fn) in _benchmarks(index, client, args).items():
+            if args.only and name not in args.only:
+                continue
+            requests_before = server.request_count
+            times = _time(fn, args.runs)
+            median = statistics.median(times)
+            results[name] = {
+                "items": items,
+                "requests_per_run": (server.request_count - requests_before) // (args.runs + 1),
+                "median_ms": round(median * 1000, 3),
+                "p95_ms": round(sorted(times)[int(0.95 * (len(times) - 1))] * 1000, 3),
+                "ops_per_s": round(1 / median, 1),
+                "items_per_s": round(items / median, 1),
+            }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per operation")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the server waits per request")
+    parser.add_argument("--docs", type=int, default=200, help="documents per add, get and update call")
+    parser.add_argument("--text-bytes", type=int, default=200, help="size of each document's text field")
+    parser.add_argument("--queries", type=int, default=50, help="queries per bulk_search call")
+    parser.add_argument("--hit-bytes", type=int, default=100, help="size of the text field of each search hit")
+    parser.add_argument("--batch-size", type=int, default=50, help="client_batch_size of the batched operations")
+    parser.add_argument("--concurrency", type=int, default=4, help="client_concurrency of update_documents_batched")
+    parser.add_argument("--only", nargs="+", help="only run these operations")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "only")}
+    output = json.dumps({
+        "python": sys.version.split()[0],
+        "marqo_client": __marqo_version__,
+        "config": config,
+        "results": run(args),
+    }, indent=2)
+    print(output)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Measures how long importing the Marqo client takes, using `python -X importtime`.
+
+Each statement is imported in fresh interpreters several times, and the median total
+import time is reported along with the slowest modules of the last run. With --max-ms,
+the script exits with status 1 when a median exceeds the budget, so it can guard
+against regressions in CI.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --json results.json --max-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+STATEMENTS = {
+    "import marqo": "import marqo",
+    "from marqo import Client": "from marqo import Client",
+}
+
+# modules that `import marqo` on its own must not load
+HEAVY_MODULES = ("requests", "pydantic", "packaging", "numpy", "asyncio")
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def _run(statement: str) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """Imports in a fresh interpreter. Returns the total import time in ms, the self time
+    of each module in ms and the heavy modules that were loaded."""
+    check = f"; import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement + check],
+                          capture_output=True, text=True, env=env, check=True)
+    total_us = 0
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        modules.append((name.strip(), int(self_us) / 1000))
+        # top-level imports of the package, excluding interpreter startup (site, encodings, ...)
+        if name.startswith("marqo"):
+            total_us += int(cumulative_us)
+    loaded = [module for module in proc.stdout.strip().split(",") if module]
+    return total_us / 1000, modules, loaded
+
+
+def measure(statement: str, runs: int) -> Dict:
+    totals = []
+    for _ in range(runs):
+        total_ms, modules, loaded = _run(statement)
+        totals.append(total_ms)
+    slowest = sorted(modules, key=lambda module: module[1], reverse=True)[:10]
+    return {
+        "median_ms": round(statistics.median(totals), 2),
+        "min_ms": round(min(totals), 2),
+        "max_ms": round(max(totals), 2),
+        "heavy_modules_loaded": loaded,
+        "slowest_modules_ms": {name: round(ms, 2) for name, ms in slowest},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="interpreters started per statement")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--max-ms", type=float, help="fail if the median time of `import marqo` exceeds this")
+    args = parser.parse_args()
+
+    results = {name: measure(statement, args.runs) for name, statement in STATEMENTS.items()}
+    output = json.dumps({"python": sys.version.split()[0], "runs": args.runs, "results": results}, indent=2)
+    print(output)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+
+    failed = False
+    if results["import marqo"]["heavy_modules_loaded"]:
+        print(f"`import marqo` loaded {results['import marqo']['heavy_modules_loaded']}", file=sys.stderr)
+        failed = True
+    if args.max_ms is not None and results["import marqo"]["median_ms"] > args.max_ms:
+        print(f"`import marqo` took {results['import marqo']['median_ms']} ms, over the {args.max_ms} ms budget",
+              file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
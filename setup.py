@@ -13,6 +13,10 @@ setup(
         "typing-extensions>=4.5.0",
         "packaging"
     ],
+    extras_require={
+        "numpy": ["numpy"],
+        "parquet": ["pyarrow"],
+    },
     tests_require=[
         "pytest",
         "tox"
@@ -1,10 +1,35 @@
-from marqo.client import Client
-from marqo.enums import SearchMethods
-from marqo.version import supported_marqo_version
+import importlib
+import importlib.util
 import logging
 
+# Public names are imported from their modules on first access, so that `import marqo`
+# does not load requests, pydantic and packaging until the client is used.
+_LAZY_ATTRIBUTES = {
+    "Client": "marqo.client",
+    "SearchMethods": "marqo.enums",
+    "supported_marqo_version": "marqo.version",
+}
+
+__all__ = ["Client", "SearchMethods", "supported_marqo_version", "set_log_level"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name), name)
+    elif importlib.util.find_spec(f"{__name__}.{name}") is not None:
+        # submodules, such as marqo.errors, resolve as they did when the client was imported eagerly
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 def set_log_level(level):
     package_logger = logging.getLogger('marqo')
     package_logger.setLevel(level)
-
@@ -0,0 +1,65 @@
+"""Helpers for running Marqo requests concurrently from a single client.
+
+Requests are I/O bound, so plain threads are used. All helpers fall back to
+running inline when asked for a single worker, which keeps the default
+behaviour of the client strictly sequential.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_ordered(fn: Callable[[T], R], items: Iterable[T], max_workers: int) -> Iterator[R]:
+    """Applies `fn` to every item on a thread pool and yields the results in input order.
+
+    At most 2 * max_workers items are in flight at any time, and `items` is
+    consumed lazily, so arbitrarily long iterables are processed in bounded
+    memory. If `fn` raises, the exception is re-raised when its result is
+    reached and items that have not started yet are cancelled.
+
+    Args:
+        fn: function to apply to each item
+        items: the items to process
+        max_workers: maximum number of concurrent calls to `fn`
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    max_in_flight = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def prefetch(iterator: Iterator[T]) -> Iterator[T]:
+    """Yields the items of `iterator`, computing the next item in a background thread
+    while the caller processes the current one.
+
+    Useful for paginated requests: the next page is fetched while the current page is
+    consumed, taking the round trip off the caller's critical path. At most one item
+    is fetched ahead. If the caller stops early, the generator waits for the
+    in-flight item and then stops.
+    """
+    exhausted = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, exhausted)
+        while True:
+            item = future.result()
+            if item is exhausted:
+                return
+            future = executor.submit(next, iterator, exhausted)
+            yield item
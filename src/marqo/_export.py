@@ -0,0 +1,88 @@
+"""Writers used by Index.export to stream documents to disk one page at a time."""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from marqo import errors
+
+
+class JsonlDocumentWriter:
+    """Writes documents as JSON lines, one document per line."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write_page(self, documents: List[Dict[str, Any]]) -> None:
+        self._file.writelines(json.dumps(doc, ensure_ascii=False) + "\n" for doc in documents)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetDocumentWriter:
+    """Writes documents to a Parquet file, one row group per page.
+
+    The schema is inferred from the first page. Fields that only appear in later
+    pages are dropped and missing fields are written as nulls, so documents
+    should share a schema (as they do in structured indexes).
+
+    Tensor facets are written as a list of {field, content, embedding} structs,
+    so facets of different fields share one column type.
+    """
+
+    def __init__(self, path: str) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise errors.MarqoError(
+                "Exporting to Parquet requires pyarrow. Please install it with `pip install pyarrow`."
+            ) from e
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writer = None
+
+    @staticmethod
+    def _normalise_facets(doc: Dict[str, Any]) -> Dict[str, Any]:
+        facets = doc.get("_tensor_facets")
+        if facets is None:
+            return doc
+        normalised = []
+        for facet in facets:
+            field = next((k for k in facet if k != "_embedding"), None)
+            normalised.append({
+                "field": field,
+                "content": None if field is None else facet[field],
+                "embedding": facet.get("_embedding"),
+            })
+        return {**doc, "_tensor_facets": normalised}
+
+    def write_page(self, documents: List[Dict[str, Any]]) -> None:
+        if not documents:
+            return
+        rows = [self._normalise_facets(doc) for doc in documents]
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(rows)
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            table = self._pa.Table.from_pylist(rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def get_document_writer(path: str, file_format: Optional[str] = None):
+    """Returns a writer for `path`. The format is inferred from the file extension
+    if it is not given."""
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format in ("jsonl", "ndjson"):
+        return JsonlDocumentWriter(path)
+    if file_format in ("parquet", "pq"):
+        return ParquetDocumentWriter(path)
+    raise errors.InvalidArgError(
+        f"Unsupported export format `{file_format}`. Supported formats are `jsonl` and `parquet`."
+    )
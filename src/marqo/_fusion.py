@@ -0,0 +1,114 @@
+"""Fuses the ranked lexical and tensor hit lists of Index.hybrid_search.
+
+The contributions of every hit are computed as NumPy array operations, and hit
+dictionaries are only built for the hits that are returned, so fusing long candidate
+lists stays cheap. Without NumPy, the lists are fused in a loop over the hits that
+ranks them the same way.
+"""
+import heapq
+from typing import Any, Dict, List
+
+from marqo import errors
+from marqo.vectors import import_numpy
+
+_SCORE_KEYS = ("_lexical_score", "_tensor_score")
+
+
+def fuse_hits(lexical_hits: List[Dict[str, Any]], tensor_hits: List[Dict[str, Any]], limit: int,
+              fusion: str, rrf_k: int, lexical_weight: float, dedupe: bool) -> List[Dict[str, Any]]:
+    """Fuses two ranked hit lists, keeping the top `limit`.
+
+    Args:
+        lexical_hits: the lexical hits, best first
+        tensor_hits: the tensor hits, best first
+        limit: the number of fused hits to return
+        fusion: "rrf" or "weighted", as for Index.hybrid_search
+        rrf_k: the rank constant of reciprocal-rank fusion
+        lexical_weight: weight of the lexical scores in weighted fusion
+        dedupe: if True, hits with the same _id are combined
+
+    Returns:
+        The fused hits, best first. Hits with equal scores keep the order in which they
+        first appear in the lexical, then the tensor hits.
+    """
+    try:
+        np = import_numpy()
+    except errors.MarqoError:
+        return _fuse_hits_python(lexical_hits, tensor_hits, limit, fusion, rrf_k, lexical_weight, dedupe)
+    return _fuse_hits_numpy(np, lexical_hits, tensor_hits, limit, fusion, rrf_k, lexical_weight, dedupe)
+
+
+def _fuse_hits_numpy(np, lexical_hits: List[Dict[str, Any]], tensor_hits: List[Dict[str, Any]], limit: int,
+                     fusion: str, rrf_k: int, lexical_weight: float, dedupe: bool) -> List[Dict[str, Any]]:
+    lists = (lexical_hits, tensor_hits)
+    contributions = []
+    for hits, weight in zip(lists, (lexical_weight, 1 - lexical_weight)):
+        if fusion == "rrf":
+            contributions.append(1.0 / (rrf_k + np.arange(1, len(hits) + 1, dtype=np.float64)))
+            continue
+        scores = np.fromiter((hit["_score"] for hit in hits), dtype=np.float64, count=len(hits))
+        score_range = scores.max() - scores.min() if len(hits) else 0.0
+        if score_range:
+            contributions.append(weight * ((scores - scores.min()) / score_range))
+        else:
+            contributions.append(np.full(len(hits), weight * 1.0))
+    all_hits = lexical_hits + tensor_hits
+    if not all_hits or limit <= 0:
+        return []
+
+    if dedupe:
+        ids = np.array([hit["_id"] for hit in all_hits])
+        _, first_rows, groups = np.unique(ids, return_index=True, return_inverse=True)
+        groups = groups.reshape(-1)
+    else:
+        first_rows = groups = np.arange(len(all_hits))
+    fused = np.zeros(len(first_rows))
+    np.add.at(fused, groups, np.concatenate(contributions))
+
+    candidates = np.arange(len(fused))
+    if limit < len(fused):
+        # every group scoring at least the limit-th best score, so ties are broken below as in the fallback
+        kth_score = fused[np.argpartition(-fused, limit - 1)[:limit]].min()
+        candidates = np.flatnonzero(fused >= kth_score)
+    top = candidates[np.lexsort((first_rows[candidates], -fused[candidates]))][:limit]
+
+    # the row of each group in each list; if a list repeats an _id, its last hit gives the score, as in the fallback
+    list_rows = []
+    offset = 0
+    for hits in lists:
+        rows = np.full(len(fused), -1)
+        rows[groups[offset:offset + len(hits)]] = np.arange(len(hits))
+        list_rows.append(rows)
+        offset += len(hits)
+
+    fused_hits = []
+    for group in top.tolist():
+        hit = {**all_hits[first_rows[group]], "_score": float(fused[group])}
+        for hits, rows, score_key in zip(lists, list_rows, _SCORE_KEYS):
+            row = rows[group]
+            hit[score_key] = hits[row]["_score"] if row >= 0 else None
+        fused_hits.append(hit)
+    return fused_hits
+
+
+def _fuse_hits_python(lexical_hits: List[Dict[str, Any]], tensor_hits: List[Dict[str, Any]], limit: int,
+                      fusion: str, rrf_k: int, lexical_weight: float, dedupe: bool) -> List[Dict[str, Any]]:
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for hits, weight, score_key in ((lexical_hits, lexical_weight, "_lexical_score"),
+                                    (tensor_hits, 1 - lexical_weight, "_tensor_score")):
+        if fusion == "weighted" and hits:
+            top_score = max(hit["_score"] for hit in hits)
+            bottom_score = min(hit["_score"] for hit in hits)
+            score_range = top_score - bottom_score
+        for rank, hit in enumerate(hits):
+            if fusion == "rrf":
+                contribution = 1.0 / (rrf_k + rank + 1)
+            else:
+                contribution = weight * ((hit["_score"] - bottom_score) / score_range if score_range else 1.0)
+            key = hit["_id"] if dedupe else (score_key, rank)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {**hit, "_score": 0.0, "_lexical_score": None, "_tensor_score": None}
+            entry["_score"] += contribution
+            entry[score_key] = hit["_score"]
+    return heapq.nlargest(limit, fused.values(), key=lambda hit: hit["_score"])
@@ -1,11 +1,13 @@
 import copy
 import json
+import threading
 from json.decoder import JSONDecodeError
 from typing import get_args, Any, Callable, Dict, Literal, List, Optional, Tuple, Union
 
 import requests
 
 from marqo.config import Config
+from marqo.results import RawResponse
 from marqo.errors import (
     MarqoWebError,
     BackendCommunicationError,
@@ -24,11 +26,33 @@ OPERATION_MAPPING = {
     'patch': session.patch
 }
 
+# the size of the last response body received by each thread
+_last_response = threading.local()
+
 
 class HttpRequests:
     def __init__(self, config: Config) -> None:
         self.config = config
         self.headers = {'x-api-key': config.api_key} if config.api_key else {}
+        # called once, just before the next request is sent
+        self.before_next_request: Optional[Callable[[], None]] = None
+        # held while before_next_request runs, so other threads' requests wait for it. Re-entrant,
+        # as the hook may send requests itself.
+        self._before_next_request_lock = threading.RLock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # locks can't be copied; Clients and their HttpRequests are deep-copied
+        state = self.__dict__.copy()
+        del state["_before_next_request_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._before_next_request_lock = threading.RLock()
+
+    def last_response_bytes(self) -> Optional[int]:
+        """The size of the body of the last response received by the calling thread, if any."""
+        return getattr(_last_response, "num_bytes", None)
 
     def _operation(self, method: HTTP_OPERATIONS) -> Callable:
         if method not in ALLOWED_OPERATIONS:
@@ -54,8 +78,23 @@ class HttpRequests:
         path: str,
         body: Optional[Union[Dict[str, Any], List[Dict[str, Any]], List[str], str]] = None,
         content_type: Optional[str] = None,
-        index_name: str = ""
+        index_name: str = "",
+        response_decoder: Optional[Callable[[bytes], Any]] = None,
+        raw: bool = False
     ) -> Any:
+        """Sends a request to Marqo and returns the decoded response body.
+
+        Args:
+            response_decoder: decodes the raw body of a successful response.
+                Defaults to parsing it as JSON.
+            raw: if True, a successful response is returned as a RawResponse holding the
+                undecoded body and the headers. Errors are raised as usual.
+        """
+        with self._before_next_request_lock:
+            hook, self.before_next_request = self.before_next_request, None
+            if hook is not None:
+                hook()
+
         req_headers = copy.deepcopy(self.headers)
 
         if content_type is not None and content_type:
@@ -72,7 +111,8 @@ class HttpRequests:
                 data=body,
                 verify=True
             )
-            return self._validate(response)
+            _last_response.num_bytes = len(response.content)
+            return self._validate(response, response_decoder, raw)
         except requests.exceptions.Timeout as err:
             raise BackendTimeoutError(str(err)) from err
         except requests.exceptions.ConnectionError as err:
@@ -84,21 +124,27 @@ class HttpRequests:
     def get(
         self, path: str,
         body: Optional[Union[Dict[str, Any], List[Dict[str, Any]], List[str], str]] = None,
-        index_name: str = ""
+        index_name: str = "",
+        response_decoder: Optional[Callable[[bytes], Any]] = None,
+        raw: bool = False
     ) -> Any:
         content_type = None
         if body is not None:
             content_type = 'application/json'
-        return self.send_request('get', path=path, body=body, content_type=content_type,index_name=index_name)
+        return self.send_request('get', path=path, body=body, content_type=content_type,index_name=index_name,
+                                 **self._response_kwargs(response_decoder, raw))
 
     def post(
         self,
         path: str,
         body: Optional[Union[Dict[str, Any], List[Dict[str, Any]], List[str], str]] = None,
         content_type: Optional[str] = 'application/json',
-        index_name: str = ""
+        index_name: str = "",
+        response_decoder: Optional[Callable[[bytes], Any]] = None,
+        raw: bool = False
     ) -> Any:
-        return self.send_request('post', path, body, content_type, index_name=index_name)
+        return self.send_request('post', path, body, content_type, index_name=index_name,
+                                 **self._response_kwargs(response_decoder, raw))
 
     def put(
         self,
@@ -125,6 +171,17 @@ class HttpRequests:
               index_name: str = "") -> Any:
         return self.send_request('patch', path, body, index_name=index_name)
 
+    @staticmethod
+    def _response_kwargs(response_decoder: Optional[Callable[[bytes], Any]], raw: bool) -> Dict[str, Any]:
+        """The response options to pass to send_request. Options left at their defaults are
+        not passed, so send_request keeps its usual call signature."""
+        kwargs: Dict[str, Any] = {}
+        if response_decoder is not None:
+            kwargs["response_decoder"] = response_decoder
+        if raw:
+            kwargs["raw"] = True
+        return kwargs
+
     @staticmethod
     def __to_json(
         request: requests.Response
@@ -135,10 +192,16 @@ class HttpRequests:
 
     @staticmethod
     def _validate(
-        request: requests.Response
+        request: requests.Response,
+        response_decoder: Optional[Callable[[bytes], Any]] = None,
+        raw: bool = False
     ) -> Any:
         try:
             request.raise_for_status()
+            if raw:
+                return RawResponse(request.content, request.headers, request.status_code)
+            if response_decoder is not None and request.content != b'':
+                return response_decoder(request.content)
             return HttpRequests.__to_json(request)
         except requests.exceptions.HTTPError as err:
             convert_to_marqo_error_and_raise(response=request, err=err)
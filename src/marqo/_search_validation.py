@@ -0,0 +1,103 @@
+"""Validates bulk search queries without pydantic.
+
+Most bulk search queries are plain dictionaries of correctly typed values. For these,
+checking the types directly and filling in the defaults is much cheaper than building a
+BulkSearchBody per query. Anything else, such as a missing index, an unknown key or a
+value pydantic would coerce, is left to the pydantic models in marqo.models.search_models,
+which raise the usual errors.
+"""
+import json
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_INVALID = object()
+
+
+def _optional(check: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else check(value)
+
+
+def _str(value: Any) -> Any:
+    if isinstance(value, str):
+        # pydantic sends the value of str enums, such as SearchMethods
+        return value.value if isinstance(value, Enum) else value
+    return _INVALID
+
+
+def _int(value: Any) -> Any:
+    return value if type(value) is int else _INVALID
+
+
+def _bool(value: Any) -> Any:
+    return value if value is True or value is False else _INVALID
+
+
+def _dict(value: Any) -> Any:
+    return value if type(value) is dict else _INVALID
+
+
+def _str_list(value: Any) -> Any:
+    if type(value) is list and all(type(item) is str for item in value):
+        return value
+    return _INVALID
+
+
+def _query(value: Any) -> Any:
+    if type(value) is dict:
+        # weighted queries are Dict[str, float]; pydantic turns integer weights into floats
+        if all(type(key) is str and type(weight) in (float, int) for key, weight in value.items()):
+            return {key: float(weight) for key, weight in value.items()}
+        return _INVALID
+    return _str(value)
+
+
+# The fields of marqo.models.search_models.BulkSearchBody, in the same order, with their
+# defaults and checks. A check returns the value to send, or _INVALID.
+_FIELDS: Tuple[Tuple[str, Any, Callable[[Any], Any]], ...] = (
+    ("q", None, _optional(_query)),
+    ("searchableAttributes", None, _optional(_str_list)),
+    ("searchMethod", "TENSOR", _optional(_str)),
+    ("limit", 10, _int),
+    ("offset", 0, _int),
+    ("showHighlights", True, _bool),
+    ("reRanker", None, _optional(_str)),
+    ("filter", None, _optional(_str)),
+    ("attributesToRetrieve", None, _optional(_str_list)),
+    ("boost", None, _optional(_dict)),
+    ("image_download_headers", None, _optional(_dict)),
+    ("context", None, _optional(_dict)),
+    ("scoreModifiers", None, _optional(_dict)),
+    ("modelAuth", None, _optional(_dict)),
+    ("index", _INVALID, _str),
+)
+_ALLOWED_KEYS = frozenset(name for name, _, _ in _FIELDS)
+
+
+def validate_bulk_search_query(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Validates a bulk search query without pydantic.
+
+    Returns:
+        The query with every field of BulkSearchBody, in the order pydantic serialises
+        them, or None if the query needs the pydantic models to be validated.
+    """
+    if not _ALLOWED_KEYS.issuperset(query):
+        return None
+    body = {}
+    for name, default, check in _FIELDS:
+        value = query.get(name, default)
+        if value is not default:
+            value = check(value)
+        if value is _INVALID:
+            return None
+        body[name] = value
+    return body
+
+
+def dumps_bulk_search_queries(queries: List[Dict[str, Any]]) -> str:
+    """Serialises validated queries as the body of a bulk search request, like BulkSearchQuery.json()."""
+    try:
+        return json.dumps({"queries": queries})
+    except TypeError:
+        # values nested in dictionaries, such as context, may need pydantic's encoders
+        from pydantic.json import pydantic_encoder
+        return json.dumps({"queries": queries}, default=pydantic_encoder)
@@ -0,0 +1,46 @@
+"""An on-disk cache of the Marqo versions found at each url, shared by processes on the same host.
+
+The file maps urls, without credentials, to {"version": ..., "checked_at": <unix time>}.
+Reads and writes never raise: a missing, unreadable or corrupt file is treated as empty.
+"""
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+from marqo.marqo_logging import mq_logger
+from marqo.utils import atomic_write_json, strip_url_credentials
+
+_write_lock = threading.Lock()
+
+
+def _load(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def read_version(path: str, url: str, ttl: float) -> Optional[str]:
+    """Returns the cached version of the Marqo instance at `url`, or None if it is not cached
+    or was checked more than `ttl` seconds ago."""
+    entry = _load(path).get(strip_url_credentials(url))
+    if not isinstance(entry, dict) or not isinstance(entry.get("version"), str):
+        return None
+    checked_at = entry.get("checked_at")
+    if not isinstance(checked_at, (int, float)) or time.time() - checked_at > ttl:
+        return None
+    return entry["version"]
+
+
+def write_version(path: str, url: str, version: str) -> None:
+    """Records the version of the Marqo instance at `url`."""
+    with _write_lock:
+        entries = _load(path)
+        entries[strip_url_credentials(url)] = {"version": version, "checked_at": time.time()}
+        try:
+            atomic_write_json(path, entries)
+        except OSError as e:
+            mq_logger.debug(f"Could not write the Marqo version cache at `{path}`: {e}")
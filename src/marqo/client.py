@@ -1,20 +1,29 @@
 import base64
+import heapq
+import inspect
+import itertools
 import os
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from pydantic import error_wrappers
-
-from marqo.cloud_helpers import cloud_wait_for_index_status
+from marqo.cloud_helpers import cloud_wait_for_index_status, wait_for_indexes, wait_for_indexes_async
 from marqo.default_instance_mappings import DefaultInstanceMappings
+from marqo.enums import VersionCheckMode
 from marqo.index import Index
 from marqo.config import Config
 from marqo.instance_mappings import InstanceMappings
 from marqo.marqo_cloud_instance_mappings import MarqoCloudInstanceMappings
-from marqo.models.search_models import BulkSearchBody, BulkSearchQuery
+from marqo.projections import apply_to_search_query, resolve_projection, warn_if_unprojected
+from marqo._concurrency import map_ordered
 from marqo._httprequests import HttpRequests
+from marqo.rate_limiter import RateLimit, throttle
+from marqo._search_validation import dumps_bulk_search_queries, validate_bulk_search_query
+from marqo.results import RawResponse, SearchResult
 from marqo import utils, enums
 from marqo import errors
-from marqo.models import marqo_index
+
+if TYPE_CHECKING:
+    # pydantic is only imported when index settings are used
+    from marqo.models import marqo_index
 
 
 class Client:
@@ -30,7 +39,16 @@ class Client:
             instance_mappings: Optional[InstanceMappings] = None,
             main_user: str = None, main_password: str = None,
             return_telemetry: bool = False,
-            api_key: str = None
+            api_key: str = None,
+            ingest_rate_limit: Optional[RateLimit] = None,
+            search_rate_limit: Optional[RateLimit] = None,
+            unprojected_payload_warning_bytes: Optional[int] = None,
+            version_check_mode: VersionCheckMode = VersionCheckMode.EAGER,
+            version_cache_path: Optional[str] = None,
+            version_cache_ttl: float = 3600,
+            cloud_mappings_snapshot_path: Optional[str] = None,
+            cloud_mappings_snapshot_ttl: float = 3600,
+            cloud_mappings_refresh_interval: Optional[float] = None
     ) -> None:
         """
         Parameters
@@ -44,6 +62,33 @@ class Client:
             If True, returns telemetry object with HTTP responses. Used for measuring timing.
         api_key:
             The api key to use for authentication with the Marqo API
+        ingest_rate_limit:
+            A RateLimit that paces add_documents and update_documents requests. It is shared
+            by all threads and Index objects created from this client.
+        search_rate_limit:
+            A RateLimit that paces search and bulk_search requests. For search, each query
+            counts as one document.
+        unprojected_payload_warning_bytes:
+            A debugging aid. If set, searches and document reads that use no projection
+            profile and return more than this many bytes log a warning naming the caller.
+        version_check_mode:
+            When Index objects check that their Marqo instance meets the client's minimum
+            version. EAGER (the default) checks when the Index is created, LAZY before its
+            first request, BACKGROUND in a background thread, and DISABLED never checks.
+        version_cache_path:
+            The path of a JSON file that caches the Marqo versions found, so that other
+            processes, such as pre-forked workers, skip the check. Not used if None.
+        version_cache_ttl:
+            How many seconds a version in the version cache file is trusted for.
+        cloud_mappings_snapshot_path:
+            Marqo Cloud only. The path of a JSON file that stores the index URLs of the account,
+            so that new processes can route requests without first listing every index.
+            The API key is not stored.
+        cloud_mappings_snapshot_ttl:
+            How many seconds a snapshot of the index URLs is used for.
+        cloud_mappings_refresh_interval:
+            Marqo Cloud only. If set, a background thread refreshes the index URLs this often,
+            so requests rarely wait for a refresh.
         """
         if url is not None and instance_mappings is not None:
             raise ValueError("Cannot specify both url and instance_mappings")
@@ -51,7 +96,11 @@ class Client:
         is_marqo_cloud = False
         if url is not None:
             if url.lower().startswith(os.environ.get("MARQO_CLOUD_URL", "https://api.marqo.ai")):
-                instance_mappings = MarqoCloudInstanceMappings(control_base_url=url, api_key=api_key)
+                instance_mappings = MarqoCloudInstanceMappings(
+                    control_base_url=url, api_key=api_key,
+                    snapshot_path=cloud_mappings_snapshot_path, snapshot_ttl=cloud_mappings_snapshot_ttl,
+                    refresh_interval=cloud_mappings_refresh_interval
+                )
                 is_marqo_cloud = True
             else:
                 instance_mappings = DefaultInstanceMappings(url, main_user, main_password)
@@ -60,25 +109,34 @@ class Client:
             instance_mappings=instance_mappings,
             is_marqo_cloud=is_marqo_cloud,
             use_telemetry=return_telemetry,
-            api_key=api_key
+            api_key=api_key,
+            ingest_rate_limit=ingest_rate_limit,
+            search_rate_limit=search_rate_limit,
+            unprojected_payload_warning_bytes=unprojected_payload_warning_bytes,
+            version_check_mode=version_check_mode,
+            version_cache_path=version_cache_path,
+            version_cache_ttl=version_cache_ttl
         )
         self.http = HttpRequests(self.config)
+        # (index name, index URL) pairs already checked for readiness by bulk_search. An index
+        # that moves to another URL, e.g. when it is recreated on Marqo Cloud, is checked again.
+        self._bulk_search_checked_indexes: Set[Tuple[str, str]] = set()
 
     def create_index(
         self, index_name: str,
-        type: Optional[marqo_index.IndexType] = None,
+        type: Optional["marqo_index.IndexType"] = None,
         settings_dict: Optional[Dict[str, Any]] = None,
         treat_urls_and_pointers_as_images: Optional[bool] = None,
         filter_string_max_length: Optional[int] = None,
-        all_fields: Optional[List[marqo_index.FieldRequest]] = None,
+        all_fields: Optional[List["marqo_index.FieldRequest"]] = None,
         tensor_fields: Optional[List[str]] = None,
         model: Optional[str] = None,
         model_properties: Optional[Dict[str, Any]] = None,
         normalize_embeddings: Optional[bool] = None,
-        text_preprocessing: Optional[marqo_index.TextPreProcessing] = None,
-        image_preprocessing: Optional[marqo_index.ImagePreProcessing] = None,
-        vector_numeric_type: Optional[marqo_index.VectorNumericType] = None,
-        ann_parameters: Optional[marqo_index.AnnParameters] = None,
+        text_preprocessing: Optional["marqo_index.TextPreProcessing"] = None,
+        image_preprocessing: Optional["marqo_index.ImagePreProcessing"] = None,
+        vector_numeric_type: Optional["marqo_index.VectorNumericType"] = None,
+        ann_parameters: Optional["marqo_index.AnnParameters"] = None,
         wait_for_readiness: bool = True,
         inference_type: Optional[str] = None,
         storage_class: Optional[str] = None,
@@ -165,6 +223,160 @@ class Client:
         except errors.MarqoWebError as e:
             return e.message
 
+    def create_indexes(self, indexes: List[Dict[str, Any]], wait_for_readiness: bool = True,
+                       max_workers: int = 8, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Creates several indexes concurrently.
+
+        The create requests are sent in parallel. On Marqo Cloud, if wait_for_readiness is
+        True, the created indexes are then waited for together, with one status request per poll.
+        Every spec is validated before any request is sent. An invalid spec or a failed request
+        affects only its own index.
+
+        Args:
+            indexes: the create_index arguments of each index, each including its "index_name",
+                for example [{"index_name": "index-1", "model": "hf/e5-base-v2"}, ...]
+            wait_for_readiness: Marqo Cloud specific, whether to wait until the indexes are READY
+            max_workers: the maximum number of create requests in flight
+            timeout: Marqo Cloud specific, the maximum number of seconds to wait for readiness.
+                Indexes that are not READY by then are reported as errors.
+
+        Returns:
+            {"errors": whether any index failed, "items": [...]}, with one item per index in input
+            order holding its "indexName", the "response" to its create request, its last known
+            "indexStatus" on Marqo Cloud, and an "error" message if it failed.
+        """
+        from pydantic import ValidationError
+
+        index_names = [index_args.get("index_name") if isinstance(index_args, dict) else None
+                       for index_args in indexes]
+        self._validate_index_names(index_names)
+
+        # check every spec before sending any request, so that an invalid spec fails only its own index
+        create_signature = inspect.signature(Index.create)
+        bodies, invalid = [], {}
+        for index_name, index_args in zip(index_names, indexes):
+            try:
+                settings = create_signature.bind(config=self.config, **index_args).arguments
+                for name in ("config", "index_name", "wait_for_readiness"):
+                    settings.pop(name, None)
+                bodies.append((index_name, Index._create_index_body(self.config, **settings)))
+            except (TypeError, ValidationError) as e:
+                invalid[index_name] = f"{e.__class__.__name__}: {e}"
+            except errors.MarqoError as e:
+                invalid[index_name] = str(e.message)
+
+        def create(index_name_and_body: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+            index_name, body = index_name_and_body
+            return self.http.post(f"indexes/{index_name}", body=body)
+
+        return self._provision_indexes(index_names, create, bodies, enums.IndexStatus.READY,
+                                       wait_for_readiness, max_workers, timeout, invalid=invalid)
+
+    def delete_indexes(self, index_names: List[str], wait_for_readiness: bool = True,
+                       max_workers: int = 8, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Deletes several indexes concurrently.
+
+        Works like create_indexes: the delete requests are sent in parallel, and on Marqo Cloud
+        the indexes are then waited for together until they are DELETED.
+
+        Args:
+            index_names: the names of the indexes to delete
+            wait_for_readiness: Marqo Cloud specific, whether to wait until the indexes are DELETED
+            max_workers: the maximum number of delete requests in flight
+            timeout: Marqo Cloud specific, the maximum number of seconds to wait
+
+        Returns:
+            {"errors": whether any index failed, "items": [...]}, as returned by create_indexes.
+        """
+        self._validate_index_names(index_names)
+
+        def delete(index_name: str) -> Dict[str, Any]:
+            return self.http.delete(path=f"indexes/{index_name}")
+
+        return self._provision_indexes(index_names, delete, index_names, enums.IndexStatus.DELETED,
+                                       wait_for_readiness, max_workers, timeout)
+
+    @staticmethod
+    def _validate_index_names(index_names: List[Any]) -> None:
+        if not all(isinstance(index_name, str) and index_name for index_name in index_names):
+            raise errors.InvalidArgError("Every index must be given a name")
+        if len(set(index_names)) != len(index_names):
+            raise errors.InvalidArgError("Index names must be unique")
+
+    def _provision_indexes(self, index_names: List[str], request: Callable[[Any], Dict[str, Any]],
+                           request_args: List[Any], target_status: enums.IndexStatus, wait_for_readiness: bool,
+                           max_workers: int, timeout: Optional[float],
+                           invalid: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Sends one control request per index concurrently, then waits for the indexes that
+        succeeded to reach target_status on Marqo Cloud.
+
+        request_args holds the arguments of the request of each index that is not in
+        `invalid`, which maps the indexes that failed validation to their error message.
+        """
+        invalid = invalid or {}
+
+        def send(args: Any) -> Dict[str, Any]:
+            try:
+                return {"response": request(args)}
+            except (errors.MarqoWebError, errors.MarqoError) as e:
+                return {"response": None, "error": str(e.message)}
+
+        outcomes = iter(map_ordered(send, request_args, max_workers=min(max_workers, len(request_args))))
+        items = [{"indexName": index_name, **({"response": None, "error": invalid[index_name]}
+                                              if index_name in invalid else next(outcomes))}
+                 for index_name in index_names]
+
+        waiting = {item["indexName"]: target_status for item in items if "error" not in item}
+        if self.config.is_marqo_cloud and wait_for_readiness and waiting:
+            try:
+                statuses = wait_for_indexes(self.http, waiting, timeout=timeout)
+            except errors.MarqoCloudIndexStatusTimeoutError as e:
+                statuses = e.last_statuses
+            for item in items:
+                if item["indexName"] in waiting:
+                    status = statuses.get(item["indexName"])
+                    item["indexStatus"] = status
+                    if status != target_status:
+                        item["error"] = f"Index {item['indexName']} is {status} instead of {target_status.value}"
+
+        return {"errors": any("error" in item for item in items), "items": items}
+
+    def wait_for_indexes(self, statuses: Dict[str, Union[enums.IndexStatus, str]], timeout: Optional[float] = None,
+                         on_status: Optional[Callable[[str, Optional[str]], None]] = None,
+                         initial_interval: float = 1, max_interval: float = 10) -> Dict[str, Optional[str]]:
+        """Waits for Marqo Cloud indexes to reach the given statuses.
+
+        All the indexes are checked with one request per poll. Polls start `initial_interval`
+        seconds apart and back off exponentially to `max_interval`.
+
+        Args:
+            statuses: the expected status of each index, for example
+                {"index-1": IndexStatus.READY, "index-2": IndexStatus.DELETED}
+            timeout: the maximum number of seconds to wait. Waits indefinitely if None.
+            on_status: called with an index name and its status whenever that status changes
+
+        Returns:
+            The last status found for each index.
+
+        Raises:
+            MarqoCloudIndexStatusTimeoutError: if the timeout passes first
+        """
+        if not self.config.is_marqo_cloud:
+            raise errors.UnsupportedOperationError("This operation is only supported for Marqo Cloud")
+        return wait_for_indexes(self.http, statuses, timeout=timeout, on_status=on_status,
+                                initial_interval=initial_interval, max_interval=max_interval)
+
+    async def wait_for_indexes_async(self, statuses: Dict[str, Union[enums.IndexStatus, str]],
+                                     timeout: Optional[float] = None,
+                                     on_status: Optional[Callable[[str, Optional[str]], None]] = None,
+                                     initial_interval: float = 1, max_interval: float = 10
+                                     ) -> Dict[str, Optional[str]]:
+        """Like wait_for_indexes(), but awaitable."""
+        if not self.config.is_marqo_cloud:
+            raise errors.UnsupportedOperationError("This operation is only supported for Marqo Cloud")
+        return await wait_for_indexes_async(self.http, statuses, timeout=timeout, on_status=on_status,
+                                            initial_interval=initial_interval, max_interval=max_interval)
+
     def get_index(self, index_name: str) -> Index:
         """Get the index.
         This index should already exist.
@@ -212,20 +424,361 @@ class Client:
             ]
         }
 
-    def bulk_search(self, queries: List[Dict[str, Any]], device: Optional[str] = None) -> Dict[str, Any]:
+    def bulk_search(self, queries: List[Dict[str, Any]], device: Optional[str] = None,
+                    typed: bool = False, raw: bool = False, split_by_cluster: bool = False,
+                    client_batch_size: Optional[int] = None,
+                    client_concurrency: Optional[int] = None) -> Union[Dict[str, Any], RawResponse]:
+        """Run several search queries in one request.
+
+        Args:
+            queries: the search bodies, each with the name of its "index". A query may name a
+                projection profile of its index under "projection", and otherwise uses the
+                index's default profile, if any.
+            device: the device used to search
+            typed: if True, each result is a SearchResult instead of a dictionary
+            raw: if True, return a RawResponse holding the undecoded response body and headers
+            split_by_cluster: if True, the queries may target indexes on different Marqo
+                clusters. They are grouped by cluster, and each group is sent as its own
+                request. Otherwise, all indexes must belong to the same cluster.
+            client_batch_size: if it is set, at most this many queries are sent per request,
+                for example to stay within the number of queries Marqo accepts in one bulk
+                search.
+            client_concurrency: the maximum number of requests sent at the same time when the
+                queries are split by cluster or batched. If None, all of them are sent at once.
+
+        Returns:
+            A dictionary with the result of each query under "result", or a RawResponse if
+            raw is True. If the queries are split by cluster or batched, the dictionary only
+            holds "result", in the order of `queries`.
+        """
+        if typed and raw:
+            raise errors.InvalidArgError("typed and raw can't both be True")
+        split = split_by_cluster or client_batch_size is not None
+        if split:
+            if raw:
+                raise errors.InvalidArgError("raw can't be used when queries are split by cluster or batched")
+            if client_batch_size is not None and ((not isinstance(client_batch_size, int)) or client_batch_size <= 0):
+                raise errors.InvalidArgError("Batch size must be a positive integer")
+            if client_concurrency is not None and (
+                    (not isinstance(client_concurrency, int)) or client_concurrency <= 0):
+                raise errors.InvalidArgError("Client concurrency must be a positive integer")
+
+        parsed_queries = self._parse_bulk_search_queries(queries)
+        # queries that pass projection=False skip projection on purpose and are not warned about
+        unprojected = [parsed["attributesToRetrieve"] is None and query.get("projection") is not False
+                       for query, parsed in zip(queries, parsed_queries)]
+        if split:
+            res = {"result": self._bulk_search_by_cluster(
+                parsed_queries, unprojected, device=device, split_by_cluster=split_by_cluster,
+                batch_size=client_batch_size, max_workers=client_concurrency)}
+        else:
+            res = self._send_bulk_search(parsed_queries, unprojected, device=device, raw=raw)
+        if typed:
+            res["result"] = [SearchResult.from_response(result) for result in res["result"]]
+        return res
+
+    def _parse_bulk_search_queries(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Applies projection profiles to bulk search queries and validates them.
+
+        Queries the fast path cannot validate are validated with the pydantic models.
+        """
+        queries = [self._apply_projection(q) for q in queries]
+        parsed_queries = [validate_bulk_search_query(q) for q in queries]
+        if all(parsed is not None for parsed in parsed_queries):
+            return parsed_queries
+
+        from pydantic import error_wrappers
+        from marqo.models.search_models import BulkSearchBody
+
         try:
-            parsed_queries = [BulkSearchBody(**q) for q in queries]
+            return [parsed if parsed is not None else BulkSearchBody(**query).dict()
+                    for query, parsed in zip(queries, parsed_queries)]
         except error_wrappers.ValidationError as e:
             raise errors.InvalidArgError(f"some parameters in search query(s) are invalid. Errors are: {e.errors()}")
 
-        self._validate_all_indexes_belong_to_the_same_cluster(parsed_queries)
+    def _send_bulk_search(self, parsed_queries: List[Dict[str, Any]], unprojected: List[bool],
+                          device: Optional[str] = None, raw: bool = False) -> Union[Dict[str, Any], RawResponse]:
+        """Sends validated queries, which must target a single cluster, as one bulk search request.
+
+        A debugging warning is logged for a large response if any query is flagged in `unprojected`.
+        """
+        self._validate_all_indexes_belong_to_the_same_cluster([q["index"] for q in parsed_queries])
 
         translated_device_param = f"{f'?&device={utils.translate_device_string_for_url(device)}' if device is not None else ''}"
-        return self.http.post(
+        body = throttle(
+            self.config.search_rate_limit, dumps_bulk_search_queries(parsed_queries), num_docs=len(parsed_queries)
+        )
+        res = self.http.post(
             f"indexes/bulk/search{translated_device_param}",
-            body=BulkSearchQuery(queries=parsed_queries).json(),
-            index_name=parsed_queries[0].index
+            body=body,
+            index_name=parsed_queries[0]["index"],
+            **({"raw": True} if raw else {})
+        )
+        unprojected_indexes = [q["index"] for q, flagged in zip(parsed_queries, unprojected) if flagged]
+        if unprojected_indexes:
+            warn_if_unprojected(self.config, "bulk_search", unprojected_indexes[0], self.http.last_response_bytes())
+        return res
+
+    def _apply_projection(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns a copy of a bulk search query with its projection profile applied."""
+        query = dict(query)
+        projection = query.pop("projection", None)
+        if "index" not in query:
+            return query
+        return apply_to_search_query(query, resolve_projection(self.config, query["index"], projection))
+
+    def search_many_indexes(
+            self, q: Optional[Union[str, Dict[str, float]]], index_names: List[str], limit: int = 10,
+            search_method: Union[enums.SearchMethods, str] = enums.SearchMethods.TENSOR,
+            searchable_attributes: Optional[List[str]] = None, filter_string: Optional[str] = None,
+            attributes_to_retrieve: Optional[List[str]] = None, show_highlights: bool = True,
+            normalize_scores: Optional[str] = None, device: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Search several indexes, which may live on different Marqo clusters, and merge the hits.
+
+        The indexes are grouped by cluster. Each cluster receives one bulk search request, and
+        the clusters are searched concurrently, so the query takes as long as the slowest
+        cluster rather than the sum of all of them.
+
+        Scores of different indexes are only comparable if the indexes use the same model and
+        search method. Otherwise, normalize_scores rescales the scores of each index before
+        the hits are merged.
+
+        Args:
+            q: the query, as for Index.search
+            index_names: the indexes to search
+            limit: the number of hits to return in total
+            search_method: Indicates TENSOR or LEXICAL (keyword) search
+            searchable_attributes: attributes to search
+            filter_string: a filter string applied in every index
+            attributes_to_retrieve: a list of document attributes to be retrieved
+            show_highlights: True if highlights are to be returned
+            normalize_scores: "max" divides the scores of each index by its highest score, and
+                "minmax" rescales them to the range [0, 1]. "max" falls back to "minmax" for an
+                index whose highest score is not positive. The original score is kept in
+                _raw_score. If None, raw scores are merged.
+            device: the device used to search
+
+        Returns:
+            A dictionary with the merged "hits", best first. Each hit has an _index field
+            naming the index it came from.
+        """
+        if not index_names:
+            raise errors.InvalidArgError("index_names must contain at least one index")
+        if len(set(index_names)) != len(index_names):
+            raise errors.InvalidArgError("index_names must not contain duplicates")
+        if normalize_scores not in (None, "max", "minmax"):
+            raise errors.InvalidArgError(
+                f"Unsupported score normalization `{normalize_scores}`. Supported values are None, 'max' and 'minmax'")
+
+        queries = []
+        for index_name in index_names:
+            query = {
+                "index": index_name, "q": q, "limit": limit, "searchMethod": search_method,
+                "showHighlights": show_highlights,
+            }
+            if searchable_attributes is not None:
+                query["searchableAttributes"] = searchable_attributes
+            if filter_string is not None:
+                query["filter"] = filter_string
+            if attributes_to_retrieve is not None:
+                query["attributesToRetrieve"] = attributes_to_retrieve
+            queries.append(query)
+
+        results = self.bulk_search(queries, device=device, split_by_cluster=True)["result"]
+
+        ranked_hits = []
+        for index_name, result in zip(index_names, results):
+            hits = result["hits"]
+            if normalize_scores is not None and hits:
+                top_score = max(hit["_score"] for hit in hits)
+                bottom_score = 0.0
+                # dividing by a top score that is not positive would flip or blow up the ranking
+                if normalize_scores == "minmax" or top_score <= 0:
+                    bottom_score = min(hit["_score"] for hit in hits)
+                score_range = top_score - bottom_score
+                for hit in hits:
+                    hit["_raw_score"] = hit["_score"]
+                    hit["_score"] = (hit["_score"] - bottom_score) / score_range if score_range else 1.0
+            for hit in hits:
+                hit["_index"] = index_name
+            ranked_hits.append(hits)
+
+        # each index's hits are already sorted, so a k-way merge finds the global top hits
+        merged = heapq.merge(*ranked_hits, key=lambda hit: hit["_score"], reverse=True)
+        return {"hits": list(itertools.islice(merged, limit)), "query": q, "limit": limit}
+
+    def _bulk_search_by_cluster(self, parsed_queries: List[Dict[str, Any]], unprojected: List[bool],
+                                device: Optional[str] = None, split_by_cluster: bool = True,
+                                batch_size: Optional[int] = None,
+                                max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Runs validated bulk search queries that may target several clusters.
+
+        Queries are grouped by the cluster of their index, groups larger than `batch_size`
+        are split into several requests, and the requests are sent concurrently.
+
+        Returns:
+            The search result of each query, in the order of `parsed_queries`.
+        """
+        groups: Dict[Optional[str], List[int]] = {}
+        for position, query in enumerate(parsed_queries):
+            cluster = self.config.instance_mapping.get_index_base_url(query["index"]) if split_by_cluster else None
+            groups.setdefault(cluster, []).append(position)
+
+        batches = [
+            positions[start:start + (batch_size or len(positions))]
+            for positions in groups.values()
+            for start in range(0, len(positions), batch_size or len(positions))
+        ]
+
+        def search_batch(positions: List[int]) -> List[Dict[str, Any]]:
+            return self._send_bulk_search([parsed_queries[position] for position in positions],
+                                          [unprojected[position] for position in positions],
+                                          device=device)["result"]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(parsed_queries)
+        for positions, batch_results in zip(
+                batches, map_ordered(search_batch, batches, max_workers=max_workers or len(batches))):
+            for position, result in zip(positions, batch_results):
+                results[position] = result
+        return results
+
+    def copy_index(
+            self, src_index_name: str, dst_index_name: str,
+            dst_client: Optional["Client"] = None,
+            custom_vector_fields: Optional[List[str]] = None,
+            tensor_fields: Optional[List[str]] = None,
+            mappings: Optional[Dict[str, Any]] = None,
+            transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+            document_ids: Optional[Iterable[str]] = None,
+            filter_string: Optional[str] = None,
+            page_size: int = 100,
+            client_concurrency: int = 2,
+            device: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Copy documents from one index to another, reusing their vectors where possible.
+
+        Reading, transforming and writing run as overlapping stages: the next page is read
+        in the background while the current page is transformed, and up to
+        client_concurrency pages are written to the destination at once.
+
+        Documents are written with use_existing_tensors=True, so Marqo reuses the vectors of
+        destination documents whose content has not changed. To carry the source vectors into
+        a new index, list the fields in custom_vector_fields: each is written as a custom
+        vector field ({"content": ..., "vector": ...}) built from the field's tensor facet, so
+        the destination does not re-infer it. Such fields must have exactly one chunk.
+
+        Args:
+            src_index_name: the index to copy from
+            dst_index_name: the index to copy to. It must already exist.
+            dst_client: the client used to write to the destination, e.g. for another Marqo
+                cluster or account. Defaults to this client, whose instance mappings resolve the
+                cluster of each index.
+            custom_vector_fields: source tensor fields to write as custom vector fields
+            tensor_fields: tensor fields of an unstructured destination. Defaults to the fields
+                that have tensor facets in the source documents.
+            mappings: mappings for an unstructured destination. Custom vector mappings are added
+                for custom_vector_fields.
+            transform: an optional function applied to each document before it is written. It
+                receives the document without _tensor_facets and may return None to skip it.
+            document_ids: copy only these ids. Any iterable is accepted and is consumed lazily.
+            filter_string: copy only documents matching this filter
+            page_size: number of documents read and written per request
+            client_concurrency: the maximum number of write requests in flight at once
+            device: the device used by the destination to index the documents
+
+        Returns:
+            A summary with the number of documents read and written, and the items that
+            failed to be written.
+        """
+        if (not isinstance(client_concurrency, int)) or client_concurrency <= 0:
+            raise errors.InvalidArgError("Client concurrency must be a positive integer")
+        custom_vector_fields = custom_vector_fields or []
+        src_index = self.index(src_index_name)
+        dst_index = (dst_client or self).index(dst_index_name)
+
+        from marqo.models import marqo_index
+
+        dst_is_structured = dst_index.get_settings().get("type") == marqo_index.IndexType.Structured
+        if not dst_is_structured and custom_vector_fields:
+            mappings = {**{field: {"type": "custom_vector"} for field in custom_vector_fields}, **(mappings or {})}
+
+        pages = src_index._iter_document_pages(
+            document_ids=document_ids, filter_string=filter_string, q="*", search_method=enums.SearchMethods.LEXICAL,
+            page_size=page_size, expose_facets=True, max_search_offset=10000,
         )
+        num_read = 0
+
+        def transform_pages():
+            nonlocal num_read
+            for page in pages:
+                num_read += len(page)
+                docs, page_tensor_fields = self._documents_for_copy(page, custom_vector_fields, transform)
+                if docs:
+                    yield docs, page_tensor_fields
+
+        def write_page(page):
+            docs, page_tensor_fields = page
+            if dst_is_structured:
+                page_tensor_fields = None
+            elif tensor_fields is not None:
+                page_tensor_fields = tensor_fields
+            return len(docs), dst_index.add_documents(
+                docs, tensor_fields=page_tensor_fields, use_existing_tensors=True,
+                mappings=mappings, device=device,
+            )
+
+        num_written = 0
+        failed_items = []
+        for num_docs, res in map_ordered(write_page, transform_pages(), max_workers=client_concurrency):
+            items_with_errors = [item for item in res.get("items", []) if item.get("status", 200) >= 400]
+            failed_items.extend(items_with_errors)
+            num_written += num_docs - len(items_with_errors)
+
+        return {
+            "srcIndex": src_index_name,
+            "dstIndex": dst_index_name,
+            "documentsRead": num_read,
+            "documentsWritten": num_written,
+            "errors": bool(failed_items),
+            "failedItems": failed_items,
+        }
+
+    @staticmethod
+    def _documents_for_copy(
+            page: List[Dict[str, Any]], custom_vector_fields: List[str],
+            transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]]
+    ):
+        """Prepares documents read with their tensor facets to be written to another index.
+
+        Returns:
+            The documents to write, and the names of the fields that had tensor facets.
+        """
+        docs = []
+        tensor_fields = set()
+        for doc in page:
+            facets = doc.pop("_tensor_facets", None) or []
+            field_vectors: Dict[str, List] = {}
+            for facet in facets:
+                field = next((k for k in facet if k != "_embedding"), None)
+                if field is not None:
+                    tensor_fields.add(field)
+                    field_vectors.setdefault(field, []).append(facet.get("_embedding"))
+            for field in custom_vector_fields:
+                if field not in doc or field not in field_vectors:
+                    continue
+                if len(field_vectors[field]) != 1:
+                    raise errors.InvalidArgError(
+                        f"Field `{field}` of document `{doc.get('_id')}` has {len(field_vectors[field])} chunks, "
+                        f"but a custom vector field holds exactly one vector. Remove it from custom_vector_fields "
+                        f"to re-infer it in the destination index.")
+                doc[field] = {"content": doc[field], "vector": field_vectors[field][0]}
+            if transform is not None:
+                doc = transform(doc)
+                if doc is None:
+                    continue
+            docs.append(doc)
+        return docs, sorted(tensor_fields)
 
     @staticmethod
     def _base64url_encode(
@@ -240,7 +793,7 @@ class Client:
             f"Please Use `mq.index('your-index-name').{function_name}()` instead. "
             "Check `https://docs.marqo.ai/1.1.0/API-Reference/indexes/` for more details.")
 
-    def _validate_all_indexes_belong_to_the_same_cluster(self, parsed_queries: List[BulkSearchBody]):
+    def _validate_all_indexes_belong_to_the_same_cluster(self, index_names: List[str]):
         """
         Validates that all indices in the bulk request belong to the same cluster.
 
@@ -249,8 +802,11 @@ class Client:
         across multiple clusters, as a bulk search operation should be performed within
         a single cluster to guarantee consistency and reliability.
 
+        Each index is checked for readiness the first time it is used in a bulk search at
+        its current URL.
+
         Args:
-            parsed_queries (List[BulkSearchBody]): A list of parsed bulk search queries.
+            index_names (List[str]): The index of each query in the bulk search request.
 
         Raises:
             errors.InvalidArgError: If the indices belong to different clusters.
@@ -259,12 +815,16 @@ class Client:
             bool: True if all indices belong to the same cluster, False otherwise.
         """
         cluster = None
-        index_names = set([q.index for q in parsed_queries])
-        for index_name in index_names:
-            self.index(index_name)  # it will perform all basic checks for index readiness
+        for index_name in dict.fromkeys(index_names):
+            index_url = self.config.instance_mapping.get_index_base_url(index_name)
+            if (index_name, index_url) not in self._bulk_search_checked_indexes:
+                self.index(index_name)  # it will perform all basic checks for index readiness
+                # the checks may refresh the mappings, so the index is recorded at its URL afterwards
+                index_url = self.config.instance_mapping.get_index_base_url(index_name)
+                self._bulk_search_checked_indexes.add((index_name, index_url))
             if cluster is None:
-                cluster = self.config.instance_mapping.get_index_base_url(index_name)
-            if cluster != self.config.instance_mapping.get_index_base_url(index_name):
+                cluster = index_url
+            if cluster != index_url:
                 raise errors.InvalidArgError(
                     "All indexes in a bulk search request must belong to the same Marqo cluster.\n"
                     "- If you are using Marqo Cloud, make sure all search requests"
@@ -1,24 +1,149 @@
 import time
+from typing import Callable, Dict, Iterator, Optional, Union
 
 from marqo.marqo_logging import mq_logger
 from marqo._httprequests import HttpRequests
 from marqo.enums import IndexStatus
-from marqo.models.marqo_cloud import IndexStatusResponse
+from marqo.errors import MarqoCloudIndexStatusTimeoutError
 
+# called with an index name and its status whenever a poll finds that status changed
+StatusCallback = Callable[[str, Optional[str]], None]
 
-def cloud_wait_for_index_status(req: HttpRequests, index_name: str, status: IndexStatus):
-    """ Wait for index to achieve some status on Marqo Cloud by checking
-    it's status every 10 seconds until it becomes expected value
+
+def poll_intervals(initial_interval: float = 1, max_interval: float = 10, backoff: float = 2) -> Iterator[float]:
+    """Yields the seconds to sleep between polls: `initial_interval`, multiplied by `backoff`
+    after each poll, up to `max_interval`."""
+    interval = initial_interval
+    while True:
+        yield interval
+        interval = min(interval * backoff, max_interval)
+
+
+class _StatusWaiter:
+    """Tracks the statuses of indexes across polls until each has its expected status."""
+
+    def __init__(self, expected: Dict[str, Union[IndexStatus, str]], timeout: Optional[float],
+                 on_status: Optional[StatusCallback], initial_interval: float, max_interval: float,
+                 backoff: float, stop_on_failure: bool = False) -> None:
+        self.expected = {index_name: IndexStatus(status) for index_name, status in expected.items()}
+        # whether an index that FAILED stops being waited for
+        self.stop_on_failure = stop_on_failure
+        self.statuses: Dict[str, Optional[str]] = {}
+        self.timeout = timeout
+        self.on_status = on_status
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.intervals = poll_intervals(initial_interval, max_interval, backoff)
+
+    def update(self, statuses: Dict[str, Optional[str]]) -> bool:
+        """Records the statuses found by a poll. Returns whether every index has its expected status."""
+        for index_name, status in statuses.items():
+            if index_name not in self.statuses or self.statuses[index_name] != status:
+                self.statuses[index_name] = status
+                mq_logger.info(f"Current status of index {index_name}: {status}")
+                if self.on_status is not None:
+                    self.on_status(index_name, status)
+        return all(self._settled(index_name) for index_name in self.expected)
+
+    def _settled(self, index_name: str) -> bool:
+        status = self.statuses.get(index_name)
+        return status == self.expected[index_name] or (self.stop_on_failure and status == IndexStatus.FAILED)
+
+    def next_interval(self) -> float:
+        """The seconds to sleep before the next poll.
+
+        Raises:
+            MarqoCloudIndexStatusTimeoutError: if the timeout has passed
+        """
+        interval = next(self.intervals)
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                pending = {index_name: self.statuses.get(index_name)
+                           for index_name in self.expected if not self._settled(index_name)}
+                raise MarqoCloudIndexStatusTimeoutError(pending, self.timeout, dict(self.statuses))
+            interval = min(interval, remaining)
+        return interval
+
+
+def _get_index_status(req: HttpRequests, index_name: str) -> Dict[str, Optional[str]]:
+    from marqo.models.marqo_cloud import IndexStatusResponse
+
+    current_status = IndexStatusResponse(**req.get(f"indexes/{index_name}/status")).indexStatus
+    return {index_name: current_status.value if current_status is not None else None}
+
+
+def _list_index_statuses(req: HttpRequests, index_names) -> Dict[str, Optional[str]]:
+    """The statuses of index_names in one list call. Indexes that are not listed are DELETED."""
+    listed = {index_info.get("indexName"): index_info.get("indexStatus")
+              for index_info in req.get("indexes")["results"]}
+    return {index_name: listed.get(index_name, IndexStatus.DELETED.value) for index_name in index_names}
+
+
+def cloud_wait_for_index_status(req: HttpRequests, index_name: str, status: IndexStatus,
+                                timeout: Optional[float] = None, on_status: Optional[StatusCallback] = None,
+                                initial_interval: float = 1, max_interval: float = 10, backoff: float = 2):
+    """ Wait for index to achieve some status on Marqo Cloud. The status is checked straight
+    away, then after `initial_interval` seconds, with the interval growing by `backoff`
+    after each check up to `max_interval`.
 
     Args:
         req (HttpRequests): HttpRequests object
         index_name (str): name of the index
         status (IndexStatus): expected status of the index
+        timeout: the maximum number of seconds to wait. Waits indefinitely if None.
+        on_status: called with the index name and status whenever the status changes
+        initial_interval: seconds between the first and second checks
+        max_interval: the longest time between checks
+        backoff: the factor the interval grows by after each check
+
+    Raises:
+        MarqoCloudIndexStatusTimeoutError: if the index does not reach the status within the timeout
     """
-    current_status = IndexStatusResponse(**req.get(f"indexes/{index_name}/status"))
-    while current_status.indexStatus != status:
-        time.sleep(10)
-        current_status = IndexStatusResponse(**req.get(f"indexes/{index_name}/status"))
-        mq_logger.info(f"Current index status: {current_status.indexStatus}")
+    waiter = _StatusWaiter({index_name: status}, timeout, on_status, initial_interval, max_interval, backoff)
+    while not waiter.update(_get_index_status(req, index_name)):
+        time.sleep(waiter.next_interval())
     mq_logger.info(f"Index achieved status {status} successfully")
     return True
+
+
+def wait_for_indexes(req: HttpRequests, statuses: Dict[str, Union[IndexStatus, str]],
+                     timeout: Optional[float] = None, on_status: Optional[StatusCallback] = None,
+                     initial_interval: float = 1, max_interval: float = 10,
+                     backoff: float = 2) -> Dict[str, Optional[str]]:
+    """Waits for several Marqo Cloud indexes to reach their statuses, listing all indexes
+    once per poll instead of checking each index separately.
+
+    Polling works like cloud_wait_for_index_status. An index missing from the list is DELETED.
+    An index that FAILED is not waited for any longer; check the returned statuses.
+
+    Args:
+        req: HttpRequests object
+        statuses: the expected status of each index, for example {"index-1": IndexStatus.READY}
+
+    Returns:
+        The last status found for each index.
+
+    Raises:
+        MarqoCloudIndexStatusTimeoutError: if some index does not reach its status within the timeout
+    """
+    waiter = _StatusWaiter(statuses, timeout, on_status, initial_interval, max_interval, backoff,
+                           stop_on_failure=True)
+    while not waiter.update(_list_index_statuses(req, waiter.expected)):
+        time.sleep(waiter.next_interval())
+    return waiter.statuses
+
+
+async def wait_for_indexes_async(req: HttpRequests, statuses: Dict[str, Union[IndexStatus, str]],
+                                 timeout: Optional[float] = None, on_status: Optional[StatusCallback] = None,
+                                 initial_interval: float = 1, max_interval: float = 10,
+                                 backoff: float = 2) -> Dict[str, Optional[str]]:
+    """Like wait_for_indexes(), but yields to the event loop between polls. The list requests
+    run in the loop's default executor."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    waiter = _StatusWaiter(statuses, timeout, on_status, initial_interval, max_interval, backoff,
+                           stop_on_failure=True)
+    while not waiter.update(await loop.run_in_executor(None, _list_index_statuses, req, waiter.expected)):
+        await asyncio.sleep(waiter.next_interval())
+    return waiter.statuses
@@ -1,6 +1,9 @@
-from typing import Optional
+from typing import Dict, Optional
 
+from marqo.enums import VersionCheckMode
 from marqo.instance_mappings import InstanceMappings
+from marqo.projections import ProjectionProfile
+from marqo.rate_limiter import RateLimit
 
 
 class Config:
@@ -14,18 +17,49 @@ class Config:
             is_marqo_cloud: bool = False,
             use_telemetry: bool = False,
             timeout: Optional[int] = None,
-            api_key: str = None
+            api_key: str = None,
+            ingest_rate_limit: Optional[RateLimit] = None,
+            search_rate_limit: Optional[RateLimit] = None,
+            unprojected_payload_warning_bytes: Optional[int] = None,
+            version_check_mode: VersionCheckMode = VersionCheckMode.EAGER,
+            version_cache_path: Optional[str] = None,
+            version_cache_ttl: float = 3600
     ) -> None:
         """
         Parameters
         ----------
         url:
             The url to the Marqo instance (ex: http://localhost:8882)
+        ingest_rate_limit:
+            Limits how fast documents are added and updated. Shared by every
+            Index and thread using this config.
+        search_rate_limit:
+            Limits how fast search requests are sent. Shared by every
+            Index and thread using this config.
+        unprojected_payload_warning_bytes:
+            If set, searches and document reads that use no projection and return
+            more than this many bytes log a warning naming the caller.
+        version_check_mode:
+            When Index objects check the version of their Marqo instance.
+        version_cache_path:
+            If set, the Marqo versions found are cached in this JSON file and
+            shared with other processes.
+        version_cache_ttl:
+            How many seconds a version in the version cache file is trusted for.
         """
         self.instance_mapping = instance_mappings
         self.is_marqo_cloud = is_marqo_cloud
         self.use_telemetry = use_telemetry
         self.timeout = timeout
         self.api_key = api_key
+        self.ingest_rate_limit = ingest_rate_limit
+        self.search_rate_limit = search_rate_limit
+        self.unprojected_payload_warning_bytes = unprojected_payload_warning_bytes
+        self.version_check_mode = VersionCheckMode(version_check_mode)
+        self.version_cache_path = version_cache_path
+        self.version_cache_ttl = version_cache_ttl
+        # projection profiles by index name, then profile name
+        self.projection_profiles: Dict[str, Dict[str, ProjectionProfile]] = {}
+        self.default_projections: Dict[str, str] = {}
         # suppress warnings until we figure out the dependency issues:
         # warnings.filterwarnings("ignore")
@@ -19,3 +19,11 @@ class IndexStatus(str, Enum):
     CREATING = "CREATING"
     DELETING = "DELETING"
     FAILED = "FAILED"
+
+
+class VersionCheckMode(str, Enum):
+    """When an Index checks that its Marqo instance meets the client's minimum version"""
+    EAGER = "EAGER"  # when the Index is created
+    LAZY = "LAZY"  # before the Index's first request
+    BACKGROUND = "BACKGROUND"  # in a background thread when the Index is created
+    DISABLED = "DISABLED"
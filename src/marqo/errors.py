@@ -195,3 +195,16 @@ class MarqoCloudIndexNotFoundError(MarqoError):
         self.message = f"The index name {index_name} does not exist in the Marqo cloud or client's cache" \
                        f" has not yet been updated. Please check the index name and try again.\n" \
                        f"- If the problem persists, please contact marqo support at support@marqo.ai"
+
+
+class MarqoCloudIndexStatusTimeoutError(MarqoError):
+    """Error when Marqo Cloud indexes do not reach the expected status in time"""
+    code = "index_status_timeout_cloud"
+    status_code = HTTPStatus.REQUEST_TIMEOUT
+
+    def __init__(self, pending_statuses: dict, timeout: float, last_statuses: dict = None) -> None:
+        self.pending_statuses = pending_statuses
+        self.last_statuses = last_statuses if last_statuses is not None else dict(pending_statuses)
+        pending = ", ".join(f"{index_name} ({status})" for index_name, status in pending_statuses.items())
+        self.message = f"Timed out after {timeout} seconds waiting for Marqo Cloud indexes to reach " \
+                       f"their expected status. Indexes still pending, with their last known status: {pending}"
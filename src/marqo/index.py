@@ -1,25 +1,43 @@
 import functools
+import json
+import os
+import threading
 from datetime import datetime
 from timeit import default_timer as timer
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
-from packaging import version as versioning_helpers
 from requests import RequestException
 
-from marqo import errors, utils
+from marqo import _version_cache, errors, utils
+from marqo._concurrency import map_ordered, prefetch
+from marqo._export import get_document_writer
+from marqo._fusion import fuse_hits
 from marqo._httprequests import HttpRequests
 from marqo.cloud_helpers import cloud_wait_for_index_status
 from marqo.config import Config
 from marqo.enums import IndexStatus
-from marqo.enums import SearchMethods
+from marqo.enums import SearchMethods, VersionCheckMode
 from marqo.errors import MarqoWebError, UnsupportedOperationError, MarqoCloudIndexNotFoundError
 from marqo.marqo_logging import mq_logger
-from marqo.models import marqo_index
-from marqo.models.create_index_settings import IndexSettings
-from marqo.models.marqo_cloud import CloudIndexSettings
+from marqo.projections import (
+    ProjectionProfile, apply_to_search_query, project_documents, resolve_projection, warn_if_unprojected
+)
+from marqo.rate_limiter import throttle
+from marqo.results import RawResponse, SearchResult
+from marqo.vectors import (
+    EMBEDDING_FORMATS, SUPPORTED_EMBEDDING_DTYPES, NpyRowWriter, decode_embeddings_response, embedding_side_paths,
+    facets_to_matrix, import_numpy, quantize_int8, vectors_to_json
+)
 from marqo.version import minimum_supported_marqo_version
 
+if TYPE_CHECKING:
+    # pydantic is only imported when an index is created
+    from marqo.models import marqo_index
+
 marqo_url_and_version_cache: Dict[str, str] = {}
+# background version checks that have not finished yet, by Marqo URL
+_background_version_checks: Dict[str, threading.Thread] = {}
+_background_version_checks_lock = threading.Lock()
 
 
 class Index:
@@ -59,7 +77,7 @@ class Index:
 
         if (self.config.instance_mapping.is_index_usage_allowed(index_name=self.index_name)
                 and not skip_version_check):
-            self._marqo_minimum_supported_version_check()
+            self._schedule_version_check()
 
     def delete(self, wait_for_readiness=True) -> Dict[str, Any]:
         """Delete the index.
@@ -77,19 +95,19 @@ class Index:
     @staticmethod
     def create(config: Config,
                index_name: str,
-               type: Optional[marqo_index.IndexType] = None,
+               type: Optional["marqo_index.IndexType"] = None,
                settings_dict: Optional[Dict[str, Any]] = None,
                treat_urls_and_pointers_as_images: Optional[bool] = None,
                filter_string_max_length: Optional[int] = None,
-               all_fields: Optional[List[marqo_index.FieldRequest]] = None,
+               all_fields: Optional[List["marqo_index.FieldRequest"]] = None,
                tensor_fields: Optional[List[str]] = None,
                model: Optional[str] = None,
                model_properties: Optional[Dict[str, Any]] = None,
                normalize_embeddings: Optional[bool] = None,
-               text_preprocessing: Optional[marqo_index.TextPreProcessing] = None,
-               image_preprocessing: Optional[marqo_index.ImagePreProcessing] = None,
-               vector_numeric_type: Optional[marqo_index.VectorNumericType] = None,
-               ann_parameters: Optional[marqo_index.AnnParameters] = None,
+               text_preprocessing: Optional["marqo_index.TextPreProcessing"] = None,
+               image_preprocessing: Optional["marqo_index.ImagePreProcessing"] = None,
+               vector_numeric_type: Optional["marqo_index.VectorNumericType"] = None,
+               ann_parameters: Optional["marqo_index.AnnParameters"] = None,
                inference_type: Optional[str] = None,
                storage_class: Optional[str] = None,
                number_of_shards: Optional[int] = None,
@@ -137,7 +155,51 @@ class Index:
         Returns:
             Response body, containing information about index creation result
         """
+        body = Index._create_index_body(
+            config, type=type, settings_dict=settings_dict,
+            treat_urls_and_pointers_as_images=treat_urls_and_pointers_as_images,
+            filter_string_max_length=filter_string_max_length, all_fields=all_fields, tensor_fields=tensor_fields,
+            model=model, model_properties=model_properties, normalize_embeddings=normalize_embeddings,
+            text_preprocessing=text_preprocessing, image_preprocessing=image_preprocessing,
+            vector_numeric_type=vector_numeric_type, ann_parameters=ann_parameters, inference_type=inference_type,
+            storage_class=storage_class, number_of_shards=number_of_shards, number_of_replicas=number_of_replicas,
+            number_of_inferences=number_of_inferences
+        )
         req = HttpRequests(config)
+        response = req.post(f"indexes/{index_name}", body=body)
+        # py-marqo against Marqo Cloud
+        if config.api_key is not None and wait_for_readiness:
+            cloud_wait_for_index_status(req, index_name, IndexStatus.READY)
+        return response
+
+    @staticmethod
+    def _create_index_body(config: Config,
+                           type: Optional["marqo_index.IndexType"] = None,
+                           settings_dict: Optional[Dict[str, Any]] = None,
+                           treat_urls_and_pointers_as_images: Optional[bool] = None,
+                           filter_string_max_length: Optional[int] = None,
+                           all_fields: Optional[List["marqo_index.FieldRequest"]] = None,
+                           tensor_fields: Optional[List[str]] = None,
+                           model: Optional[str] = None,
+                           model_properties: Optional[Dict[str, Any]] = None,
+                           normalize_embeddings: Optional[bool] = None,
+                           text_preprocessing: Optional["marqo_index.TextPreProcessing"] = None,
+                           image_preprocessing: Optional["marqo_index.ImagePreProcessing"] = None,
+                           vector_numeric_type: Optional["marqo_index.VectorNumericType"] = None,
+                           ann_parameters: Optional["marqo_index.AnnParameters"] = None,
+                           inference_type: Optional[str] = None,
+                           storage_class: Optional[str] = None,
+                           number_of_shards: Optional[int] = None,
+                           number_of_replicas: Optional[int] = None,
+                           number_of_inferences: Optional[int] = None) -> Dict[str, Any]:
+        """Validates the settings of a new index with the pydantic models, and returns the
+        body of its create request. The arguments are those of create().
+
+        Raises:
+            pydantic.ValidationError: if the settings are invalid
+        """
+        from marqo.models.create_index_settings import IndexSettings
+        from marqo.models.marqo_cloud import CloudIndexSettings
 
         # py-marqo against local Marqo
         if config.api_key is None:
@@ -156,36 +218,30 @@ class Index:
                 vectorNumericType=vector_numeric_type,
                 annParameters=ann_parameters
             )
-
-            return req.post(f"indexes/{index_name}", body=local_create_index_settings.generate_request_body())
+            return local_create_index_settings.generate_request_body()
 
         # py-marqo against Marqo Cloud
-        else:
-            cloud_index_settings: CloudIndexSettings = CloudIndexSettings(
-                type=type,
-                allFields=all_fields,
-                settingsDict=settings_dict,
-                treatUrlsAndPointersAsImages=treat_urls_and_pointers_as_images,
-                filterStringMaxLength=filter_string_max_length,
-                tensorFields=tensor_fields,
-                model=model,
-                modelProperties=model_properties,
-                normalizeEmbeddings=normalize_embeddings,
-                textPreprocessing=text_preprocessing,
-                imagePreprocessing=image_preprocessing,
-                vectorNumericType=vector_numeric_type,
-                annParameters=ann_parameters,
-                numberOfInferences=number_of_inferences,
-                inferenceType=inference_type,
-                numberOfShards=number_of_shards,
-                numberOfReplicas=number_of_replicas,
-                storageClass=storage_class,
-            )
-
-            response = req.post(f"indexes/{index_name}", body=cloud_index_settings.generate_request_body())
-            if wait_for_readiness:
-                cloud_wait_for_index_status(req, index_name, IndexStatus.READY)
-            return response
+        cloud_index_settings: CloudIndexSettings = CloudIndexSettings(
+            type=type,
+            allFields=all_fields,
+            settingsDict=settings_dict,
+            treatUrlsAndPointersAsImages=treat_urls_and_pointers_as_images,
+            filterStringMaxLength=filter_string_max_length,
+            tensorFields=tensor_fields,
+            model=model,
+            modelProperties=model_properties,
+            normalizeEmbeddings=normalize_embeddings,
+            textPreprocessing=text_preprocessing,
+            imagePreprocessing=image_preprocessing,
+            vectorNumericType=vector_numeric_type,
+            annParameters=ann_parameters,
+            numberOfInferences=number_of_inferences,
+            inferenceType=inference_type,
+            numberOfShards=number_of_shards,
+            numberOfReplicas=number_of_replicas,
+            storageClass=storage_class,
+        )
+        return cloud_index_settings.generate_request_body()
 
     def get_status(self):
         """gets the status of the index"""
@@ -197,11 +253,12 @@ class Index:
     def search(self, q: Optional[Union[str, dict]] = None, searchable_attributes: Optional[List[str]] = None,
                limit: int = 10, offset: int = 0, search_method: Union[SearchMethods.TENSOR, str] = SearchMethods.TENSOR,
                highlights=None, device: Optional[str] = None, filter_string: str = None,
-               show_highlights=True, reranker=None, image_download_headers: Optional[Dict] = None,
+               show_highlights=None, reranker=None, image_download_headers: Optional[Dict] = None,
                attributes_to_retrieve: Optional[List[str]] = None, boost: Optional[Dict[str,List[Union[float, int]]]] = None,
                context: Optional[dict] = None, score_modifiers: Optional[dict] = None, model_auth: Optional[dict] = None,
-               ef_search: Optional[int] = None, approximate: Optional[bool] = None
-               ) -> Dict[str, Any]:
+               ef_search: Optional[int] = None, approximate: Optional[bool] = None,
+               projection: Optional[Union[str, bool]] = None, typed: bool = False, raw: bool = False
+               ) -> Union[Dict[str, Any], SearchResult, RawResponse]:
         """Search the index.
 
         Args:
@@ -218,7 +275,8 @@ class Index:
             limit: The max number of documents to be returned
             offset: The number of search results to skip (for pagination)
             search_method: Indicates TENSOR or LEXICAL (keyword) search
-            show_highlights: True if highlights are to be returned
+            show_highlights: True if highlights are to be returned. Defaults to the
+                projection profile's setting, or True without a profile.
             reranker:
             device: the device used to index the data. Examples include "cpu",
                 "cuda" and "cuda:2".
@@ -232,15 +290,26 @@ class Index:
             model_auth: authorisation that lets Marqo download a private model, if required
             ef_search: the size of the list of candidates during graph traversal, for tensor search only
             approximate: whether to use approximate nearest neighbors search or not, for tensor search only
+            projection: the name of a projection profile registered with register_projection,
+                which sets attributes_to_retrieve and show_highlights when they are not given.
+                Defaults to the index's default profile, if any. Pass False to use no profile.
+            typed: if True, return a SearchResult instead of a dictionary. It holds ids and
+                scores in flat containers and creates Hit views on access.
+            raw: if True, return a RawResponse holding the undecoded response body and headers,
+                e.g. to forward it without decoding and re-encoding it.
         Returns:
-            Dictionary with hits and other metadata
+            Dictionary with hits and other metadata, a SearchResult if typed is True, or a
+            RawResponse if raw is True
         """
+        if typed and raw:
+            raise errors.InvalidArgError("typed and raw can't both be True")
 
         start_time_client_request = timer()
+        profile = resolve_projection(self.config, self.index_name, projection)
         if highlights is not None:
             mq_logger.warning("Deprecation warning for parameter 'highlights'. "
                               "Please use the 'showHighlights' instead. ")
-            show_highlights = highlights if show_highlights is True else show_highlights
+            show_highlights = highlights if show_highlights is None or show_highlights is True else show_highlights
 
         path_with_query_str = (
             f"indexes/{self.index_name}/search"
@@ -273,11 +342,23 @@ class Index:
             body["efSearch"] = ef_search
         if approximate is not None:
             body["approximate"] = approximate
+        apply_to_search_query(body, profile)
+        if body["showHighlights"] is None:
+            body["showHighlights"] = True
+        unprojected = "attributesToRetrieve" not in body and projection is not False
+        body = throttle(self.config.search_rate_limit, body, num_docs=1)
         res = self.http.post(
             path=path_with_query_str,
             body=body,
             index_name=self.index_name,
+            **({"raw": True} if raw else {})
         )
+        if unprojected:
+            warn_if_unprojected(self.config, "search", self.index_name, self.http.last_response_bytes())
+        if raw:
+            mq_logger.debug(f"search ({search_method.lower()}): took {(timer() - start_time_client_request):.3f}s "
+                            f"to send query and receive {len(res.content)} bytes from Marqo (roundtrip).")
+            return res
 
         num_results = len(res["hits"])
         end_time_client_request = timer()
@@ -289,9 +370,137 @@ class Index:
             search_time_log += f" Marqo itself took {(res['processingTimeMs'] * 0.001):.3f}s to execute the search."
 
         mq_logger.debug(search_time_log)
+        if typed:
+            return SearchResult.from_response(res)
         return res
 
-    def get_document(self, document_id: str, expose_facets=None) -> Dict[str, Any]:
+    def search_iter(self, q: Optional[Union[str, dict]] = None, page_size: int = 100,
+                    max_results: Optional[int] = None, min_score: Optional[float] = None,
+                    max_search_offset: int = 10000, **search_kwargs) -> Iterator[Dict[str, Any]]:
+        """Iterates over search hits, fetching pages of results as they are needed.
+
+        While the caller consumes a page, the next page is fetched in the background.
+        Iteration stops at the end of the results, after max_results hits, at the first
+        hit scoring below min_score, or at max_search_offset.
+
+        Args:
+            q: the query, as for search()
+            page_size: number of hits requested per search call
+            max_results: the maximum number of hits to yield. If None, hits are yielded
+                until one of the other conditions is met.
+            min_score: if set, iteration stops at the first hit with a lower _score
+            max_search_offset: the largest offset Marqo accepts for search pagination
+            search_kwargs: other arguments of search(), e.g. search_method or filter_string.
+                limit and offset are set by the iterator, and typed and raw results are
+                not supported.
+
+        Returns:
+            An iterator over the hits, in the order returned by Marqo
+        """
+        if (not isinstance(page_size, int)) or page_size <= 0:
+            raise errors.InvalidArgError("Page size must be a positive integer")
+        if max_results is not None and ((not isinstance(max_results, int)) or max_results < 0):
+            raise errors.InvalidArgError("max_results must be a non-negative integer")
+        if "limit" in search_kwargs or "offset" in search_kwargs:
+            raise errors.InvalidArgError("search_iter sets limit and offset itself. Use page_size and max_results.")
+        if search_kwargs.get("typed") or search_kwargs.get("raw"):
+            raise errors.InvalidArgError("search_iter yields hits as dictionaries and does not support typed or raw.")
+
+        stop = max_search_offset if max_results is None else min(max_results, max_search_offset)
+
+        def fetch_pages():
+            offset = 0
+            while offset < stop:
+                limit = min(page_size, stop - offset)
+                hits = self.search(q=q, limit=limit, offset=offset, **search_kwargs)["hits"]
+                yield hits
+                if len(hits) < limit or (min_score is not None and hits and hits[-1]["_score"] < min_score):
+                    return
+                offset += len(hits)
+            if max_results is None or max_results > max_search_offset:
+                mq_logger.warning(
+                    f"search_iter stopped at the maximum search offset ({max_search_offset}) of index "
+                    f"`{self.index_name}`. Narrow the search with filter_string to read further.")
+
+        def iterate_hits():
+            for hits in prefetch(fetch_pages()):
+                for hit in hits:
+                    if min_score is not None and hit["_score"] < min_score:
+                        return
+                    yield hit
+
+        return iterate_hits()
+
+    def hybrid_search(self, q: str, limit: int = 10, fusion: str = "rrf", candidate_limit: Optional[int] = None,
+                      rrf_k: int = 60, lexical_weight: float = 0.5, dedupe: bool = True,
+                      searchable_attributes: Optional[List[str]] = None, filter_string: Optional[str] = None,
+                      attributes_to_retrieve: Optional[List[str]] = None, show_highlights: Optional[bool] = None,
+                      device: Optional[str] = None, projection: Optional[Union[str, bool]] = None) -> Dict[str, Any]:
+        """Runs a lexical and a tensor search in one bulk search request and fuses the results.
+
+        Args:
+            q: String to search
+            limit: The max number of fused hits to be returned
+            fusion: "rrf" scores each hit by reciprocal-rank fusion, i.e. the sum of
+                1 / (rrf_k + rank) over the result lists it appears in. "weighted" rescales
+                the scores of each list to [0, 1] and sums them, weighting the lexical scores
+                by lexical_weight and the tensor scores by 1 - lexical_weight.
+            candidate_limit: number of hits requested from each search method. Defaults to limit.
+            rrf_k: the rank constant of reciprocal-rank fusion
+            lexical_weight: weight of the lexical scores in weighted fusion, between 0 and 1
+            dedupe: if True, a document found by both methods is returned once with the
+                combined score. Otherwise each hit is ranked on its own.
+            searchable_attributes: attributes to search
+            filter_string: a filter string applied to both searches
+            attributes_to_retrieve: a list of document attributes to be retrieved
+            show_highlights: True if highlights are to be returned. Defaults to the
+                projection profile's setting, or True without a profile.
+            device: the device used to search
+            projection: the name of a projection profile, as for search()
+
+        Returns:
+            Dictionary with the fused hits, best first. Each hit has the fused _score, and its
+            _lexical_score and _tensor_score (None if the method did not find it).
+        """
+        if fusion not in ("rrf", "weighted"):
+            raise errors.InvalidArgError(f"Unsupported fusion `{fusion}`. Supported values are 'rrf' and 'weighted'")
+        if not 0 <= lexical_weight <= 1:
+            raise errors.InvalidArgError("lexical_weight must be between 0 and 1")
+        candidate_limit = limit if candidate_limit is None else candidate_limit
+        if candidate_limit < limit:
+            raise errors.InvalidArgError("candidate_limit can't be less than limit")
+
+        start_time_client_request = timer()
+        profile = resolve_projection(self.config, self.index_name, projection)
+        query = {"index": self.index_name, "q": q, "limit": candidate_limit, "showHighlights": show_highlights}
+        if searchable_attributes is not None:
+            query["searchableAttributes"] = searchable_attributes
+        if filter_string is not None:
+            query["filter"] = filter_string
+        if attributes_to_retrieve is not None:
+            query["attributesToRetrieve"] = attributes_to_retrieve
+        apply_to_search_query(query, profile)
+        if query["showHighlights"] is None:
+            query["showHighlights"] = True
+        body = {"queries": [{**query, "searchMethod": SearchMethods.LEXICAL},
+                            {**query, "searchMethod": SearchMethods.TENSOR}]}
+        path_with_query_str = (
+            f"indexes/bulk/search"
+            f"{f'?&device={utils.translate_device_string_for_url(device)}' if device is not None else ''}"
+        )
+        body = throttle(self.config.search_rate_limit, body, num_docs=2)
+        lexical_result, tensor_result = self.http.post(
+            path=path_with_query_str, body=body, index_name=self.index_name,
+        )["result"]
+
+        hits = fuse_hits(lexical_result["hits"], tensor_result["hits"], limit=limit, fusion=fusion,
+                          rrf_k=rrf_k, lexical_weight=lexical_weight, dedupe=dedupe)
+        mq_logger.debug(f"hybrid_search: took {(timer() - start_time_client_request):.3f}s to search and fuse "
+                        f"{len(lexical_result['hits'])} lexical and {len(tensor_result['hits'])} tensor hits.")
+        return {"hits": hits, "query": q, "limit": limit}
+
+    def get_document(self, document_id: str, expose_facets=None,
+                     embedding_format: Optional[str] = None) -> Dict[str, Any]:
         """Get one document with given an ID.
 
         Args:
@@ -299,6 +508,10 @@ class Index:
             expose_facets: If True, tensor facets will be returned for the the
                 document. Each facets' embedding is accessible via the
                 _embedding field.
+            embedding_format: If set, _embedding fields are decoded with NumPy
+                instead of into lists of floats. "numpy" returns each embedding
+                as a float32 array. "matrix" returns one float32 matrix under
+                "_embeddings", and each _embedding is the number of its row.
 
         Returns:
             Dictionary containing the documents information.
@@ -306,9 +519,12 @@ class Index:
         url_string = f"indexes/{self.index_name}/documents/{document_id}"
         if expose_facets is not None:
             url_string += f"?expose_facets={expose_facets}"
-        return self.http.get(url_string, index_name=self.index_name,)
+        return self.http.get(url_string, index_name=self.index_name, **self._embedding_decoder(embedding_format))
 
-    def get_documents(self, document_ids: List[str], expose_facets=None) -> Dict[str, Any]:
+    def get_documents(self, document_ids: List[str], expose_facets=None,
+                      embedding_format: Optional[str] = None,
+                      projection: Optional[Union[str, bool]] = None,
+                      raw: bool = False) -> Union[Dict[str, Any], RawResponse]:
         """Gets a selection of documents based on their IDs.
 
         Args:
@@ -316,18 +532,88 @@ class Index:
             expose_facets: If True, tensor facets will be returned for the the
                 document. Each facets' embedding is accessible via the
                 _embedding field.
+            embedding_format: If set, _embedding fields are decoded with NumPy
+                instead of into lists of floats. "numpy" returns each embedding
+                as a float32 array; when all embeddings have the same dimension
+                these are rows of one contiguous matrix. "matrix" returns that
+                matrix under "_embeddings", and each _embedding is the number of
+                its row.
+            projection: the name of a projection profile registered with
+                register_projection. Defaults to the index's default profile, if
+                any. Pass False to use no profile. Marqo returns whole documents,
+                so the profile's attributes are selected client-side.
+            raw: if True, return a RawResponse holding the undecoded response body
+                and headers. Projection profiles are not applied to raw responses.
 
         Returns:
-            Dictionary containing the documents information.
+            Dictionary containing the documents information, or a RawResponse if raw is True.
         """
+        if raw and embedding_format is not None:
+            raise errors.InvalidArgError("embedding_format can't be used with raw=True")
+        if raw and projection:
+            raise errors.InvalidArgError("Projection profiles can't be applied to raw get_documents responses")
+        profile = resolve_projection(self.config, self.index_name, projection)
         url_string = f"indexes/{self.index_name}/documents"
         if expose_facets is not None:
             url_string += f"?expose_facets={expose_facets}"
-        return self.http.get(
+        res = self.http.get(
             url_string,
             body=document_ids,
             index_name=self.index_name,
+            **self._embedding_decoder(embedding_format),
+            **({"raw": True} if raw else {})
         )
+        # raw callers can't project, so they are not warned, even if the index has a default profile
+        if profile is None and not raw and projection is not False:
+            warn_if_unprojected(self.config, "get_documents", self.index_name, self.http.last_response_bytes())
+        if raw:
+            return res
+        return project_documents(res, profile)
+
+    def register_projection(self, name: str, attributes_to_retrieve: Optional[List[str]] = None,
+                            show_highlights: bool = False, default: bool = False) -> ProjectionProfile:
+        """Registers a named projection profile for this index.
+
+        The profile can then be passed by name to search, hybrid_search, get_documents and
+        Client.bulk_search. Profiles are shared by all Index objects of the same client.
+
+        Args:
+            name: the name of the profile, e.g. "card"
+            attributes_to_retrieve: the document attributes to return. If None, all
+                attributes are returned.
+            show_highlights: whether search hits include _highlights
+            default: if True, the profile is used by every request to this index that
+                does not name a profile
+
+        Returns:
+            The registered profile
+        """
+        profile = ProjectionProfile(attributes_to_retrieve=attributes_to_retrieve, show_highlights=show_highlights)
+        self.config.projection_profiles.setdefault(self.index_name, {})[name] = profile
+        if default:
+            self.config.default_projections[self.index_name] = name
+        return profile
+
+    def set_default_projection(self, name: Optional[str]) -> None:
+        """Sets the projection profile used when a request does not name one. None removes the default."""
+        if name is None:
+            self.config.default_projections.pop(self.index_name, None)
+            return
+        if name not in self.config.projection_profiles.get(self.index_name, {}):
+            raise errors.InvalidArgError(
+                f"No projection profile named `{name}` is registered for index `{self.index_name}`")
+        self.config.default_projections[self.index_name] = name
+
+    @staticmethod
+    def _embedding_decoder(embedding_format: Optional[str]) -> Dict[str, Callable[[bytes], Any]]:
+        """The keyword arguments that make HttpRequests decode embeddings in `embedding_format`."""
+        if embedding_format is None:
+            return {}
+        if embedding_format not in EMBEDDING_FORMATS:
+            raise errors.InvalidArgError(
+                f"Unsupported embedding format `{embedding_format}`. Supported formats are {EMBEDDING_FORMATS}")
+        import_numpy()
+        return {"response_decoder": functools.partial(decode_embeddings_response, embedding_format=embedding_format)}
 
     def add_documents(
         self,
@@ -426,10 +712,11 @@ class Index:
                 # Only add device if it has been user-specified
                 path_with_query_str += f"?{query_str_params}"
 
+            body = throttle(self.config.ingest_rate_limit, {"documents": documents, **base_body}, num_docs=num_docs)
+
             # ADD DOCS TIMER-LOGGER (2)
             start_time_client_request = timer()
 
-            body = {"documents": documents, **base_body}
             res = self.http.post(
                 path=path_with_query_str, body=body, index_name=self.index_name,
             )
@@ -451,9 +738,135 @@ class Index:
         mq_logger.debug(f"add_documents completed. total time taken: {(total_add_docs_time):.3f}s.")
         return res
 
-    def update_documents(self, documents: List[Dict], client_batch_size: Optional[int]= None) \
-            -> Union[Dict[str, Any], List[Dict[str, Any]]]:
-        """Update documents in this index. Does a partial update on existing documents."""
+    def add_documents_from_arrays(
+        self,
+        vectors,
+        vector_field: str,
+        ids: Optional[Iterable[str]] = None,
+        fields: Optional[Dict[str, Iterable[Any]]] = None,
+        vector_content: Optional[Iterable[str]] = None,
+        client_batch_size: int = 1000,
+        client_concurrency: int = 1,
+        device: str = None,
+        tensor_fields: List[str] = None,
+        mappings: dict = None,
+        significant_digits: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Add documents with precomputed vectors stored in a NumPy array to a custom_vector field.
+
+        Vectors are serialised straight from the array, one batch of rows at a time, so no
+        Python floats are created and memory-mapped arrays are only read a batch at a time.
+        For unstructured indexes, pass tensor_fields=[vector_field] and
+        mappings={vector_field: {"type": "custom_vector"}}.
+
+        Args:
+            vectors: a 2-D array (e.g. a numpy.ndarray or numpy.memmap) with one vector per document
+            vector_field: the custom_vector field the vectors are stored in
+            ids: the _id of each document. If not given, Marqo generates the ids.
+            fields: other fields of the documents, as a dictionary mapping each field name to
+                a column of values with one value per document, e.g. {"title": titles}
+            vector_content: the content of the custom_vector field for each document
+            client_batch_size: number of documents sent in each request
+            client_concurrency: number of batches to send concurrently
+            device: the device used to index the data
+            tensor_fields: fields within documents to create and store tensors against
+            mappings: a dictionary to help handle the object fields. e.g., custom_vector fields
+            significant_digits: number of significant digits sent for each vector value. The
+                default keeps float32 vectors within about one unit in the last place.
+
+        Returns:
+            A list of responses, one for each batch
+        """
+        np = import_numpy()
+        if client_batch_size <= 0:
+            raise errors.InvalidArgError("Batch size can't be less than 1!")
+        if client_concurrency < 1:
+            raise errors.InvalidArgError("client_concurrency can't be less than 1!")
+        if getattr(vectors, "ndim", None) != 2:
+            vectors = np.asarray(vectors)
+            if vectors.ndim != 2:
+                raise errors.InvalidArgError(
+                    f"vectors must be a 2-D array, got an array with shape {vectors.shape}")
+        num_docs = len(vectors)
+
+        # The other fields are small next to the vectors, so they are converted to plain
+        # Python values up front and encoded with json.
+        columns: Dict[str, List[Any]] = {}
+        for name, column in [("_id", ids), *(fields or {}).items()]:
+            if column is None:
+                continue
+            values = column.tolist() if hasattr(column, "tolist") else list(column)
+            if len(values) != num_docs:
+                raise errors.InvalidArgError(
+                    f"Field `{name}` has {len(values)} values, but there are {num_docs} vectors")
+            columns[name] = values
+        if vector_field in columns:
+            raise errors.InvalidArgError(f"`{vector_field}` is the vector field and can't also be given in fields")
+        content = None
+        if vector_content is not None:
+            content = vector_content.tolist() if hasattr(vector_content, "tolist") else list(vector_content)
+            if len(content) != num_docs:
+                raise errors.InvalidArgError(
+                    f"vector_content has {len(content)} values, but there are {num_docs} vectors")
+
+        path_with_query_str = f"indexes/{self.index_name}/documents?refresh=false"
+        if device is not None:
+            path_with_query_str += f"&device={utils.translate_device_string_for_url(device)}"
+        base_body = {"mappings": mappings}
+        if tensor_fields is not None:
+            base_body["tensorFields"] = tensor_fields
+        body_suffix = b"], " + json.dumps(base_body).encode("utf-8")[1:]
+        vector_key = json.dumps(vector_field).encode("utf-8")
+
+        def encode_batch(start: int) -> bytes:
+            end = min(start + client_batch_size, num_docs)
+            vector_texts = vectors_to_json(vectors[start:end], significant_digits=significant_digits)
+            encoded_docs = []
+            for row, vector_text in zip(range(start, end), vector_texts):
+                other_fields = json.dumps({name: values[row] for name, values in columns.items()}).encode("utf-8")
+                head = b"{" if other_fields == b"{}" else other_fields[:-1] + b", "
+                custom_vector = b'{"vector": ' + vector_text
+                if content is not None:
+                    custom_vector += b', "content": ' + json.dumps(content[row]).encode("utf-8")
+                encoded_docs.append(head + vector_key + b": " + custom_vector + b"}}")
+            return b'{"documents": [' + b", ".join(encoded_docs) + body_suffix
+
+        def send_batch(start: int) -> Dict[str, Any]:
+            batch_number = start // client_batch_size
+            batch_size = min(client_batch_size, num_docs - start)
+            body = throttle(self.config.ingest_rate_limit, encode_batch(start), num_docs=batch_size)
+            t0 = timer()
+            res = self.http.post(path=path_with_query_str, body=body, index_name=self.index_name)
+            total_batch_time = timer() - t0
+            if 'processingTimeMs' in res:
+                mq_logger.info(
+                    f"    add_documents_from_arrays batch {batch_number}: took {(res['processingTimeMs'] / 1000):.3f}s "
+                    f"for Marqo to process & index {batch_size} docs. Roundtrip time: {(total_batch_time):.3f}s.")
+            if 'errors' in res and res['errors']:
+                mq_logger.info(f"    add_documents_from_arrays batch {batch_number}: Errors detected in add documents "
+                               f"call. Please examine the returned result object for more information.")
+            return res
+
+        mq_logger.debug(f"starting array ingestion of {num_docs} docs with batch size {client_batch_size}")
+        results = list(map_ordered(send_batch, range(0, num_docs, client_batch_size), client_concurrency))
+        mq_logger.debug('completed array ingestion.')
+        return results
+
+    def update_documents(self, documents: List[Dict], client_batch_size: Optional[int]= None,
+                         client_concurrency: int = 1) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Update documents in this index. Does a partial update on existing documents.
+
+        Args:
+            documents: List of partial documents. Each document must contain an _id.
+            client_batch_size: if it is set, documents will be sent in batches of this size.
+                Otherwise documents are unbatched client-side.
+            client_concurrency: the maximum number of batches sent to Marqo at the same time.
+                Only used when client_batch_size is set. Batches that update the same _id
+                are always sent in their original order.
+        Returns:
+            Response body outlining the update result, or a list of response bodies
+            (one per batch, in batch order) if client_batch_size is set.
+        """
 
         t0 = timer()
 
@@ -463,13 +876,15 @@ class Index:
         if client_batch_size is not None:
             if (not isinstance(client_batch_size, int)) or client_batch_size <= 0:
                 raise errors.InvalidArgError("Batch size must be a positive integer")
-            res = self._batch_update_documents(documents, client_batch_size)
+            if (not isinstance(client_concurrency, int)) or client_concurrency <= 0:
+                raise errors.InvalidArgError("Client concurrency must be a positive integer")
+            res = self._batch_update_documents(documents, client_batch_size, client_concurrency)
         else:
             start_time_client_request = timer()
             num_docs = len(documents)
 
             base_path = f"indexes/{self.index_name}/documents"
-            body = {"documents": documents}
+            body = throttle(self.config.ingest_rate_limit, {"documents": documents}, num_docs=num_docs)
 
             res = self.http.patch(
                 path=base_path, body=body, index_name=self.index_name,
@@ -498,8 +913,14 @@ class Index:
         base_path = f"indexes/{self.index_name}/documents/update"
         return self.http.post(path=base_path, body=documents, index_name=self.index_name,)
 
-    def _batch_update_documents(self, documents, client_batch_size) -> List[Dict[str, Any]]:
-        """Update documents in this index with batched requests. Does a partial update on existing documents."""
+    def _batch_update_documents(self, documents, client_batch_size, client_concurrency: int = 1) \
+            -> List[Dict[str, Any]]:
+        """Update documents in this index with batched requests. Does a partial update on existing documents.
+
+        Up to client_concurrency batches are in flight at once. A batch that shares an _id
+        with an earlier batch waits for that batch to finish, so updates to the same
+        document are applied in order.
+        """
 
         deeper = ((doc, i, client_batch_size) for i, doc in enumerate(documents))
         base_path = f"indexes/{self.index_name}/documents"
@@ -516,12 +937,36 @@ class Index:
             return gathered
 
         batched = functools.reduce(lambda x, y: batch_requests(x, y), deeper, [])
+
+        # For each batch, the earlier batches it must wait for because they update the same _id
+        batch_done = [threading.Event() for _ in batched]
+        batch_dependencies = [set() for _ in batched]
+        if client_concurrency > 1:
+            last_batch_for_id = {}
+            for batch_number, docs in enumerate(batched):
+                for doc in docs:
+                    doc_id = doc.get("_id") if isinstance(doc, dict) else None
+                    if not isinstance(doc_id, (str, int)):
+                        continue
+                    previous_batch = last_batch_for_id.get(doc_id)
+                    if previous_batch is not None and previous_batch != batch_number:
+                        batch_dependencies[batch_number].add(previous_batch)
+                    last_batch_for_id[doc_id] = batch_number
+
         def update_batch_documents(batch_number, docs):
+            for dependency in batch_dependencies[batch_number]:
+                batch_done[dependency].wait()
+            try:
+                return send_batch(batch_number, docs)
+            finally:
+                batch_done[batch_number].set()
+
+        def send_batch(batch_number, docs):
             errors_detected = False
 
-            t0 = timer()
+            body = throttle(self.config.ingest_rate_limit, {"documents": docs}, num_docs=len(docs))
 
-            body = {"documents": docs}
+            t0 = timer()
             res = self.http.patch(path=base_path, body=body, index_name=self.index_name)
 
             total_batch_time = timer() - t0
@@ -538,22 +983,356 @@ class Index:
                 mq_logger.info(f"    update_documents batch {batch_number}: {error_detected_message}")
             return res
 
-        results = [update_batch_documents(batch_number, docs) for batch_number, docs in enumerate(batched)]
+        results = list(map_ordered(
+            lambda batch: update_batch_documents(*batch), enumerate(batched), max_workers=client_concurrency
+        ))
         mq_logger.debug('completed batch ingestion.')
         return results
 
-    def delete_documents(self, ids: List[str]) -> Dict[str, int]:
+    def delete_documents(self, ids: Iterable[str], client_batch_size: Optional[int] = None,
+                         client_concurrency: int = 1) -> Dict[str, Any]:
         """Delete documents from this index by a list of their ids.
 
         Args:
-            ids: List of identifiers of documents.
+            ids: List of identifiers of documents. If client_batch_size is set, this can be
+                any iterable (e.g. a generator), which is consumed lazily.
+            client_batch_size: if it is set, ids will be sent in chunks of this size, so
+                arbitrarily many ids can be deleted in bounded memory. Otherwise all ids are
+                sent in a single request.
+            client_concurrency: the maximum number of chunks sent to Marqo at the same time.
+                Only used when client_batch_size is set.
+
+        Returns:
+            A dict with information about the delete operation. If the request was
+            batched, the results of all batches are aggregated into a single dict.
+        """
+        base_path = f"indexes/{self.index_name}/documents/delete-batch"
+
+        if client_batch_size is None:
+            if not isinstance(ids, list):
+                ids = list(ids)
+            return self.http.post(path=base_path, body=ids, index_name=self.index_name,)
+
+        if (not isinstance(client_batch_size, int)) or client_batch_size <= 0:
+            raise errors.InvalidArgError("Batch size must be a positive integer")
+        if (not isinstance(client_concurrency, int)) or client_concurrency <= 0:
+            raise errors.InvalidArgError("Client concurrency must be a positive integer")
+
+        def delete_batch(batch):
+            batch_number, batch_ids = batch
+            t0 = timer()
+            res = self.http.post(path=base_path, body=batch_ids, index_name=self.index_name)
+            mq_logger.debug(f"    delete_documents batch {batch_number}: took {(timer() - t0):.3f}s "
+                            f"to delete {len(batch_ids)} docs (roundtrip).")
+            return res
+
+        res = self._aggregate_delete_responses(map_ordered(
+            delete_batch, enumerate(utils.chunk_iterable(ids, client_batch_size)), max_workers=client_concurrency
+        ))
+        if not res:
+            # nothing to delete, e.g. an empty file of ids
+            return self._empty_delete_response()
+        if res.get("status") != "succeeded":
+            mq_logger.info('Errors detected in delete_documents call. '
+                           'Please examine the returned result object for more information.')
+        return res
+
+    def delete_documents_from_file(self, path: str, client_batch_size: int = 1000,
+                                   client_concurrency: int = 1) -> Dict[str, Any]:
+        """Delete documents from this index using the ids listed in a text file.
+
+        The file is streamed, so it can contain millions of ids.
+
+        Args:
+            path: path to a text file with one document id per line. Empty lines are ignored.
+            client_batch_size: number of ids sent in each delete request
+            client_concurrency: the maximum number of delete requests sent to Marqo at the same time
+
+        Returns:
+            A dict with the aggregated results of all delete requests.
+        """
+        return self.delete_documents(
+            utils.read_lines(path), client_batch_size=client_batch_size, client_concurrency=client_concurrency
+        )
+
+    def _iter_matching_id_pages(self, q: str, search_method: Union[SearchMethods.TENSOR, str],
+                                filter_string: Optional[str], page_size: int, max_search_offset: int,
+                                warn_if_truncated: bool = False) -> Iterator[List[str]]:
+        """Pages through search results, yielding the ids of each page.
+
+        Only _id is retrieved and highlights are disabled to keep responses small. Ids are
+        de-duplicated within one scan, since pages can shift while they are being read.
+        The scan stops at the end of the results or at max_search_offset.
+        """
+        seen = set()
+        offset = 0
+        while offset < max_search_offset:
+            res = self.search(
+                q=q, search_method=search_method, filter_string=filter_string,
+                limit=min(page_size, max_search_offset - offset), offset=offset,
+                attributes_to_retrieve=["_id"], show_highlights=False,
+            )
+            hits = res["hits"]
+            ids = [hit["_id"] for hit in hits if hit["_id"] not in seen]
+            if ids:
+                seen.update(ids)
+                yield ids
+            if len(hits) < page_size:
+                return
+            offset += len(hits)
+        if warn_if_truncated:
+            mq_logger.warning(
+                f"Stopped reading documents from index `{self.index_name}` at the maximum search offset "
+                f"({max_search_offset}). Some documents may be missing. To read more documents, narrow "
+                f"the scan with filter_string and run it once per partition, or pass document_ids.")
+
+    def _empty_delete_response(self) -> Dict[str, Any]:
+        """The result of a client-side delete that had no ids to send"""
+        return {"indexName": self.index_name, "type": "documentDeletion", "status": "succeeded",
+                "details": {"receivedDocumentIds": 0, "deletedDocuments": 0}, "items": []}
+
+    @staticmethod
+    def _aggregate_delete_responses(responses: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combines the responses of batched delete requests into a single response.
+
+        Counts in `details` are summed, `items` are concatenated in request order and the
+        status is only "succeeded" if every batch succeeded. The per-request `duration`
+        is dropped; `startedAt` and `finishedAt` span all batches.
+        """
+        aggregated: Dict[str, Any] = {}
+        for res in responses:
+            if not aggregated:
+                aggregated = {k: v for k, v in res.items() if k != "duration"}
+                aggregated["items"] = list(res.get("items", []))
+                aggregated["details"] = dict(res.get("details", {}))
+                continue
+            aggregated["items"].extend(res.get("items", []))
+            for key, value in res.get("details", {}).items():
+                aggregated["details"][key] = aggregated["details"].get(key, 0) + value
+            if res.get("status") != "succeeded":
+                aggregated["status"] = res.get("status")
+            if "finishedAt" in res:
+                aggregated["finishedAt"] = res["finishedAt"]
+        return aggregated
+
+    def delete_by_filter(self, filter_string: str, q: str = "*",
+                         search_method: Union[SearchMethods.TENSOR, str] = SearchMethods.LEXICAL,
+                         page_size: int = 500, client_concurrency: int = 2,
+                         max_search_offset: int = 10000) -> Dict[str, Any]:
+        """Delete all documents matching a filter.
+
+        Matching ids are found by paging through search results (retrieving only _id,
+        without highlights). The ids of each page are deleted concurrently while the
+        next page is fetched. Because deletions shift the search results, the scan is
+        repeated from the first page until a pass finds nothing left to delete. Memory
+        use is bounded by max_search_offset, not by the number of matching documents.
+
+        Args:
+            filter_string: a filter string selecting the documents to delete.
+                For example: "tenant:acme AND expired:true"
+            q: the query used to page through the matches. "*" matches every document
+                with lexical search.
+            search_method: the search method used to find matches. Lexical search is
+                exhaustive; tensor search is approximate, so may need more passes.
+            page_size: number of ids fetched per search request and deleted per delete request
+            client_concurrency: the maximum number of delete requests in flight at once
+            max_search_offset: the largest offset Marqo accepts for search pagination. A pass
+                stops when it reaches this offset and the next pass starts from the first page.
 
         Returns:
-            A dict with information about the delete operation.
+            A dict with the aggregated results of all delete requests.
         """
+        if (not isinstance(page_size, int)) or page_size <= 0:
+            raise errors.InvalidArgError("Page size must be a positive integer")
+        if (not isinstance(client_concurrency, int)) or client_concurrency <= 0:
+            raise errors.InvalidArgError("Client concurrency must be a positive integer")
+
         base_path = f"indexes/{self.index_name}/documents/delete-batch"
 
-        return self.http.post(path=base_path, body=ids, index_name=self.index_name,)
+        def matching_id_pages():
+            return self._iter_matching_id_pages(
+                q=q, search_method=search_method, filter_string=filter_string,
+                page_size=page_size, max_search_offset=max_search_offset,
+            )
+
+        def delete_page(ids):
+            return self.http.post(path=base_path, body=ids, index_name=self.index_name)
+
+        t0 = timer()
+        pass_results = []
+        while True:
+            res = self._aggregate_delete_responses(
+                map_ordered(delete_page, matching_id_pages(), max_workers=client_concurrency)
+            )
+            if not res:
+                break
+            pass_results.append(res)
+            mq_logger.debug(f"delete_by_filter pass {len(pass_results)}: deleted "
+                            f"{res.get('details', {}).get('deletedDocuments', 0)} docs.")
+            if not res.get("details", {}).get("deletedDocuments"):
+                # everything found was already deleted (or cannot be), another pass won't help
+                break
+
+        mq_logger.debug(f"delete_by_filter completed. total time taken: {(timer() - t0):.3f}s.")
+        if not pass_results:
+            return self._empty_delete_response()
+        return self._aggregate_delete_responses(pass_results)
+
+    def iter_documents(self, document_ids: Optional[Iterable[str]] = None, filter_string: Optional[str] = None,
+                       q: str = "*", search_method: Union[SearchMethods.TENSOR, str] = SearchMethods.LEXICAL,
+                       page_size: int = 100, expose_facets: bool = False,
+                       max_search_offset: int = 10000) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over the documents of this index.
+
+        Documents are fetched a page at a time with get_documents, and the next page is
+        fetched in the background while the current one is being consumed, so only
+        about two pages are held in memory at once.
+
+        Args:
+            document_ids: ids of the documents to read. Any iterable is accepted and is consumed
+                lazily. If not given, the documents are found by paging through search results.
+            filter_string: when document_ids is not given, only documents matching this filter
+                are read. For example: "tenant:acme"
+            q: when document_ids is not given, the query used to page through the index.
+                "*" matches every document with lexical search.
+            search_method: the search method used to page through the index
+            page_size: number of documents fetched per request
+            expose_facets: if True, each document includes its _tensor_facets, with the
+                embedding of each facet in the _embedding field.
+            max_search_offset: the largest offset Marqo accepts for search pagination. Scans
+                that reach it stop with a warning; use filter_string to partition larger indexes.
+
+        Returns:
+            An iterator over documents. Documents that are not found are skipped.
+        """
+        for page in self._iter_document_pages(
+                document_ids=document_ids, filter_string=filter_string, q=q, search_method=search_method,
+                page_size=page_size, expose_facets=expose_facets, max_search_offset=max_search_offset):
+            yield from page
+
+    def export(self, path: str, file_format: Optional[str] = None, document_ids: Optional[Iterable[str]] = None,
+               filter_string: Optional[str] = None, q: str = "*",
+               search_method: Union[SearchMethods.TENSOR, str] = SearchMethods.LEXICAL,
+               page_size: int = 100, expose_facets: bool = False, max_search_offset: int = 10000) -> int:
+        """Export the documents of this index to a JSONL or Parquet file.
+
+        Documents are streamed to the file one page at a time, so memory use does not grow
+        with the size of the index. Parquet export requires pyarrow.
+
+        Args:
+            path: the file to write
+            file_format: "jsonl" or "parquet". Inferred from the extension of path if not given.
+            document_ids, filter_string, q, search_method, page_size, expose_facets,
+                max_search_offset: select the documents to export, see iter_documents()
+
+        Returns:
+            The number of documents written.
+        """
+        if (not isinstance(page_size, int)) or page_size <= 0:
+            raise errors.InvalidArgError("Page size must be a positive integer")
+        writer = get_document_writer(path, file_format)
+        num_docs = 0
+        t0 = timer()
+        try:
+            for page in self._iter_document_pages(
+                    document_ids=document_ids, filter_string=filter_string, q=q, search_method=search_method,
+                    page_size=page_size, expose_facets=expose_facets, max_search_offset=max_search_offset):
+                writer.write_page(page)
+                num_docs += len(page)
+        finally:
+            writer.close()
+        mq_logger.debug(f"export: took {(timer() - t0):.3f}s to write {num_docs} docs to {path}.")
+        return num_docs
+
+    def export_embeddings(self, path: str, document_ids: Optional[Iterable[str]] = None,
+                          filter_string: Optional[str] = None, dtype: str = "float32",
+                          page_size: int = 100, max_search_offset: int = 10000) -> Dict[str, Any]:
+        """Export the tensor facet embeddings of this index to a NumPy .npy file.
+
+        Embeddings are streamed into the file one page of documents at a time, so the
+        whole matrix never has to fit in memory, and can be opened memory-mapped
+        afterwards, e.g. with marqo.vectors.load_embeddings(path). Side arrays with the
+        _id and field name of each row are written next to it (<path>.ids.npy and
+        <path>.keys.npy). Requires NumPy.
+
+        Args:
+            path: the .npy file to write
+            document_ids: export only the embeddings of these documents. Any iterable is
+                accepted and is consumed lazily. Defaults to the whole index.
+            filter_string: export only documents matching this filter
+            dtype: "float32", "float16" or "int8". int8 embeddings are quantized per row, and
+                the row scales are written to <path>.scales.npy.
+            page_size: number of documents fetched per request
+            max_search_offset: see iter_documents()
+
+        Returns:
+            A dict with the paths of the files written and the shape of the matrix.
+        """
+        if dtype not in SUPPORTED_EMBEDDING_DTYPES:
+            raise errors.InvalidArgError(
+                f"Unsupported dtype `{dtype}`. Supported dtypes are {SUPPORTED_EMBEDDING_DTYPES}")
+        np = import_numpy()
+        side_paths = embedding_side_paths(path)
+        ids, keys, scales = [], [], []
+
+        t0 = timer()
+        writer = NpyRowWriter(path, dtype)
+        try:
+            for page in self._iter_document_pages(
+                    document_ids=document_ids, filter_string=filter_string, q="*",
+                    search_method=SearchMethods.LEXICAL, page_size=page_size, expose_facets=True,
+                    max_search_offset=max_search_offset, embedding_format="numpy"):
+                embeddings, page_ids, page_keys = facets_to_matrix(page)
+                if dtype == "int8" and len(embeddings):
+                    embeddings, page_scales = quantize_int8(embeddings)
+                    scales.append(page_scales)
+                writer.write(embeddings)
+                ids.extend(page_ids)
+                keys.extend(page_keys)
+        finally:
+            writer.close()
+
+        np.save(side_paths["ids"], np.array(ids, dtype=str))
+        np.save(side_paths["keys"], np.array(keys, dtype=str))
+        exported = {"embeddings": path, "ids": side_paths["ids"], "keys": side_paths["keys"], "scales": None,
+                    "shape": (writer.num_rows, writer.num_columns or 0)}
+        if dtype == "int8":
+            np.save(side_paths["scales"],
+                    np.concatenate(scales) if scales else np.empty((0,), dtype=np.float32))
+            exported["scales"] = side_paths["scales"]
+        elif os.path.exists(side_paths["scales"]):
+            # left over from an earlier int8 export to the same path
+            os.remove(side_paths["scales"])
+        mq_logger.debug(f"export_embeddings: took {(timer() - t0):.3f}s to write {writer.num_rows} "
+                        f"embeddings to {path}.")
+        return exported
+
+    def _iter_document_pages(self, document_ids: Optional[Iterable[str]], filter_string: Optional[str],
+                             q: str, search_method: Union[SearchMethods.TENSOR, str], page_size: int,
+                             expose_facets: bool, max_search_offset: int,
+                             embedding_format: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yields pages of documents, prefetching the next page in the background."""
+        if (not isinstance(page_size, int)) or page_size <= 0:
+            raise errors.InvalidArgError("Page size must be a positive integer")
+
+        if document_ids is not None:
+            id_pages = utils.chunk_iterable(document_ids, page_size)
+        else:
+            id_pages = self._iter_matching_id_pages(
+                q=q, search_method=search_method, filter_string=filter_string, page_size=page_size,
+                max_search_offset=max_search_offset, warn_if_truncated=True,
+            )
+
+        def fetch_pages():
+            for ids in id_pages:
+                res = self.get_documents(ids, expose_facets=True if expose_facets else None,
+                                         embedding_format=embedding_format, projection=False)
+                yield [
+                    {key: value for key, value in doc.items() if key != "_found"}
+                    for doc in res["results"] if doc.get("_found", True)
+                ]
+
+        return prefetch(fetch_pages())
 
     def get_stats(self) -> Dict[str, Any]:
         """Get stats about the index"""
@@ -615,8 +1394,9 @@ class Index:
         def verbosely_add_docs(i, docs):
             errors_detected = False
 
+            body = throttle(self.config.ingest_rate_limit, {"documents": docs, **base_body}, num_docs=len(docs))
+
             t0 = timer()
-            body = {"documents": docs, **base_body}
             res = self.http.post(path=path_with_query_str, body=body, index_name=self.index_name)
 
             total_batch_time = timer() - t0
@@ -691,7 +1471,55 @@ class Index:
             path=f"models?model_name={model_name}&model_device={model_device}", index_name=self.index_name
         )
 
+    def _schedule_version_check(self) -> None:
+        """Runs the version check now, before the first request or in a background thread,
+        depending on config.version_check_mode."""
+        mode = self.config.version_check_mode
+        if mode == VersionCheckMode.DISABLED:
+            return
+        try:
+            url = self.config.instance_mapping.get_index_base_url(self.index_name)
+        except errors.MarqoError:
+            url = None
+        if url is not None and url in marqo_url_and_version_cache:
+            return
+        if mode == VersionCheckMode.LAZY:
+            self.http.before_next_request = self._marqo_minimum_supported_version_check
+        elif mode == VersionCheckMode.BACKGROUND:
+            with _background_version_checks_lock:
+                if url in _background_version_checks:
+                    return
+                thread = threading.Thread(target=self._background_version_check, args=(url,),
+                                          name="marqo-version-check", daemon=True)
+                _background_version_checks[url] = thread
+            thread.start()
+        else:
+            self._marqo_minimum_supported_version_check()
+
+    def _background_version_check(self, url: Optional[str]) -> None:
+        try:
+            self._marqo_minimum_supported_version_check()
+        finally:
+            with _background_version_checks_lock:
+                _background_version_checks.pop(url, None)
+
+    def _fetch_marqo_version(self, url: str) -> str:
+        """The version of the Marqo instance at `url`, read from the version cache file when it
+        holds a recent enough entry."""
+        cache_path = self.config.version_cache_path
+        if cache_path is not None:
+            marqo_version = _version_cache.read_version(cache_path, url, self.config.version_cache_ttl)
+            if marqo_version is not None:
+                return marqo_version
+        # self.get_marqo() uses get_index_base_url(), so it should be available
+        marqo_version = self.get_marqo()["version"]
+        if cache_path is not None and isinstance(marqo_version, str):
+            _version_cache.write_version(cache_path, url, marqo_version)
+        return marqo_version
+
     def _marqo_minimum_supported_version_check(self):
+        from packaging import version as versioning_helpers
+
         min_ver = minimum_supported_marqo_version()
         # in case we have a problem getting the index's URL:
         skip_warning_message = (
@@ -709,8 +1537,7 @@ class Index:
                 f"If you are sure your Marqo version is compatible with this client, you can ignore this message. ")
 
             if url not in marqo_url_and_version_cache:
-                # self.get_marqo() uses get_index_base_url(), so it should be available
-                marqo_url_and_version_cache[url] = self.get_marqo()["version"]
+                marqo_url_and_version_cache[url] = self._fetch_marqo_version(url)
             else:
                 # we already have the version cached, and therefor also logged a warning if needed
                 return
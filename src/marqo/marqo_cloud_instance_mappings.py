@@ -1,27 +1,73 @@
+import hashlib
+import json
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 import requests
 from requests.exceptions import Timeout
 
+from marqo import _httprequests
 from marqo.errors import (
     MarqoCloudIndexNotFoundError,
     MarqoCloudIndexNotReadyError,
+    MarqoWebError,
 )
 from marqo.instance_mappings import InstanceMappings
 from marqo.marqo_logging import mq_logger
 from marqo.enums import IndexStatus
-from marqo.models.marqo_cloud import ListIndexesResponse
+from marqo.utils import atomic_write_json, file_lock
 
 
 class MarqoCloudInstanceMappings(InstanceMappings):
 
-    def __init__(self, control_base_url, api_key=None, url_cache_duration: int = 15):
+    def __init__(self, control_base_url, api_key=None, url_cache_duration: int = 15,
+                 snapshot_path: Optional[str] = None, snapshot_ttl: float = 3600,
+                 refresh_interval: Optional[float] = None, session: Optional[requests.Session] = None,
+                 missing_index_cache_duration: float = 30):
+        """
+        Args:
+            control_base_url: the url of the Marqo Cloud API
+            api_key: the Marqo Cloud API key
+            url_cache_duration: how many seconds the mappings are used for before an unknown
+                index name triggers a refresh
+            snapshot_path: if set, the mappings are saved to this JSON file after every refresh.
+                New instances load a snapshot younger than `snapshot_ttl` seconds, so they can route
+                requests straight away, and refresh it in the background. The API key is not saved.
+                Writers take a lock on `<snapshot_path>.lock`, so processes can share the file.
+            snapshot_ttl: how many seconds a snapshot is used for
+            refresh_interval: if set, a background thread refreshes the mappings every
+                `refresh_interval` seconds until stop_background_refresh() is called
+            session: the requests session used to list the indexes. Defaults to the session
+                shared with index requests, so refreshes reuse its pooled connections.
+            missing_index_cache_duration: how many seconds an index name that Marqo Cloud does not
+                know is reported as not found without asking again
+        """
         self.latest_index_mappings_refresh_timestamp = time.time() - url_cache_duration - 1
         self._urls_mapping = {IndexStatus.READY: {}, IndexStatus.CREATING: {}}
         self.api_key = api_key
         self.url_cache_duration = url_cache_duration
         self._control_base_url = control_base_url
+        self.snapshot_path = snapshot_path
+        self.snapshot_ttl = snapshot_ttl
+        self._session = session if session is not None else _httprequests.session
+        # only one thread refreshes at a time. The others keep using the current mappings
+        # or, if they need the result, wait for the refresh in flight instead of starting another
+        self._refresh_lock = threading.Lock()
+        # counts finished refresh attempts, so a thread that waited for one knows not to send another
+        self._refresh_attempts = 0
+        self._stop_refresher = threading.Event()
+        # once the whole account has been listed, unknown index names are looked up one at a time
+        self._mappings_loaded = False
+        self._index_lookup_timestamps: Dict[str, float] = {}
+        self.missing_index_cache_duration = missing_index_cache_duration
+        self._missing_indexes: Dict[str, float] = {}
+        if snapshot_path is not None and self._load_snapshot():
+            threading.Thread(target=self._revalidate_snapshot, name="marqo-mappings-revalidation",
+                             daemon=True).start()
+        if refresh_interval is not None:
+            threading.Thread(target=self._refresh_periodically, args=(refresh_interval,),
+                             name="marqo-mappings-refresher", daemon=True).start()
 
     def get_control_base_url(self, path: str = "") -> str:
         if path.startswith('indexes'):
@@ -47,18 +93,143 @@ class MarqoCloudInstanceMappings(InstanceMappings):
     def is_remote(self):
         return True
 
-    def _refresh_urls_if_needed(self, index_name: Optional[str] = None):
+    def _refresh_urls_if_needed(self, index_name: Optional[str] = None, wait: bool = True):
         if index_name is None or index_name not in self._urls_mapping[IndexStatus.READY]:
-            if time.time() - self.latest_index_mappings_refresh_timestamp > self.url_cache_duration:
-                self._refresh_urls(timeout=15)
+            if self._mappings_expired():
+                if index_name is not None and self._mappings_loaded:
+                    if self._index_lookup_is_fresh(index_name):
+                        return
+                    if self._refresh_index_url_single_flight(index_name, wait=wait):
+                        return
+                self._refresh_urls_single_flight(wait=wait)
+
+    def _mappings_expired(self) -> bool:
+        return time.time() - self.latest_index_mappings_refresh_timestamp > self.url_cache_duration
+
+    def _index_lookup_is_fresh(self, index_name: str) -> bool:
+        """Whether index_name was recently looked up, or found missing, on its own."""
+        now = time.time()
+        return (self._missing_indexes.get(index_name, 0) > now
+                or now - self._index_lookup_timestamps.get(index_name, 0) <= self.url_cache_duration)
+
+    def _refresh_index_url_single_flight(self, index_name: str, wait: bool = True) -> bool:
+        """Looks up one index, holding the refresh lock so that concurrent misses on the same
+        name send one request and the result cannot overwrite a concurrent full refresh.
+
+        Returns:
+            False if the lookup failed and the whole account should be listed instead.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return True
+        try:
+            # while this thread waited, another one may have looked the index up or listed the account
+            if (index_name in self._urls_mapping[IndexStatus.READY] or not self._mappings_expired()
+                    or self._index_lookup_is_fresh(index_name)):
+                return True
+            return self._refresh_index_url(index_name)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_index_url(self, index_name: str, timeout=15) -> bool:
+        """Looks up one index through its status endpoint and merges it into the mappings.
+        Must be called with the refresh lock held.
+
+        Returns:
+            False if the lookup failed and the whole account should be listed instead.
+        """
+        from marqo.models.marqo_cloud import IndexStatusResponse
+
+        mq_logger.debug(f"Looking up the Marqo Cloud URL of index {index_name}")
+        path = f"indexes/{index_name}/status"
+        try:
+            response = self._session.get(f'{self.get_control_base_url(path=path)}/{path}',
+                                         headers={"x-api-key": self.api_key}, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            mq_logger.debug(f"Could not look up index {index_name}: {e}")
+            return False
+        now = time.time()
+        if response.status_code == 404:
+            self._set_index_url(index_name, None, None)
+            self._missing_indexes[index_name] = now + self.missing_index_cache_duration
+            return True
+        if not response.ok:
+            return False
+        try:
+            index_status = IndexStatusResponse(**response.json())
+        except (ValueError, TypeError):
+            return False
+        if index_status.indexStatus in (IndexStatus.READY, IndexStatus.MODIFYING, IndexStatus.CREATING):
+            if not index_status.marqoEndpoint:
+                return False
+            self._missing_indexes.pop(index_name, None)
+        else:
+            self._missing_indexes[index_name] = now + self.missing_index_cache_duration
+        self._set_index_url(index_name, index_status.indexStatus, index_status.marqoEndpoint)
+        self._index_lookup_timestamps[index_name] = now
+        return True
+
+    def _set_index_url(self, index_name: str, index_status: Optional[IndexStatus], url: Optional[str]) -> None:
+        """Records the URL of one index under its status, or removes the index if it cannot be used.
+        Must be called with the refresh lock held."""
+        # copied and swapped in, like a full refresh
+        urls_mapping = {status: {name: index_url for name, index_url in indexes.items() if name != index_name}
+                        for status, indexes in self._urls_mapping.items()}
+        if index_status in (IndexStatus.READY, IndexStatus.MODIFYING):
+            urls_mapping[IndexStatus.READY][index_name] = url
+        elif index_status == IndexStatus.CREATING:
+            urls_mapping[IndexStatus.CREATING][index_name] = url
+        self._urls_mapping = urls_mapping
+
+    def _refresh_urls_single_flight(self, wait: bool = True, timeout=15):
+        """Refreshes the mappings unless another thread is already doing so.
+
+        Args:
+            wait: if another thread is refreshing, whether to wait for it to finish.
+                If False, the current mappings keep being used.
+        """
+        attempts_before = self._refresh_attempts
+        if not self._refresh_lock.acquire(blocking=wait):
+            return
+        try:
+            # the refresh we waited for is as recent as one we would send now
+            if self._refresh_attempts != attempts_before:
+                return
+            try:
+                self._refresh_urls(timeout=timeout)
+            finally:
+                self._refresh_attempts += 1
+        finally:
+            self._refresh_lock.release()
+
+    def _revalidate_snapshot(self) -> None:
+        """Refreshes mappings loaded from a snapshot. Runs in a background thread, so errors are
+        logged rather than raised. The snapshot keeps being used until a later refresh succeeds."""
+        try:
+            self._refresh_urls_single_flight(wait=False)
+        except (requests.exceptions.RequestException, MarqoWebError, ValueError) as e:
+            mq_logger.warning(f"Could not revalidate the Marqo Cloud index URLs loaded from the snapshot at "
+                              f"`{self.snapshot_path}`: {e}")
+
+    def _refresh_periodically(self, interval: float) -> None:
+        while not self._stop_refresher.wait(interval):
+            try:
+                self._refresh_urls_single_flight(wait=False)
+            except Exception as e:
+                mq_logger.debug(f"Background refresh of Marqo Cloud index URLs failed: {e}")
+
+    def stop_background_refresh(self) -> None:
+        """Stops the thread started by `refresh_interval`."""
+        self._stop_refresher.set()
 
     def _refresh_urls(self, timeout=None):
+        from marqo.models.marqo_cloud import ListIndexesResponse
+
         mq_logger.debug("Refreshing Marqo Cloud index URL cache")
         path = "indexes"
         base_url = self.get_control_base_url(path=path)
         try:
-            response = requests.get(f'{base_url}/{path}',
-                                    headers={"x-api-key": self.api_key}, timeout=timeout)
+            response = self._session.get(f'{base_url}/{path}',
+                                         headers={"x-api-key": self.api_key}, timeout=timeout)
         except Timeout:
             mq_logger.warning(
                 f"Timeout getting and caching URLs for Marqo Cloud indexes from the"
@@ -71,20 +242,76 @@ class MarqoCloudInstanceMappings(InstanceMappings):
             mq_logger.warning(response.text)
             return None
         response_json = response.json()
-        self._urls_mapping = {IndexStatus.READY: {}, IndexStatus.CREATING: {}}
+        # built aside and swapped in, so other threads keep reading the previous mappings meanwhile
+        urls_mapping = {IndexStatus.READY: {}, IndexStatus.CREATING: {}}
         for raw_response in response_json['results']:
             index_response = ListIndexesResponse(**raw_response)
             if index_response.indexStatus in [IndexStatus.READY, IndexStatus.MODIFYING]:
-                self._urls_mapping[IndexStatus.READY][index_response.indexName] = index_response.marqoEndpoint
+                urls_mapping[IndexStatus.READY][index_response.indexName] = index_response.marqoEndpoint
             elif index_response.indexStatus == IndexStatus.CREATING:
-                self._urls_mapping[IndexStatus.CREATING][index_response.indexName] = index_response.marqoEndpoint
+                urls_mapping[IndexStatus.CREATING][index_response.indexName] = index_response.marqoEndpoint
+        self._urls_mapping = urls_mapping
+        self._mappings_loaded = True
+        self._index_lookup_timestamps.clear()
+        self._missing_indexes.clear()
         if self._urls_mapping:
             self.latest_index_mappings_refresh_timestamp = time.time()
+            if self.snapshot_path is not None:
+                self._write_snapshot()
+
+    def _snapshot_key(self) -> str:
+        """Identifies the account in the snapshot file, without saving the API key."""
+        api_key_digest = hashlib.sha256((self.api_key or "").encode("utf-8")).hexdigest()[:16]
+        return f"{self._control_base_url}#{api_key_digest}"
+
+    def _read_snapshot_file(self) -> Dict[str, Dict]:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshots = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return snapshots if isinstance(snapshots, dict) else {}
+
+    def _load_snapshot(self) -> bool:
+        """Loads the mappings from the snapshot file. Returns whether a recent snapshot was found."""
+        snapshot = self._read_snapshot_file().get(self._snapshot_key())
+        try:
+            saved_at = float(snapshot["saved_at"])
+            if time.time() - saved_at > self.snapshot_ttl:
+                return False
+            urls_mapping = {
+                IndexStatus.READY: dict(snapshot["mappings"][IndexStatus.READY.value]),
+                IndexStatus.CREATING: dict(snapshot["mappings"][IndexStatus.CREATING.value]),
+            }
+        except (TypeError, KeyError, ValueError):
+            return False
+        mq_logger.debug(f"Loaded Marqo Cloud index URLs from the snapshot at `{self.snapshot_path}`")
+        self._urls_mapping = urls_mapping
+        self._mappings_loaded = True
+        # an index missing from the snapshot triggers a refresh once the snapshot is older
+        # than url_cache_duration, like an index missing from a refreshed mapping
+        self.latest_index_mappings_refresh_timestamp = min(saved_at, time.time())
+        return True
+
+    def _write_snapshot(self) -> None:
+        snapshot = {
+            "saved_at": self.latest_index_mappings_refresh_timestamp,
+            "mappings": {status.value: dict(indexes) for status, indexes in self._urls_mapping.items()},
+        }
+        try:
+            # other processes and instances may be updating the entries of other accounts
+            with file_lock(self.snapshot_path):
+                snapshots = self._read_snapshot_file()
+                snapshots[self._snapshot_key()] = snapshot
+                atomic_write_json(self.snapshot_path, snapshots)
+        except OSError as e:
+            mq_logger.debug(f"Could not write the Marqo Cloud index URL snapshot at `{self.snapshot_path}`: {e}")
 
     def index_http_error_handler(self, index_name: str, http_status: Optional[int] = None) -> None:
         mq_logger.debug(f'Triggering cache refresh due to error on index {index_name}')
 
-        self._refresh_urls_if_needed()
+        # if another thread is already refreshing, its result will serve this index too
+        self._refresh_urls_if_needed(wait=False)
 
     def is_index_usage_allowed(self, index_name: str) -> bool:
         """Checks the status of the index in self._urls_mapping.
@@ -29,5 +29,6 @@ class ListIndexesResponse(CloudIndexSettings):
 
 class IndexStatusResponse(MarqoBaseModel):
     indexStatus: Optional[IndexStatus] = None
+    marqoEndpoint: Optional[str] = None
 
 
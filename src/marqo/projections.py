@@ -0,0 +1,112 @@
+"""Named projection profiles that select the fields returned by searches and document reads.
+
+Profiles are registered per index name on the client's Config, so every Index handle
+created from the same Client shares them.
+"""
+import os
+import traceback
+from typing import Any, Dict, List, Optional, Union
+
+from marqo import errors
+from marqo.marqo_logging import mq_logger
+
+# Fields get_documents keeps on every document when a projection is applied client-side
+_DOCUMENT_META_FIELDS = ("_id", "_found", "_tensor_facets")
+
+
+class ProjectionProfile:
+    """The fields returned by a search or document read.
+
+    Example: ProjectionProfile(attributes_to_retrieve=["title", "price"]) returns the _id,
+    title and price of each hit, without highlights.
+    """
+
+    def __init__(self, attributes_to_retrieve: Optional[List[str]] = None, show_highlights: bool = False) -> None:
+        """
+        Args:
+            attributes_to_retrieve: the document attributes to return. _id is always returned.
+                If None, all attributes are returned.
+            show_highlights: whether search hits include _highlights
+        """
+        if attributes_to_retrieve is not None and (
+                isinstance(attributes_to_retrieve, str)
+                or not all(isinstance(attribute, str) for attribute in attributes_to_retrieve)):
+            raise errors.InvalidArgError("attributes_to_retrieve must be a list of attribute names")
+        self.attributes_to_retrieve = list(attributes_to_retrieve) if attributes_to_retrieve is not None else None
+        self.show_highlights = show_highlights
+
+    def __repr__(self) -> str:
+        return (f"ProjectionProfile(attributes_to_retrieve={self.attributes_to_retrieve}, "
+                f"show_highlights={self.show_highlights})")
+
+
+def resolve_projection(config, index_name: str,
+                       projection: Optional[Union[str, bool]]) -> Optional[ProjectionProfile]:
+    """Returns the profile a request to `index_name` should use.
+
+    Args:
+        projection: the name of a registered profile, None to use the index's default
+            profile (if any), or False to use no profile.
+
+    Raises:
+        InvalidArgError: if no profile with that name is registered for the index.
+    """
+    if projection is False:
+        return None
+    if projection is None:
+        projection = config.default_projections.get(index_name)
+        if projection is None:
+            return None
+    try:
+        return config.projection_profiles[index_name][projection]
+    except KeyError:
+        raise errors.InvalidArgError(
+            f"No projection profile named `{projection}` is registered for index `{index_name}`")
+
+
+def apply_to_search_query(query: Dict[str, Any], profile: Optional[ProjectionProfile]) -> Dict[str, Any]:
+    """Fills in attributesToRetrieve and showHighlights of a search body that did not set them."""
+    if profile is None:
+        return query
+    if query.get("attributesToRetrieve") is None and profile.attributes_to_retrieve is not None:
+        query["attributesToRetrieve"] = profile.attributes_to_retrieve
+    if query.get("showHighlights") is None:
+        query["showHighlights"] = profile.show_highlights
+    return query
+
+
+def project_documents(response: Dict[str, Any], profile: Optional[ProjectionProfile]) -> Dict[str, Any]:
+    """Drops the attributes a profile does not select from a get_documents response.
+
+    Marqo has no projection for document reads, so this only trims what the caller keeps.
+    """
+    if profile is None or profile.attributes_to_retrieve is None:
+        return response
+    keep = set(profile.attributes_to_retrieve).union(_DOCUMENT_META_FIELDS)
+    response["results"] = [
+        {key: value for key, value in doc.items() if key in keep} for doc in response.get("results", [])
+    ]
+    return response
+
+
+def _caller_location() -> str:
+    """The first frame of the call stack outside the marqo package."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for frame in reversed(traceback.extract_stack()):
+        if not os.path.abspath(frame.filename).startswith(package_dir):
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def warn_if_unprojected(config, operation: str, index_name: str, size: Optional[int]) -> None:
+    """Logs a warning naming the caller if an unprojected response body of `size` bytes is
+    larger than config.unprojected_payload_warning_bytes. Does nothing if that is not set,
+    or if the size is unknown."""
+    threshold = config.unprojected_payload_warning_bytes
+    if threshold is None or size is None:
+        return
+    if size > threshold:
+        mq_logger.warning(
+            f"{operation} on index `{index_name}` returned {size} bytes without a projection, "
+            f"called from {_caller_location()}. Register a projection profile with "
+            f"Index.register_projection or pass attributes_to_retrieve to shrink the response.")
@@ -0,0 +1,126 @@
+"""Client-side rate limiting for requests sent to Marqo.
+
+A RateLimit is attached to the client's Config, so every Index handle and every
+thread sharing one Client draws from the same budget.
+"""
+import json
+import threading
+import time
+from typing import Any, Optional
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens are replenished continuously at `rate` tokens per second, up to
+    `capacity`. Callers reserve tokens up front and are told how long to wait
+    before proceeding, so a request larger than the capacity (e.g. a big batch)
+    is still admitted once the bucket has paid off its debt, and waiting never
+    happens while holding the lock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Args:
+            rate: number of tokens added to the bucket per second
+            capacity: maximum number of tokens the bucket can hold, i.e. the
+                allowed burst. Defaults to one second worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be a positive number, got {rate}")
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f"capacity must be a positive number, got {capacity}")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else float(rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Takes `amount` tokens from the bucket.
+
+        Returns:
+            The number of seconds the caller must wait before using the tokens.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimit:
+    """A combination of token buckets limiting documents, requests and bytes per second.
+
+    Any of the limits may be left as None, in which case it is not enforced.
+    Instances are thread-safe and can be shared by many threads. Asyncio code that runs
+    client calls in an executor shares the same budget, and waiting only blocks the
+    executor's worker thread, never the event loop.
+    """
+
+    def __init__(
+            self,
+            docs_per_second: Optional[float] = None,
+            requests_per_second: Optional[float] = None,
+            bytes_per_second: Optional[float] = None,
+            burst_seconds: float = 1.0
+    ) -> None:
+        """
+        Args:
+            docs_per_second: maximum number of documents (or search queries) per second
+            requests_per_second: maximum number of HTTP requests per second
+            bytes_per_second: maximum number of request body bytes per second
+            burst_seconds: how many seconds worth of budget may be spent at once
+        """
+        if burst_seconds <= 0:
+            raise ValueError(f"burst_seconds must be a positive number, got {burst_seconds}")
+        self._docs = TokenBucket(docs_per_second, docs_per_second * burst_seconds) \
+            if docs_per_second is not None else None
+        self._requests = TokenBucket(requests_per_second, requests_per_second * burst_seconds) \
+            if requests_per_second is not None else None
+        self._bytes = TokenBucket(bytes_per_second, bytes_per_second * burst_seconds) \
+            if bytes_per_second is not None else None
+
+    @property
+    def limits_bytes(self) -> bool:
+        """Whether the request body size must be known to acquire from this limit"""
+        return self._bytes is not None
+
+    def _reserve(self, num_docs: int, num_requests: int, num_bytes: int) -> float:
+        wait = 0.0
+        for bucket, amount in ((self._docs, num_docs), (self._requests, num_requests), (self._bytes, num_bytes)):
+            if bucket is not None and amount:
+                wait = max(wait, bucket.reserve(amount))
+        return wait
+
+    def acquire(self, num_docs: int = 0, num_requests: int = 1, num_bytes: int = 0) -> float:
+        """Blocks the calling thread until the request is allowed to proceed.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        wait = self._reserve(num_docs, num_requests, num_bytes)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def throttle(rate_limit: Optional[RateLimit], body: Any, num_docs: int = 0) -> Any:
+    """Waits for `rate_limit` to admit one request carrying `body`.
+
+    If the rate limit counts bytes, the body is serialised here so its size is
+    known, and the serialised body is returned so it is not encoded twice.
+    Otherwise, the body is returned unchanged.
+    """
+    if rate_limit is None:
+        return body
+    num_bytes = 0
+    if rate_limit.limits_bytes:
+        if not isinstance(body, (bytes, str)) and body is not None:
+            body = json.dumps(body)
+        num_bytes = len(body.encode("utf-8") if isinstance(body, str) else body or b"")
+    rate_limit.acquire(num_docs=num_docs, num_bytes=num_bytes)
+    return body
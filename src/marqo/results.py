@@ -0,0 +1,154 @@
+"""Alternative forms of Marqo responses: typed search results and raw responses.
+
+A SearchResult keeps the ids of its hits in a list and their scores in an array, next to
+the decoded fields of each hit. Hit objects are lightweight views created on access, so
+iterating a result does not build a dict per hit.
+"""
+import json
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+_HIT_META_FIELDS = ("_id", "_score")
+
+
+class Hit:
+    """One hit of a SearchResult."""
+
+    __slots__ = ("_result", "_position")
+
+    def __init__(self, result: "SearchResult", position: int) -> None:
+        self._result = result
+        self._position = position
+
+    @property
+    def id(self) -> str:
+        return self._result._ids[self._position]
+
+    @property
+    def score(self) -> float:
+        return self._result._scores[self._position]
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        """The hit's document fields and _highlights"""
+        return self._result._fields[self._position]
+
+    @property
+    def highlights(self) -> Optional[Any]:
+        return self.fields.get("_highlights")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "_id":
+            return self.id
+        if key == "_score":
+            return self.score
+        return self.fields[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The hit as returned by Index.search"""
+        return {"_id": self.id, **self.fields, "_score": self.score}
+
+    def __repr__(self) -> str:
+        return f"Hit(id={self.id!r}, score={self.score!r})"
+
+
+class SearchResult:
+    """The result of a search, returned by Index.search(typed=True).
+
+    Supports len(), iteration and indexing, which yield Hit objects.
+    """
+
+    __slots__ = ("_ids", "_scores", "_fields", "query", "limit", "offset", "processing_time_ms", "metadata")
+
+    def __init__(self, ids: List[str], scores: array, fields: List[Dict[str, Any]],
+                 query: Any = None, limit: Optional[int] = None, offset: Optional[int] = None,
+                 processing_time_ms: Optional[float] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self._ids = ids
+        self._scores = scores
+        self._fields = fields
+        self.query = query
+        self.limit = limit
+        self.offset = offset
+        self.processing_time_ms = processing_time_ms
+        self.metadata = metadata or {}
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "SearchResult":
+        """Builds a result from a decoded search response body, reusing its decoded values."""
+        hits = response.get("hits", [])
+        ids = [hit.get("_id") for hit in hits]
+        scores = array("d", (hit.get("_score", 0.0) for hit in hits))
+        fields = [{key: value for key, value in hit.items() if key not in _HIT_META_FIELDS} for hit in hits]
+        metadata = {key: value for key, value in response.items()
+                    if key not in ("hits", "query", "limit", "offset", "processingTimeMs")}
+        return cls(ids, scores, fields, query=response.get("query"),
+                   limit=response.get("limit"), offset=response.get("offset"),
+                   processing_time_ms=response.get("processingTimeMs"), metadata=metadata)
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    @property
+    def scores(self) -> array:
+        """The scores of the hits, as an array of doubles"""
+        return array("d", self._scores)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Hit, List[Hit]]:
+        if isinstance(position, slice):
+            return [Hit(self, i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("hit index out of range")
+        return Hit(self, position)
+
+    def __iter__(self) -> Iterator[Hit]:
+        return (Hit(self, i) for i in range(len(self)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The result as returned by Index.search"""
+        res: Dict[str, Any] = {"hits": [hit.to_dict() for hit in self]}
+        for key, value in (("query", self.query), ("limit", self.limit), ("offset", self.offset),
+                           ("processingTimeMs", self.processing_time_ms)):
+            if value is not None:
+                res[key] = value
+        res.update(self.metadata)
+        return res
+
+    def __repr__(self) -> str:
+        return f"SearchResult(hits={len(self)}, query={self.query!r})"
+
+
+class RawResponse:
+    """An undecoded response body, returned by requests made with raw=True.
+
+    The body can be forwarded as is, without decoding and re-encoding the JSON.
+    """
+
+    __slots__ = ("content", "headers", "status_code")
+
+    def __init__(self, content: bytes, headers: Mapping[str, str], status_code: int) -> None:
+        self.content = content
+        self.headers = headers
+        self.status_code = status_code
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.headers.get("Content-Type")
+
+    def json(self) -> Any:
+        """Decodes the body"""
+        return json.loads(self.content)
+
+    def __repr__(self) -> str:
+        return f"RawResponse(status_code={self.status_code}, bytes={len(self.content)})"
@@ -0,0 +1,302 @@
+"""Helpers for working with Marqo embeddings as NumPy arrays.
+
+NumPy is an optional dependency of the client; it is only imported when one of
+these helpers is used.
+"""
+import json
+import os
+import re
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from marqo import errors
+
+SUPPORTED_EMBEDDING_DTYPES = ("float32", "float16", "int8")
+EMBEDDING_FORMATS = ("numpy", "matrix")
+
+# Matches an "_embedding" key followed by the start of a list in a raw JSON response. Quotes
+# inside JSON strings are escaped, so this can not match text inside a string value.
+_EMBEDDING_PATTERN = re.compile(rb'"_embedding"\s*:\s*\[')
+
+# Bytes reserved for the .npy magic string and header, so the header can be
+# rewritten in place once the final number of rows is known.
+_NPY_HEADER_SIZE = 128
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def import_numpy():
+    """Imports NumPy, raising a MarqoError with installation instructions if it is missing."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise errors.MarqoError(
+            "This feature requires NumPy. Please install it with `pip install numpy`."
+        ) from e
+    return numpy
+
+
+def _npy_header(descr: str, shape: Tuple[int, ...]) -> bytes:
+    """A version 1.0 .npy header padded to exactly _NPY_HEADER_SIZE bytes."""
+    header = repr({"descr": descr, "fortran_order": False, "shape": shape})
+    header_len = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2
+    if len(header) + 1 > header_len:
+        raise errors.MarqoError(f"Array shape {shape} is too large for the reserved .npy header")
+    header = header.ljust(header_len - 1) + "\n"
+    return _NPY_MAGIC + struct.pack("<H", header_len) + header.encode("latin1")
+
+
+class NpyRowWriter:
+    """Appends rows to a 2-D .npy file without knowing the number of rows in advance.
+
+    The file can be opened with numpy.load(path, mmap_mode="r") once closed.
+    """
+
+    def __init__(self, path: str, dtype: str) -> None:
+        self._np = import_numpy()
+        self.path = path
+        self.dtype = self._np.dtype(dtype)
+        self.num_rows = 0
+        self.num_columns: Optional[int] = None
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+
+    def _header(self) -> bytes:
+        descr = self._np.lib.format.dtype_to_descr(self.dtype)
+        return _npy_header(descr, (self.num_rows, self.num_columns or 0))
+
+    def write(self, rows) -> None:
+        """Appends a 2-D array of rows, cast to the writer's dtype."""
+        if len(rows) == 0:
+            return
+        if self.num_columns is None:
+            self.num_columns = rows.shape[1]
+        elif rows.shape[1] != self.num_columns:
+            raise errors.MarqoError(
+                f"Cannot write rows with {rows.shape[1]} columns to {self.path}, "
+                f"which has {self.num_columns} columns")
+        self._file.write(self._np.ascontiguousarray(rows, dtype=self.dtype).tobytes())
+        self.num_rows += len(rows)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+
+def quantize_int8(embeddings) -> Tuple[Any, Any]:
+    """Symmetric per-row int8 quantization.
+
+    Returns:
+        The int8 matrix and the float32 scale of each row. Rows are recovered with
+        quantized.astype(numpy.float32) * scales[:, None].
+    """
+    np = import_numpy()
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.rint(embeddings / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def embedding_side_paths(path: str) -> Dict[str, str]:
+    """The paths of the side arrays written next to an embeddings file."""
+    root, _ = os.path.splitext(path)
+    return {
+        "ids": f"{root}.ids.npy",
+        "keys": f"{root}.keys.npy",
+        "scales": f"{root}.scales.npy",
+    }
+
+
+def load_embeddings(path: str, dequantize: bool = False) -> Dict[str, Any]:
+    """Loads embeddings written by Index.export_embeddings.
+
+    Args:
+        path: path to the embeddings .npy file
+        dequantize: if True and the embeddings were quantized to int8, return them as a
+            float32 array in memory instead of the memory-mapped int8 matrix
+
+    Returns:
+        A dict with the memory-mapped "embeddings" matrix, and the "ids" and "keys" arrays
+        giving the document id and field of each row. "scales" holds the per-row scales of
+        int8 embeddings, and is None otherwise.
+    """
+    np = import_numpy()
+    side_paths = embedding_side_paths(path)
+    embeddings = np.load(path, mmap_mode="r")
+    scales = None
+    # a scales file next to float embeddings is left over from an earlier int8 export
+    if embeddings.dtype == np.int8 and os.path.exists(side_paths["scales"]):
+        scales = np.load(side_paths["scales"])
+    if dequantize and scales is not None:
+        embeddings = embeddings.astype(np.float32) * scales[:, None]
+    return {
+        "embeddings": embeddings,
+        "ids": np.load(side_paths["ids"]),
+        "keys": np.load(side_paths["keys"]),
+        "scales": scales,
+    }
+
+
+def facets_to_matrix(documents: List[Dict[str, Any]]) -> Tuple[Any, List[str], List[str]]:
+    """Collects the tensor facet embeddings of documents into one float32 matrix.
+
+    Returns:
+        The matrix, with one row per facet, and the _id and field name of each row.
+    """
+    np = import_numpy()
+    ids, keys, embeddings = [], [], []
+    for doc in documents:
+        for facet in doc.get("_tensor_facets") or []:
+            ids.append(doc["_id"])
+            keys.append(next((k for k in facet if k != "_embedding"), ""))
+            embeddings.append(facet["_embedding"])
+    if not embeddings:
+        return np.empty((0, 0), dtype=np.float32), ids, keys
+    return np.asarray(embeddings, dtype=np.float32), ids, keys
+
+
+def vectors_to_json(vectors, significant_digits: int = 10) -> List[bytes]:
+    """Serialises each row of a 2-D array as a JSON array, without creating Python floats.
+
+    Every value is written in a fixed-width scientific form, e.g. `-0.0125730217e+001`,
+    using vectorised integer arithmetic on the whole matrix. The default of 10
+    significant digits is enough for float32 vectors to be parsed back exactly.
+
+    Args:
+        vectors: a 2-D array (or memory-mapped array) of finite numbers
+        significant_digits: digits kept per value, between 1 and 17
+
+    Returns:
+        One bytes object per row, e.g. b'[ 0.5000000000e+000,-0.2500000000e+000]'.
+
+    Raises:
+        InvalidArgError: if vectors is not 2-D or contains NaN or infinite values.
+    """
+    np = import_numpy()
+    if not 1 <= significant_digits <= 17:
+        raise errors.InvalidArgError("significant_digits must be between 1 and 17")
+    values = np.asarray(vectors, dtype=np.float64)
+    if values.ndim != 2:
+        raise errors.InvalidArgError(f"Expected a 2-D array of vectors, got an array with shape {values.shape}")
+    num_rows, dim = values.shape
+    if num_rows == 0:
+        return []
+    if dim == 0:
+        return [b"[]"] * num_rows
+    if not np.isfinite(values).all():
+        raise errors.InvalidArgError("Vectors must not contain NaN or infinite values")
+
+    # Each value is written as <sign>0.<digits>e<exponent sign><3 exponent digits><separator>.
+    # A space stands in for a positive sign.
+    abs_values = np.abs(values)
+    exponents = np.zeros(values.shape, dtype=np.int64)
+    non_zero = abs_values > 0
+    exponents[non_zero] = np.floor(np.log10(abs_values[non_zero])).astype(np.int64) + 1
+    # The scaling is split in two so that it does not overflow for very small or large values
+    half_shift = -exponents // 2
+    scaled = abs_values * 10.0 ** half_shift * 10.0 ** (significant_digits - exponents - half_shift)
+    mantissas = np.rint(scaled).astype(np.uint64)
+    # log10 can be off by one close to powers of ten, which leaves one digit too many
+    overflow = mantissas >= np.uint64(10 ** significant_digits)
+    mantissas[overflow] = np.rint(mantissas[overflow] / 10.0).astype(np.uint64)
+    exponents[overflow] += 1
+
+    width = significant_digits + 9
+    buffer = np.empty((num_rows, dim, width), dtype=np.uint8)
+    buffer[:, :, 0] = np.where(np.signbit(values), ord("-"), ord(" "))
+    buffer[:, :, 1] = ord("0")
+    buffer[:, :, 2] = ord(".")
+    for position in range(2 + significant_digits, 2, -1):
+        buffer[:, :, position] = mantissas % np.uint64(10) + np.uint64(ord("0"))
+        mantissas //= np.uint64(10)
+    exponent_start = 3 + significant_digits
+    abs_exponents = np.abs(exponents)
+    buffer[:, :, exponent_start] = ord("e")
+    buffer[:, :, exponent_start + 1] = np.where(exponents < 0, ord("-"), ord("+"))
+    buffer[:, :, exponent_start + 2] = abs_exponents // 100 % 10 + ord("0")
+    buffer[:, :, exponent_start + 3] = abs_exponents // 10 % 10 + ord("0")
+    buffer[:, :, exponent_start + 4] = abs_exponents % 10 + ord("0")
+    buffer[:, :, exponent_start + 5] = ord(",")
+    buffer[:, -1, exponent_start + 5] = ord("]")
+
+    return [b"[" + row.tobytes() for row in buffer.reshape(num_rows, dim * width)]
+
+
+def _replace_embeddings(obj: Any, embeddings: List[Any]) -> None:
+    """Replaces the integer placeholder of every _embedding value in obj with its decoded value."""
+    if isinstance(obj, dict):
+        placeholder = obj.get("_embedding")
+        if type(placeholder) is int:
+            obj["_embedding"] = embeddings[placeholder]
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                _replace_embeddings(value, embeddings)
+    elif isinstance(obj, list):
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                _replace_embeddings(value, embeddings)
+
+
+def decode_embeddings_response(content: bytes, embedding_format: str = "numpy") -> Any:
+    """Decodes a JSON response, parsing every _embedding list into NumPy instead of Python floats.
+
+    The embeddings are cut out of the raw response and parsed together into one float32
+    buffer, and the rest of the response is parsed with json as usual.
+
+    Args:
+        content: the raw response body
+        embedding_format: "numpy" replaces each _embedding with a float32 array. When all
+            embeddings have the same dimension, these arrays are rows of one contiguous matrix.
+            "matrix" replaces each _embedding with its row number in a float32 matrix, which
+            is added to the response under "_embeddings". All embeddings must have the same
+            dimension.
+
+    Returns:
+        The decoded response.
+    """
+    np = import_numpy()
+    if embedding_format not in EMBEDDING_FORMATS:
+        raise errors.InvalidArgError(
+            f"Unsupported embedding format `{embedding_format}`. Supported formats are {EMBEDDING_FORMATS}")
+    # The embeddings are cut out of the response and replaced with their index in `spans`
+    spans: List[bytes] = []
+    pieces: List[bytes] = []
+    position = 0
+    for match in _EMBEDDING_PATTERN.finditer(content):
+        if match.start() < position:
+            continue
+        end = content.find(b"]", match.end())
+        if end == -1 or content.find(b"[", match.end(), end) != -1:
+            continue
+        pieces.append(content[position:match.start()])
+        pieces.append(b'"_embedding": ' + str(len(spans)).encode("ascii"))
+        spans.append(content[match.end():end])
+        position = end + 1
+    pieces.append(content[position:])
+
+    response = json.loads(b"".join(pieces))
+    lengths = [0 if not span.strip() else span.count(b",") + 1 for span in spans]
+    values = np.fromstring(b",".join(span for span in spans if span.strip()), dtype=np.float32, sep=",") \
+        if any(lengths) else np.empty((0,), dtype=np.float32)
+    if len(values) != sum(lengths):
+        raise errors.MarqoError("Could not decode the embeddings in the response")
+
+    dims = set(lengths)
+    if embedding_format == "matrix":
+        if len(dims) > 1:
+            raise errors.MarqoError(
+                f"Embeddings of different dimensions ({sorted(dims)}) can't be decoded into one matrix")
+        matrix = values.reshape(len(lengths), dims.pop() if dims else 0)
+        if isinstance(response, dict):
+            response["_embeddings"] = matrix
+        return response
+
+    if len(dims) == 1:
+        embeddings = list(values.reshape(len(lengths), dims.pop()))
+    else:
+        embeddings = np.split(values, np.cumsum(lengths)[:-1])
+    _replace_embeddings(response, embeddings)
+    return response
@@ -1,3 +1,4 @@
+import re
 from functools import wraps
 from typing import NamedTuple, Union, List
 from unittest import mock
@@ -40,15 +41,17 @@ class GetIndexesIndexResponseObject(NamedTuple):
 def mock_get_indexes_response(indexes_list: Union[List[GetIndexesIndexResponseObject], None], to_return_mock: bool = False):
     """Function decorator to mock the get indexes endpoint.
 
-    This decorator is used to mock the behavior of the requests.get which is used by
+    This decorator is used to mock the behavior of the pooled session's get, which is used by
     MarqoCloudInstanceMappings object to retrieve and store specific information about
     cloud indexes: index_name, index status and index endpoint.
     It allows you to set up mock responses for requests to the "/indexes" URL.
     Requests are handled by side_effect function.
-    if url ends with "/indexes" it returns a mock_get object, otherwise `requests.get` is called normally.
+    if url ends with "/indexes" it returns a mock_get object. If url is the status endpoint of an index,
+    it returns that index's status and endpoint from the indexes the mock_get object currently lists,
+    or a 404 response if the index is not listed. Otherwise `requests.get` is called instead.
     A mock_get object is a MagicMock object with its return_value set to indexes_list.
     mock_get object can be argument of the decorated function, if to_return_mock is True.
-    It can be used to modify the response of requests.get or to assert that it was called.
+    It can be used to modify the response of the session's get or to assert that it was called.
 
     Args:
         indexes_list (Union[List[GetIndexesIndexResponseObject], None]): A list of
@@ -74,7 +77,7 @@ def mock_get_indexes_response(indexes_list: Union[List[GetIndexesIndexResponseOb
     def decorator(test_func):
         @wraps(test_func)
         def wrapper(self, *args, **kwargs):
-            with mock.patch("marqo.marqo_cloud_instance_mappings.requests.get") as mock_get:
+            with mock.patch("marqo._httprequests.session.get") as mock_get:
                 return_value_is_set = False
 
                 def side_effect(url, *args, **kwargs):
@@ -85,8 +88,29 @@ def mock_get_indexes_response(indexes_list: Union[List[GetIndexesIndexResponseOb
                             return_value_is_set = True
 
                         return mock_get
-                    else:
-                        requests.get(url, *args, **kwargs)
+                    status_match = re.search(r"/indexes/([^/]+)/status$", url)
+                    if status_match:
+                        return index_status_response(status_match.group(1))
+                    return requests.get(url, *args, **kwargs)
+
+                def index_status_response(index_name):
+                    if mock_get.ok is False:
+                        return mock_get
+                    listed = mock_get.json.return_value if return_value_is_set or instance_mappings is None \
+                        else instance_mappings
+                    results = listed.get("results", []) if isinstance(listed, dict) else []
+                    response = mock.MagicMock()
+                    for index in results:
+                        if index["indexName"] == index_name:
+                            response.ok = True
+                            response.status_code = 200
+                            response.json.return_value = {"indexStatus": index["indexStatus"],
+                                                          "marqoEndpoint": index["marqoEndpoint"]}
+                            return response
+                    response.ok = False
+                    response.status_code = 404
+                    response.json.return_value = {"message": f"Index {index_name} not found"}
+                    return response
 
                 if indexes_list is not None:
                     instance_mappings = {"results": [index_data._asdict() for index_data in indexes_list]}
@@ -0,0 +1,251 @@
+"""An in-process stand-in for a Marqo instance, for tests and benchmarks that need no network.
+
+MarqoStandIn runs a ThreadingHTTPServer on localhost that implements the endpoints the
+client uses: indexes, documents, search, bulk search, settings, stats, health and the
+Marqo Cloud index list and status endpoints (under /api/v2). Documents are kept in memory.
+Search results are synthetic: each query returns hits_per_query hits whose "text" field
+holds hit_bytes characters, so response sizes can be tuned independently of the data.
+
+Usage:
+    with MarqoStandIn(latency=0.005) as server:
+        mq = marqo.Client(server.url)
+        mq.create_index("my-index")
+
+For Marqo Cloud, point MarqoCloudInstanceMappings at server.url. Every index's
+marqoEndpoint is the server itself.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+_ROUTES = [
+    ("GET", re.compile(r"^$"), "_root"),
+    ("GET", re.compile(r"^indexes$"), "_list_indexes"),
+    ("POST", re.compile(r"^indexes/bulk/search$"), "_bulk_search"),
+    ("POST", re.compile(r"^indexes/([^/]+)$"), "_create_index"),
+    ("DELETE", re.compile(r"^indexes/([^/]+)$"), "_delete_index"),
+    ("GET", re.compile(r"^indexes/([^/]+)/status$"), "_index_status"),
+    ("GET", re.compile(r"^indexes/([^/]+)/settings$"), "_settings"),
+    ("GET", re.compile(r"^indexes/([^/]+)/stats$"), "_stats"),
+    ("GET", re.compile(r"^indexes/([^/]+)/health$"), "_health"),
+    ("POST", re.compile(r"^indexes/([^/]+)/search$"), "_search"),
+    ("POST", re.compile(r"^indexes/([^/]+)/documents$"), "_add_documents"),
+    ("PATCH", re.compile(r"^indexes/([^/]+)/documents$"), "_update_documents"),
+    ("GET", re.compile(r"^indexes/([^/]+)/documents$"), "_get_documents"),
+    ("POST", re.compile(r"^indexes/([^/]+)/documents/delete-batch$"), "_delete_documents"),
+    ("GET", re.compile(r"^indexes/([^/]+)/documents/([^/]+)$"), "_get_document"),
+]
+
+
+class StandInError(Exception):
+    """An error response, in the format Marqo uses."""
+
+    def __init__(self, status_code: int, message: str, code: str, error_type: str = "invalid_request"):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = {"message": message, "code": code, "type": error_type, "link": ""}
+
+
+class MarqoStandIn:
+    """A local stand-in for Marqo with configurable latency and response sizes.
+
+    Args:
+        latency: seconds each request waits before it is answered, to stand in for
+            Marqo's processing time
+        hits_per_query: the number of hits a search returns, before its limit is applied
+        hit_bytes: the number of characters in the "text" field of each hit
+        version: the Marqo version reported by the root endpoint
+    """
+
+    def __init__(self, latency: float = 0.0, hits_per_query: int = 10, hit_bytes: int = 100,
+                 version: str = "2.3.0") -> None:
+        self.latency = latency
+        self.hits_per_query = hits_per_query
+        self.hit_bytes = hit_bytes
+        self.version = version
+        self.indexes: Dict[str, Dict[str, Any]] = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MarqoStandIn":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # send each response in one write, so small responses are not held back by Nagle's algorithm
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                stand_in._dispatch(self)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="marqo-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MarqoStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+        path = urlsplit(handler.path).path.strip("/")
+        # Marqo Cloud's control plane serves the index list and status under /api/v2
+        path = re.sub(r"^api(/v2)?/?", "", path)
+
+        with self._lock:
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        status_code, response = 404, {"message": f"{handler.command} /{path} is not supported",
+                                      "code": "not_found", "type": "invalid_request", "link": ""}
+        for method, pattern, name in _ROUTES:
+            match = pattern.match(path)
+            if method == handler.command and match:
+                body = json.loads(raw_body) if raw_body else None
+                try:
+                    status_code, response = 200, getattr(self, name)(*map(unquote, match.groups()), body=body)
+                except StandInError as e:
+                    status_code, response = e.status_code, e.body
+                break
+
+        payload = json.dumps(response).encode("utf-8")
+        handler.send_response(status_code)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _index(self, index_name: str) -> Dict[str, Any]:
+        index = self.indexes.get(index_name)
+        if index is None:
+            raise StandInError(404, f"Index {index_name} does not exist", "index_not_found")
+        return index
+
+    def _hits(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        limit = query.get("limit", 10)
+        attributes = query.get("attributesToRetrieve")
+        hits = []
+        for position in range(min(limit, self.hits_per_query)):
+            hit = {"_id": str(position), "text": "x" * self.hit_bytes, "_score": 1.0 - position / 1000}
+            if attributes is not None:
+                hit = {key: value for key, value in hit.items() if key in attributes or key in ("_id", "_score")}
+            if query.get("showHighlights", True):
+                hit["_highlights"] = [{"text": "x" * min(self.hit_bytes, 20)}]
+            hits.append(hit)
+        return {"hits": hits, "query": query.get("q"), "limit": limit, "offset": query.get("offset", 0),
+                "processingTimeMs": self.latency * 1000}
+
+    def _items(self, index_name: str, documents: List[Dict[str, Any]], status: int) -> Dict[str, Any]:
+        return {"errors": False, "processingTimeMs": self.latency * 1000, "index_name": index_name,
+                "items": [{"_id": doc["_id"], "status": status} for doc in documents]}
+
+    def _root(self, body=None):
+        return {"message": "Welcome to Marqo", "version": self.version}
+
+    def _list_indexes(self, body=None):
+        return {"results": [{"indexName": name, "indexStatus": "READY", "marqoEndpoint": self.url}
+                            for name in self.indexes]}
+
+    def _create_index(self, index_name: str, body=None):
+        with self._lock:
+            if index_name in self.indexes:
+                raise StandInError(409, f"Index {index_name} already exists", "index_already_exists")
+            self.indexes[index_name] = {"settings": body or {}, "documents": {}}
+        return {"acknowledged": True, "index": index_name}
+
+    def _delete_index(self, index_name: str, body=None):
+        with self._lock:
+            self._index(index_name)
+            del self.indexes[index_name]
+        return {"acknowledged": True}
+
+    def _index_status(self, index_name: str, body=None):
+        if index_name not in self.indexes:
+            raise StandInError(404, f"Index {index_name} does not exist", "index_not_found")
+        return {"indexName": index_name, "indexStatus": "READY", "marqoEndpoint": self.url}
+
+    def _settings(self, index_name: str, body=None):
+        return self._index(index_name)["settings"]
+
+    def _stats(self, index_name: str, body=None):
+        num_documents = len(self._index(index_name)["documents"])
+        return {"numberOfDocuments": num_documents, "numberOfVectors": num_documents,
+                "backend": {"memoryUsedPercentage": 0.0, "storageUsedPercentage": 0.0}}
+
+    def _health(self, index_name: str, body=None):
+        self._index(index_name)
+        return {"status": "green", "inference": {"status": "green"}, "backend": {"status": "green"}}
+
+    def _search(self, index_name: str, body=None):
+        self._index(index_name)
+        return self._hits(body or {})
+
+    def _bulk_search(self, body=None):
+        queries = (body or {}).get("queries", [])
+        for query in queries:
+            self._index(query["index"])
+        return {"result": [self._hits(query) for query in queries], "processingTimeMs": self.latency * 1000}
+
+    def _add_documents(self, index_name: str, body=None):
+        index = self._index(index_name)
+        documents = [dict(doc, _id=str(doc.get("_id") or uuid.uuid4())) for doc in body["documents"]]
+        with self._lock:
+            index["documents"].update((doc["_id"], doc) for doc in documents)
+        return self._items(index_name, documents, 200)
+
+    def _update_documents(self, index_name: str, body=None):
+        index = self._index(index_name)
+        with self._lock:
+            for doc in body["documents"]:
+                index["documents"].setdefault(doc["_id"], {}).update(doc)
+        return self._items(index_name, body["documents"], 200)
+
+    def _get_documents(self, index_name: str, body=None):
+        documents = self._index(index_name)["documents"]
+        return {"results": [dict(documents[doc_id], _found=True) if doc_id in documents
+                            else {"_id": doc_id, "_found": False} for doc_id in body or []]}
+
+    def _get_document(self, index_name: str, document_id: str, body=None):
+        document = self._index(index_name)["documents"].get(document_id)
+        if document is None:
+            raise StandInError(404, f"Document {document_id} does not exist", "document_not_found")
+        return document
+
+    def _delete_documents(self, index_name: str, body=None):
+        index = self._index(index_name)
+        with self._lock:
+            deleted = [doc_id for doc_id in body or [] if index["documents"].pop(doc_id, None) is not None]
+        return {"index_name": index_name, "status": "succeeded", "type": "documentDeletion",
+                "items": [{"_id": doc_id, "status": 200 if doc_id in deleted else 404} for doc_id in body or []],
+                "details": {"receivedDocumentIds": len(body or []), "deletedDocuments": len(deleted)},
+                "duration": "PT0S"}
@@ -0,0 +1,47 @@
+"""Shared fixtures for tests that run without a Marqo instance.
+
+OfflineTestCase gives each test a Client and an Index for "my-index" whose minimum
+version check is patched out, so no request is sent until a test mocks one.
+make_response builds the requests.Response a mocked session returns.
+"""
+import json
+import unittest
+from typing import Any, Dict
+from unittest import mock
+
+import requests
+
+from marqo.client import Client
+
+URL = "http://localhost:8882"
+
+
+def make_response(body: Any, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+class OfflineTestCase(unittest.TestCase):
+    """A test case with self.client and self.index, for tests that mock every request.
+
+    Subclasses pass extra Client arguments, such as rate limits or instance mappings,
+    in client_kwargs.
+    """
+
+    client_kwargs: Dict[str, Any] = {}
+    index_name = "my-index"
+
+    def setUp(self) -> None:
+        self.patch("marqo.index.Index._marqo_minimum_supported_version_check")
+        self.client = Client(**{"url": URL, **self.client_kwargs})
+        self.index = self.client.index(self.index_name)
+
+    def patch(self, target: str, **kwargs) -> mock.MagicMock:
+        """Patches `target` until the end of the test and returns the mock."""
+        patcher = mock.patch(target, **kwargs)
+        mock_object = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock_object
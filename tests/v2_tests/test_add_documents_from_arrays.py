@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+from pytest import mark
+
+from marqo import errors
+from tests.offline_test import OfflineTestCase
+
+np = pytest.importorskip("numpy")
+
+from marqo.vectors import vectors_to_json
+
+
+@mark.fixed
+class TestVectorsToJson(unittest.TestCase):
+
+    def test_float32_round_trip(self):
+        vectors = np.random.default_rng(0).standard_normal((50, 64)).astype(np.float32)
+        vectors[3] = 0
+        vectors[4] *= 1e-20
+        vectors[5] *= 1e20
+        parsed = np.array([json.loads(row) for row in vectors_to_json(vectors)], dtype=np.float32)
+        np.testing.assert_array_almost_equal_nulp(vectors, parsed, nulp=1)
+
+    def test_output_format(self):
+        self.assertEqual([b"[ 0.50e+000,-0.25e+000]"], vectors_to_json(np.array([[0.5, -0.25]]), significant_digits=2))
+        self.assertEqual([], vectors_to_json(np.empty((0, 3))))
+
+    def test_invalid_input(self):
+        for vectors in [np.zeros(3), np.array([[1.0, np.nan]]), np.array([[np.inf, 1.0]])]:
+            with self.subTest(vectors=vectors):
+                with self.assertRaises(errors.InvalidArgError):
+                    vectors_to_json(vectors)
+
+
+@mark.fixed
+class TestAddDocumentsFromArrays(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vectors = np.random.default_rng(0).standard_normal((5, 8)).astype(np.float32)
+
+    def add(self, **kwargs):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"errors": False, "items": [], "processingTimeMs": 1}
+            res = self.index.add_documents_from_arrays(**kwargs)
+        bodies = [json.loads(call.kwargs["body"]) for call in mock_post.call_args_list]
+        return res, mock_post, bodies
+
+    def test_documents_are_built_from_columns(self):
+        res, mock_post, bodies = self.add(
+            vectors=self.vectors, vector_field="my_vector", ids=[f"doc{i}" for i in range(5)],
+            fields={"title": np.array(["a", "b", "c", "d", "e"]), "price": np.arange(5)},
+            vector_content=["content"] * 5, client_batch_size=2, device="cuda:1",
+        )
+        self.assertEqual(3, len(res))
+        self.assertEqual([2, 2, 1], [len(body["documents"]) for body in bodies])
+        self.assertEqual("indexes/my-index/documents?refresh=false&device=cuda1",
+                         mock_post.call_args_list[0].kwargs["path"])
+        docs = [doc for body in bodies for doc in body["documents"]]
+        self.assertEqual({"_id": "doc3", "title": "d", "price": 3}, {k: v for k, v in docs[3].items() if k != "my_vector"})
+        self.assertEqual("content", docs[3]["my_vector"]["content"])
+        np.testing.assert_array_almost_equal_nulp(
+            self.vectors, np.array([doc["my_vector"]["vector"] for doc in docs], dtype=np.float32), nulp=1)
+        self.assertIsNone(bodies[0]["mappings"])
+
+    def test_vectors_only(self):
+        mappings = {"my_vector": {"type": "custom_vector"}}
+        _, _, bodies = self.add(vectors=self.vectors, vector_field="my_vector",
+                                tensor_fields=["my_vector"], mappings=mappings)
+        self.assertEqual(1, len(bodies))
+        self.assertEqual(["my_vector"], list(bodies[0]["documents"][0]))
+        self.assertEqual(["my_vector"], bodies[0]["tensorFields"])
+        self.assertEqual(mappings, bodies[0]["mappings"])
+
+    def test_memmap_is_read_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vectors.npy")
+            np.save(path, self.vectors)
+            vectors = np.load(path, mmap_mode="r")
+            _, _, bodies = self.add(vectors=vectors, vector_field="v", client_batch_size=3, client_concurrency=2)
+            del vectors
+        self.assertEqual([3, 2], [len(body["documents"]) for body in bodies])
+
+    def test_mismatched_column_length(self):
+        with self.assertRaises(errors.InvalidArgError):
+            self.add(vectors=self.vectors, vector_field="v", ids=["a", "b"])
+
+    def test_vector_field_in_fields(self):
+        with self.assertRaises(errors.InvalidArgError):
+            self.add(vectors=self.vectors, vector_field="v", fields={"v": list(range(5))})
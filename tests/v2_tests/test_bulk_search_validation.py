@@ -0,0 +1,72 @@
+import json
+from unittest import mock
+
+from pytest import mark
+
+from marqo._search_validation import _FIELDS, dumps_bulk_search_queries, validate_bulk_search_query
+from marqo.enums import SearchMethods
+from marqo.errors import InvalidArgError
+from marqo.models.search_models import BulkSearchBody, BulkSearchQuery
+from tests.offline_test import OfflineTestCase
+
+
+def pydantic_json(queries):
+    return BulkSearchQuery(queries=[BulkSearchBody(**q) for q in queries]).json()
+
+
+@mark.fixed
+class TestBulkSearchValidation(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mock_post = self.patch("marqo._httprequests.HttpRequests.post", return_value={"result": []})
+
+    def test_fields_match_the_pydantic_model(self):
+        self.assertEqual(list(BulkSearchBody.__fields__), [name for name, _, _ in _FIELDS])
+        for name, default, _ in _FIELDS[:-1]:
+            self.assertEqual(BulkSearchBody.__fields__[name].default, default, name)
+
+    def test_fast_path_body_matches_pydantic(self):
+        queries = [
+            {"index": "a", "q": "hello"},
+            {"index": "a", "q": {"red": 1, "blue": -0.5}, "limit": 3, "searchMethod": SearchMethods.LEXICAL},
+            {"index": "b", "q": None, "context": {"tensor": [{"vector": [1, 2], "weight": 1}]},
+             "attributesToRetrieve": ["title"], "showHighlights": False, "filter": "x:1", "offset": 5},
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertIsNotNone(validate_bulk_search_query(query))
+        self.assertEqual(pydantic_json(queries),
+                         dumps_bulk_search_queries([validate_bulk_search_query(q) for q in queries]))
+
+    def test_queries_pydantic_would_coerce_fall_back(self):
+        for query in [{"index": "a", "limit": "3"}, {"index": "a", "searchableAttributes": ("title",)},
+                      {"index": "a", "showHighlights": 1}, {"index": "a", "limit": True}]:
+            with self.subTest(query=query):
+                self.assertIsNone(validate_bulk_search_query(query))
+                self.client.bulk_search([query])
+                self.assertEqual(json.loads(pydantic_json([query])),
+                                 json.loads(self.mock_post.call_args.kwargs["body"]))
+
+    def test_invalid_queries_raise_the_pydantic_error(self):
+        for query in [{"q": "hello"}, {"index": "a", "unknown": 1}, {"index": "a", "limit": "many"}]:
+            with self.subTest(query=query):
+                self.assertIsNone(validate_bulk_search_query(query))
+                with self.assertRaises(InvalidArgError) as cm:
+                    self.client.bulk_search([query])
+                self.assertIn("some parameters in search query(s) are invalid", cm.exception.message)
+
+    def test_each_index_is_checked_once(self):
+        with mock.patch.object(self.client, "index", wraps=self.client.index) as mock_index:
+            self.client.bulk_search([{"index": "a", "q": "1"}, {"index": "b", "q": "2"}, {"index": "a", "q": "3"}])
+            self.client.bulk_search([{"index": "a", "q": "4"}])
+        self.assertEqual(["a", "b"], [call.args[0] for call in mock_index.call_args_list])
+
+    def test_index_is_checked_again_when_its_url_changes(self):
+        mapping = self.client.config.instance_mapping
+        with mock.patch.object(self.client, "index", wraps=self.client.index) as mock_index:
+            self.client.bulk_search([{"index": "a", "q": "1"}])
+            with mock.patch.object(mapping, "get_index_base_url", return_value="http://other:8882"):
+                self.client.bulk_search([{"index": "a", "q": "2"}])
+                self.client.bulk_search([{"index": "a", "q": "3"}])
+        self.assertEqual(["a", "a"], [call.args[0] for call in mock_index.call_args_list])
@@ -0,0 +1,140 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pytest import mark
+from requests.exceptions import ConnectionError
+
+from marqo.errors import MarqoCloudIndexNotFoundError
+from marqo.marqo_cloud_instance_mappings import MarqoCloudInstanceMappings
+from marqo.models.marqo_cloud import IndexStatusResponse
+from tests.offline_test import make_response
+
+
+LIST_RESPONSE = make_response({"results": [
+    {"indexName": "index1", "marqoEndpoint": "index1.example.com", "indexStatus": "READY"},
+]})
+
+
+@mark.fixed
+class TestCloudIndexLookup(unittest.TestCase):
+
+    def setUp(self):
+        patch_get = mock.patch("marqo._httprequests.session.get")
+        self.mock_get = patch_get.start()
+        self.addCleanup(patch_get.stop)
+        self.status_responses = {}
+        self.mock_get.side_effect = self.fake_get
+        self.mapping = MarqoCloudInstanceMappings(control_base_url="https://api.marqo.ai", api_key="key",
+                                                  url_cache_duration=0)
+        self.mapping.get_index_base_url("index1")
+
+    def fake_get(self, url, **kwargs):
+        if url.endswith("/indexes"):
+            return LIST_RESPONSE
+        response = self.status_responses[url.rsplit("/", 2)[1]]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def requested_urls(self):
+        return [call.args[0] for call in self.mock_get.call_args_list]
+
+    def test_first_resolution_lists_the_account(self):
+        self.assertEqual(["https://api.marqo.ai/api/v2/indexes"], self.requested_urls())
+
+    def test_unknown_index_is_looked_up_alone(self):
+        self.status_responses["index2"] = make_response(
+            {"indexStatus": "READY", "marqoEndpoint": "index2.example.com"})
+        self.assertEqual("index2.example.com", self.mapping.get_index_base_url("index2"))
+        self.assertEqual("https://api.marqo.ai/api/v2/indexes/index2/status", self.requested_urls()[-1])
+        self.assertEqual({"index1": "index1.example.com", "index2": "index2.example.com"},
+                         self.mapping._urls_mapping["READY"])
+        self.assertTrue(self.mapping.is_index_usage_allowed("index2"))
+
+        self.mapping.get_index_base_url("index2")
+        self.assertEqual(2, self.mock_get.call_count)
+
+    def test_creating_index_is_merged_under_creating(self):
+        self.status_responses["index2"] = make_response(
+            {"indexStatus": "CREATING", "marqoEndpoint": "index2.example.com"})
+        self.assertEqual("index2.example.com", self.mapping.get_index_base_url("index2"))
+        self.assertFalse(self.mapping.is_index_usage_allowed("index2"))
+
+    def test_missing_index_is_cached(self):
+        self.status_responses["missing"] = make_response({"message": "not found"}, status_code=404)
+        for _ in range(3):
+            with self.assertRaises(MarqoCloudIndexNotFoundError):
+                self.mapping.get_index_base_url("missing")
+        self.assertEqual(2, self.mock_get.call_count)
+
+        self.mapping._missing_indexes["missing"] = 0
+        with self.assertRaises(MarqoCloudIndexNotFoundError):
+            self.mapping.get_index_base_url("missing")
+        self.assertEqual(3, self.mock_get.call_count)
+
+    def test_deleted_index_is_removed(self):
+        self.mapping._urls_mapping["CREATING"]["index2"] = "index2.example.com"
+        self.status_responses["index2"] = make_response({"indexStatus": "DELETING"})
+        with self.assertRaises(MarqoCloudIndexNotFoundError):
+            self.mapping.get_index_base_url("index2")
+        self.assertNotIn("index2", self.mapping._urls_mapping["CREATING"])
+
+    def test_falls_back_to_listing_when_lookup_fails(self):
+        for response in (ConnectionError("down"), make_response({}, status_code=500),
+                         make_response({"indexStatus": "READY"})):
+            with self.subTest(response=response):
+                self.mock_get.reset_mock()
+                self.status_responses["index2"] = response
+                with self.assertRaises(MarqoCloudIndexNotFoundError):
+                    self.mapping.get_index_base_url("index2")
+                self.assertEqual("https://api.marqo.ai/api/v2/indexes", self.requested_urls()[-1])
+
+    def test_concurrent_misses_send_one_lookup(self):
+        def slow_get(url, **kwargs):
+            if url.endswith("/status"):
+                time.sleep(0.2)
+                return make_response({"indexStatus": "READY", "marqoEndpoint": "index2.example.com"})
+            return LIST_RESPONSE
+
+        self.mock_get.side_effect = slow_get
+        urls = []
+        threads = [threading.Thread(target=lambda: urls.append(self.mapping.get_index_base_url("index2")))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(["index2.example.com"] * 4, urls)
+        self.assertEqual(1, self.requested_urls().count("https://api.marqo.ai/api/v2/indexes/index2/status"))
+
+    def test_lookup_waits_for_a_full_refresh_in_flight(self):
+        refresh_started = threading.Event()
+
+        def slow_get(url, **kwargs):
+            if url.endswith("/indexes"):
+                refresh_started.set()
+                time.sleep(0.2)
+                return make_response({"results": [
+                    {"indexName": "index1", "marqoEndpoint": "index1.example.com", "indexStatus": "READY"},
+                    {"indexName": "index2", "marqoEndpoint": "index2.example.com", "indexStatus": "READY"},
+                ]})
+            return make_response({"indexStatus": "READY", "marqoEndpoint": "index3.example.com"})
+
+        self.mapping.url_cache_duration = 5
+        self.mapping.latest_index_mappings_refresh_timestamp = 0
+        self.mock_get.side_effect = slow_get
+        refresher = threading.Thread(target=self.mapping._refresh_urls_single_flight)
+        refresher.start()
+        refresh_started.wait(5)
+        self.assertEqual("index2.example.com", self.mapping.get_index_base_url("index2"))
+        refresher.join()
+        # the full refresh was not overwritten by a lookup made from the previous mappings
+        self.assertEqual({"index1": "index1.example.com", "index2": "index2.example.com"},
+                         self.mapping._urls_mapping["READY"])
+        self.assertNotIn("https://api.marqo.ai/api/v2/indexes/index2/status", self.requested_urls())
+
+    def test_index_status_response_endpoint(self):
+        response = IndexStatusResponse(**{"indexStatus": "READY", "marqoEndpoint": "example.com"})
+        self.assertEqual("example.com", response.marqoEndpoint)
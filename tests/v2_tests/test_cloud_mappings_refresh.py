@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pytest import mark
+
+from marqo import _httprequests
+from marqo.errors import MarqoCloudIndexNotFoundError
+from marqo.marqo_cloud_instance_mappings import MarqoCloudInstanceMappings
+
+
+def indexes_response(*names):
+    response = mock.MagicMock()
+    response.ok = True
+    response.json.return_value = {"results": [
+        {"indexName": name, "marqoEndpoint": f"{name}.example.com", "indexStatus": "READY"} for name in names
+    ]}
+    return response
+
+
+@mark.fixed
+class TestCloudMappingsRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.in_flight = threading.Event()
+        patch_get = mock.patch("marqo._httprequests.session.get")
+        self.mock_get = patch_get.start()
+        self.addCleanup(patch_get.stop)
+
+    def blocking_get(self, *args, **kwargs):
+        self.in_flight.set()
+        self.release.wait(5)
+        return indexes_response("index1", "index2")
+
+    def make_mapping(self, **kwargs):
+        return MarqoCloudInstanceMappings(control_base_url="https://api.marqo.ai", api_key="key",
+                                          url_cache_duration=60, **kwargs)
+
+    def test_uses_shared_session_by_default(self):
+        self.assertIs(_httprequests.session, self.make_mapping()._session)
+
+    def test_concurrent_refreshes_are_single_flight(self):
+        self.mock_get.side_effect = self.blocking_get
+        mapping = self.make_mapping()
+        results = []
+
+        def resolve():
+            results.append(mapping.get_index_base_url("index2"))
+
+        threads = [threading.Thread(target=resolve) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(self.in_flight.wait(5))
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(["index2.example.com"] * 10, results)
+        self.mock_get.assert_called_once()
+
+    def test_stale_mappings_served_during_refresh(self):
+        self.mock_get.return_value = indexes_response("index1")
+        mapping = self.make_mapping()
+        self.assertEqual("index1.example.com", mapping.get_index_base_url("index1"))
+
+        self.mock_get.side_effect = self.blocking_get
+        mapping.latest_index_mappings_refresh_timestamp = 0
+        refresher = threading.Thread(target=mapping._refresh_urls_if_needed)
+        refresher.start()
+        self.assertTrue(self.in_flight.wait(5))
+
+        # while the refresh is in flight, known indexes resolve and error handlers do not block
+        self.assertEqual("index1.example.com", mapping.get_index_base_url("index1"))
+        mapping.index_http_error_handler("index1")
+        self.assertEqual(2, self.mock_get.call_count)
+
+        self.release.set()
+        refresher.join(5)
+        self.assertEqual("index2.example.com", mapping.get_index_base_url("index2"))
+
+    def test_failed_refresh_is_retried_by_later_calls(self):
+        self.mock_get.return_value.ok = False
+        mapping = self.make_mapping()
+        with self.assertRaises(MarqoCloudIndexNotFoundError):
+            mapping.get_index_base_url("index1")
+        self.mock_get.return_value = indexes_response("index1")
+        self.assertEqual("index1.example.com", mapping.get_index_base_url("index1"))
+
+    def test_background_refresher(self):
+        self.mock_get.return_value = indexes_response("index1")
+        mapping = self.make_mapping(refresh_interval=0.01)
+        self.addCleanup(mapping.stop_background_refresh)
+        deadline = time.time() + 5
+        while self.mock_get.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.mock_get.call_count, 2)
+        self.assertEqual({"index1": "index1.example.com"}, mapping._urls_mapping["READY"])
+
+        mapping.stop_background_refresh()
+        time.sleep(0.05)
+        calls = self.mock_get.call_count
+        time.sleep(0.05)
+        self.assertEqual(calls, self.mock_get.call_count)
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pytest import mark
+from requests.exceptions import ConnectionError
+
+from marqo.client import Client
+from marqo.marqo_cloud_instance_mappings import MarqoCloudInstanceMappings
+from marqo.utils import file_lock
+from tests.cloud_test_logic.cloud_instance_mappings import GetIndexesIndexResponseObject, mock_get_indexes_response
+
+CONTROL_URL = "https://api.marqo.ai"
+
+
+@mark.fixed
+class TestCloudMappingsSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.snapshot_path = os.path.join(tmp_dir.name, "mappings.json")
+
+    def make_mapping(self, api_key="secret-key", **kwargs):
+        return MarqoCloudInstanceMappings(control_base_url=CONTROL_URL, api_key=api_key,
+                                          snapshot_path=self.snapshot_path, **kwargs)
+
+    @mock_get_indexes_response([GetIndexesIndexResponseObject("index1", "READY", "example.com"),
+                                GetIndexesIndexResponseObject("index2", "CREATING", "example2.com")],
+                               to_return_mock=True)
+    def test_new_instance_routes_from_snapshot(self, mock_get):
+        self.assertEqual("example.com", self.make_mapping().get_index_base_url("index1"))
+        self.assertEqual(1, mock_get.call_count)
+        with open(self.snapshot_path) as f:
+            self.assertNotIn("secret-key", f.read())
+
+        with mock.patch("marqo.marqo_cloud_instance_mappings.threading.Thread") as mock_thread:
+            mapping = self.make_mapping()
+            # revalidated in the background, not before the first request
+            mock_thread.return_value.start.assert_called_once()
+            self.assertEqual("example.com", mapping.get_index_base_url("index1"))
+            self.assertEqual("example2.com", mapping.get_index_base_url("index2"))
+            self.assertTrue(mapping.is_index_usage_allowed("index1"))
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock_get_indexes_response([GetIndexesIndexResponseObject("index1", "READY", "example.com")],
+                               to_return_mock=True)
+    def test_snapshots_are_per_account_and_expire(self, mock_get):
+        self.make_mapping().get_index_base_url("index1")
+
+        with mock.patch("marqo.marqo_cloud_instance_mappings.threading.Thread") as mock_thread:
+            other_account = self.make_mapping(api_key="other-key")
+            self.assertEqual({}, other_account._urls_mapping["READY"])
+
+            with mock.patch("marqo.marqo_cloud_instance_mappings.time.time", return_value=time.time() + 7200):
+                expired = self.make_mapping()
+            self.assertEqual({}, expired._urls_mapping["READY"])
+            mock_thread.assert_not_called()
+
+    @mock_get_indexes_response([GetIndexesIndexResponseObject("index1", "READY", "example.com")],
+                               to_return_mock=True)
+    def test_revalidation_updates_snapshot(self, mock_get):
+        self.make_mapping().get_index_base_url("index1")
+        with open(self.snapshot_path) as f:
+            saved_at = next(iter(json.load(f).values()))["saved_at"]
+        time.sleep(0.01)
+
+        mapping = self.make_mapping()
+        deadline = time.time() + 5
+        while mock_get.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(2, mock_get.call_count)
+        while mapping.latest_index_mappings_refresh_timestamp <= saved_at and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertGreater(mapping.latest_index_mappings_refresh_timestamp, saved_at)
+
+    @mock_get_indexes_response([GetIndexesIndexResponseObject("index1", "READY", "example.com")],
+                               to_return_mock=True)
+    def test_failed_revalidation_is_logged(self, mock_get):
+        self.make_mapping().get_index_base_url("index1")
+        list_response = mock_get.return_value
+        mock_get.side_effect = [ConnectionError("control plane unreachable"), list_response]
+        uncaught = []
+        with mock.patch.object(threading, "excepthook", side_effect=uncaught.append), \
+                self.assertLogs("marqo", level="WARNING") as cm:
+            mapping = self.make_mapping(url_cache_duration=0)
+            deadline = time.time() + 5
+            while not cm.output and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual([], uncaught)
+        self.assertIn("control plane unreachable", cm.output[0])
+        # the snapshot is still used, and the next refresh succeeds
+        self.assertEqual("example.com", mapping.get_index_base_url("index1"))
+        mapping._refresh_urls_if_needed()
+        self.assertEqual(3, mock_get.call_count)
+
+    def test_concurrent_writers_keep_each_others_entries(self):
+        with mock.patch("marqo.marqo_cloud_instance_mappings.threading.Thread"):
+            mappings = [self.make_mapping(api_key=f"key{i}") for i in range(8)]
+        for i, mapping in enumerate(mappings):
+            mapping._urls_mapping["READY"] = {f"index{i}": f"example{i}.com"}
+
+        writer = threading.Thread(target=mappings[0]._write_snapshot)
+        with file_lock(self.snapshot_path):
+            writer.start()
+            time.sleep(0.1)
+            # the read-modify-write waits for the lock held by another writer
+            self.assertTrue(writer.is_alive())
+        writer.join()
+
+        threads = [threading.Thread(target=lambda m=mapping: [m._write_snapshot() for _ in range(10)])
+                   for mapping in mappings]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(self.snapshot_path) as f:
+            self.assertEqual({mapping._snapshot_key() for mapping in mappings}, set(json.load(f)))
+
+    def test_corrupt_snapshot_is_ignored(self):
+        with open(self.snapshot_path, "w") as f:
+            f.write("{not json")
+        mapping = self.make_mapping()
+        self.assertEqual({}, mapping._urls_mapping["READY"])
+
+    @mock.patch.dict(os.environ, {"MARQO_CLOUD_URL": CONTROL_URL})
+    def test_client_passes_snapshot_settings(self):
+        client = Client(CONTROL_URL, api_key="key", cloud_mappings_snapshot_path=self.snapshot_path,
+                        cloud_mappings_snapshot_ttl=60)
+        self.assertEqual(self.snapshot_path, client.config.instance_mapping.snapshot_path)
+        self.assertEqual(60, client.config.instance_mapping.snapshot_ttl)
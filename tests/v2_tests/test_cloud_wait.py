@@ -0,0 +1,77 @@
+import asyncio
+import itertools
+import unittest
+from unittest import mock
+
+from pytest import mark
+
+from marqo.client import Client
+from marqo.cloud_helpers import cloud_wait_for_index_status, poll_intervals, wait_for_indexes
+from marqo.enums import IndexStatus
+from marqo.errors import MarqoCloudIndexStatusTimeoutError, UnsupportedOperationError
+
+
+def list_response(**statuses):
+    return {"results": [{"indexName": name, "indexStatus": status} for name, status in statuses.items()]}
+
+
+@mark.fixed
+class TestCloudWait(unittest.TestCase):
+
+    def setUp(self):
+        self.req = mock.MagicMock()
+        patch_sleep = mock.patch("marqo.cloud_helpers.time.sleep")
+        self.mock_sleep = patch_sleep.start()
+        self.addCleanup(patch_sleep.stop)
+
+    def test_poll_intervals(self):
+        self.assertEqual([0.5, 1, 2, 4, 5, 5], list(itertools.islice(poll_intervals(0.5, 5, 2), 6)))
+
+    def test_wait_for_index_status_backs_off(self):
+        self.req.get.side_effect = [{"indexStatus": "CREATING"}] * 5 + [{"indexStatus": "READY"}]
+        statuses = []
+        assert cloud_wait_for_index_status(self.req, "index1", IndexStatus.READY,
+                                           on_status=lambda name, status: statuses.append((name, status)))
+        self.req.get.assert_called_with("indexes/index1/status")
+        self.assertEqual([1, 2, 4, 8, 10], [call.args[0] for call in self.mock_sleep.call_args_list])
+        self.assertEqual([("index1", "CREATING"), ("index1", "READY")], statuses)
+
+    def test_ready_index_does_not_sleep(self):
+        self.req.get.return_value = {"indexStatus": "READY"}
+        cloud_wait_for_index_status(self.req, "index1", IndexStatus.READY)
+        self.mock_sleep.assert_not_called()
+
+    def test_timeout(self):
+        self.req.get.return_value = {"indexStatus": "CREATING"}
+        with mock.patch("marqo.cloud_helpers.time.monotonic", side_effect=[0, 0.5, 2, 4]):
+            with self.assertRaises(MarqoCloudIndexStatusTimeoutError) as cm:
+                cloud_wait_for_index_status(self.req, "index1", IndexStatus.READY, timeout=3)
+        # the last sleep is cut short to end at the deadline
+        self.assertEqual([1, 1], [call.args[0] for call in self.mock_sleep.call_args_list])
+        self.assertEqual({"index1": "CREATING"}, cm.exception.pending_statuses)
+        self.assertIn("index1 (CREATING)", cm.exception.message)
+
+    def test_wait_for_indexes_uses_one_list_per_poll(self):
+        self.req.get.side_effect = [
+            list_response(a="CREATING", b="CREATING", c="DELETING"),
+            list_response(a="READY", b="CREATING"),
+            list_response(a="READY", b="READY", other="READY"),
+        ]
+        statuses = wait_for_indexes(self.req, {"a": "READY", "b": IndexStatus.READY, "c": IndexStatus.DELETED})
+        self.assertEqual({"a": "READY", "b": "READY", "c": "DELETED"}, statuses)
+        self.assertEqual(3, self.req.get.call_count)
+        self.req.get.assert_called_with("indexes")
+
+    def test_wait_for_indexes_async(self):
+        self.req.get.side_effect = [list_response(a="CREATING"), list_response(a="READY")]
+        with mock.patch("asyncio.sleep", new=mock.AsyncMock()) as mock_sleep:
+            client = Client("http://localhost:8882")
+            client.config.is_marqo_cloud = True
+            client.http = self.req
+            statuses = asyncio.run(client.wait_for_indexes_async({"a": IndexStatus.READY}, initial_interval=0.25))
+        self.assertEqual({"a": "READY"}, statuses)
+        mock_sleep.assert_awaited_once_with(0.25)
+
+    def test_client_wait_for_indexes_requires_cloud(self):
+        with self.assertRaises(UnsupportedOperationError):
+            Client("http://localhost:8882").wait_for_indexes({"a": IndexStatus.READY})
@@ -23,7 +23,7 @@ class TestConfig(MarqoTestCase):
         c = config.Config(instance_mappings=MarqoCloudInstanceMappings("https://api.marqo.ai"))
         assert c.instance_mapping.get_control_base_url() == "https://api.marqo.ai/api"
 
-    @mock.patch("requests.get")
+    @mock.patch("marqo._httprequests.session.get")
     def test_get_url_when_cluster_is_marqo_and_index_name_specified(self, mock_get):
         mock_get.return_value.json.return_value = {"results": [
             {"indexName": "index1", "marqoEndpoint": "example.com", "indexStatus": "READY"},
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from pytest import mark
+
+from marqo.client import Client
+from marqo.errors import InvalidArgError
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestCopyIndex(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.src_documents = {
+            f"doc{i}": {"_id": f"doc{i}", "title": f"title {i}", "tag": "a" if i % 2 else "b"} for i in range(5)
+        }
+        self.dst_settings = {"type": "unstructured"}
+        self.add_documents_bodies = []
+
+        self.patch("marqo._httprequests.HttpRequests.get", side_effect=self._fake_get)
+        self.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post)
+
+    def _fake_get(self, path, body=None, index_name=""):
+        if path == "indexes/dst/settings":
+            return self.dst_settings
+        assert path == "indexes/src/documents?expose_facets=True", path
+        return {"results": [
+            {**self.src_documents[_id], "_found": True,
+             "_tensor_facets": [{"title": self.src_documents[_id]["title"], "_embedding": [float(_id[-1]), 0.5]}]}
+            for _id in body
+        ]}
+
+    def _fake_post(self, path, body, index_name=""):
+        if path == "indexes/src/search":
+            ids = sorted(self.src_documents)[body["offset"]:body["offset"] + body["limit"]]
+            return {"hits": [{"_id": _id} for _id in ids]}
+        assert path == "indexes/dst/documents", path
+        self.add_documents_bodies.append(body)
+        return {"errors": False, "items": [
+            {"_id": doc["_id"], "status": 400 if doc["_id"] == "doc3" else 200} for doc in body["documents"]
+        ]}
+
+    def test_copy_index_with_existing_tensors(self):
+        res = self.client.copy_index("src", "dst", page_size=2)
+
+        self.assertEqual(5, res["documentsRead"])
+        self.assertEqual(4, res["documentsWritten"])
+        self.assertEqual([{"_id": "doc3", "status": 400}], res["failedItems"])
+        written = [doc for body in self.add_documents_bodies for doc in body["documents"]]
+        self.assertEqual(list(self.src_documents.values()), written)
+        for body in self.add_documents_bodies:
+            self.assertTrue(body["useExistingTensors"])
+            self.assertEqual(["title"], body["tensorFields"])
+
+    def test_copy_index_as_custom_vectors(self):
+        self.client.copy_index("src", "dst", custom_vector_fields=["title"], document_ids=["doc1", "doc2"])
+
+        body = self.add_documents_bodies[0]
+        self.assertEqual({"title": {"type": "custom_vector"}}, body["mappings"])
+        self.assertEqual({"_id": "doc1", "title": {"content": "title 1", "vector": [1.0, 0.5]}, "tag": "a"},
+                         body["documents"][0])
+
+    def test_copy_index_to_structured_index(self):
+        self.dst_settings = {"type": "structured"}
+        self.client.copy_index("src", "dst", custom_vector_fields=["title"], document_ids=["doc1"])
+
+        body = self.add_documents_bodies[0]
+        self.assertNotIn("tensorFields", body)
+        self.assertIsNone(body["mappings"])
+
+    def test_copy_index_with_transform(self):
+        def transform(doc):
+            if doc["tag"] == "a":
+                return None
+            return {**doc, "copied": True}
+
+        res = self.client.copy_index("src", "dst", transform=transform)
+
+        written = [doc for body in self.add_documents_bodies for doc in body["documents"]]
+        self.assertEqual(["doc0", "doc2", "doc4"], [doc["_id"] for doc in written])
+        self.assertTrue(all(doc["copied"] for doc in written))
+        self.assertEqual(5, res["documentsRead"])
+
+    def test_copy_index_to_another_client(self):
+        dst_client = Client("http://other-cluster:8882")
+        with mock.patch.object(dst_client, "index", wraps=dst_client.index) as mock_dst_index:
+            self.client.copy_index("src", "dst", dst_client=dst_client, document_ids=["doc1"])
+        mock_dst_index.assert_called_once_with("dst")
+
+    def test_copy_index_multi_chunk_custom_vector_field(self):
+        with self.assertRaises(InvalidArgError):
+            self.client._documents_for_copy(
+                [{"_id": "1", "title": "a b", "_tensor_facets": [{"title": "a", "_embedding": [1.0]},
+                                                                 {"title": "b", "_embedding": [2.0]}]}],
+                custom_vector_fields=["title"], transform=None
+            )
@@ -0,0 +1,90 @@
+import json
+import unittest
+from unittest import mock
+
+import pytest
+from pytest import mark
+
+from marqo import errors
+from tests.offline_test import OfflineTestCase, make_response
+
+np = pytest.importorskip("numpy")
+
+from marqo.vectors import decode_embeddings_response
+
+
+def get_documents_response(dims):
+    results = []
+    for i, dim in enumerate(dims):
+        results.append({
+            "_id": f"doc{i}", "_found": True, "title": 'a "_embedding": [1, 2] in a string',
+            "_tensor_facets": [{"title": "hello", "_embedding": [float(i)] * dim}],
+        })
+    results.append({"_id": "missing", "_found": False})
+    return {"results": results}
+
+
+@mark.fixed
+class TestDecodeEmbeddingsResponse(unittest.TestCase):
+
+    def test_numpy_format(self):
+        content = json.dumps(get_documents_response([3, 3])).encode("utf-8")
+        res = decode_embeddings_response(content, "numpy")
+        embeddings = [doc["_tensor_facets"][0]["_embedding"] for doc in res["results"][:2]]
+        for i, embedding in enumerate(embeddings):
+            self.assertEqual(np.float32, embedding.dtype)
+            np.testing.assert_array_equal([float(i)] * 3, embedding)
+        # rows of one contiguous matrix
+        self.assertIs(embeddings[0].base, embeddings[1].base)
+        self.assertEqual('a "_embedding": [1, 2] in a string', res["results"][0]["title"])
+        self.assertEqual({"_id": "missing", "_found": False}, res["results"][2])
+
+    def test_numpy_format_mixed_dimensions(self):
+        content = json.dumps(get_documents_response([2, 4, 0])).encode("utf-8")
+        res = decode_embeddings_response(content, "numpy")
+        self.assertEqual([2, 4, 0], [len(doc["_tensor_facets"][0]["_embedding"]) for doc in res["results"][:3]])
+
+    def test_matrix_format(self):
+        content = json.dumps(get_documents_response([4, 4, 4])).encode("utf-8")
+        res = decode_embeddings_response(content, "matrix")
+        self.assertEqual((3, 4), res["_embeddings"].shape)
+        self.assertEqual([0, 1, 2], [doc["_tensor_facets"][0]["_embedding"] for doc in res["results"][:3]])
+        np.testing.assert_array_equal([2.0] * 4, res["_embeddings"][2])
+
+    def test_matrix_format_mixed_dimensions(self):
+        content = json.dumps(get_documents_response([2, 3])).encode("utf-8")
+        with self.assertRaises(errors.MarqoError):
+            decode_embeddings_response(content, "matrix")
+
+    def test_no_embeddings(self):
+        res = decode_embeddings_response(b'{"results": [{"_id": "1"}]}', "matrix")
+        self.assertEqual((0, 0), res["_embeddings"].shape)
+
+
+@mark.fixed
+class TestGetDocumentsEmbeddingFormat(OfflineTestCase):
+
+    def test_get_documents_decodes_embeddings(self):
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response(get_documents_response([8, 8]))
+            res = self.index.get_documents(["doc0", "doc1"], expose_facets=True, embedding_format="numpy")
+        embedding = res["results"][1]["_tensor_facets"][0]["_embedding"]
+        self.assertIsInstance(embedding, np.ndarray)
+        np.testing.assert_array_equal([1.0] * 8, embedding)
+
+    def test_get_document_matrix(self):
+        doc = get_documents_response([8])["results"][0]
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response(doc)
+            res = self.index.get_document("doc0", expose_facets=True, embedding_format="matrix")
+        self.assertEqual((1, 8), res["_embeddings"].shape)
+
+    def test_default_format_is_unchanged(self):
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response(get_documents_response([8]))
+            res = self.index.get_documents(["doc0"], expose_facets=True)
+        self.assertEqual([0.0] * 8, res["results"][0]["_tensor_facets"][0]["_embedding"])
+
+    def test_invalid_format(self):
+        with self.assertRaises(errors.InvalidArgError):
+            self.index.get_documents(["doc0"], embedding_format="lists")
@@ -1,8 +1,11 @@
 import copy
 import functools
 import math
+import os
 import pprint
 import random
+import tempfile
+import threading
 import pytest
 import requests
 import time
@@ -11,6 +14,7 @@ from pytest import mark
 
 from marqo.errors import MarqoError, MarqoWebError
 from tests.marqo_test import MarqoTestCase, CloudTestIndex
+from tests.offline_test import OfflineTestCase
 from marqo import enums
 from unittest import mock
 
@@ -130,3 +134,123 @@ class TestDeleteDocuments(MarqoTestCase):
                 elif item["_id"] == "missingdoc":
                     assert item["status"] == 404
                     assert item["result"] == "not_found"
+
+
+@mark.fixed
+class TestBatchedDeleteDocuments(OfflineTestCase):
+
+    @staticmethod
+    def _delete_response(path, body, index_name):
+        return {
+            "indexName": index_name, "type": "documentDeletion",
+            "status": "succeeded" if "missing" not in body else "failed",
+            "details": {"receivedDocumentIds": len(body),
+                        "deletedDocuments": len([i for i in body if i != "missing"])},
+            "items": [{"_id": i, "status": 404 if i == "missing" else 200} for i in body],
+            "duration": "PT0.01S", "startedAt": body[0], "finishedAt": body[-1],
+        }
+
+    def test_delete_documents_batched_aggregates_results(self):
+        ids = (str(i) for i in range(7))
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=self._delete_response) as mock_post:
+            res = self.index.delete_documents(ids, client_batch_size=3, client_concurrency=2)
+
+        self.assertEqual([["0", "1", "2"], ["3", "4", "5"], ["6"]],
+                         sorted([kwargs["body"] for _, kwargs in mock_post.call_args_list]))
+        self.assertEqual("succeeded", res["status"])
+        self.assertEqual({"receivedDocumentIds": 7, "deletedDocuments": 7}, res["details"])
+        self.assertEqual([str(i) for i in range(7)], [item["_id"] for item in res["items"]])
+        self.assertEqual("0", res["startedAt"])
+        self.assertEqual("6", res["finishedAt"])
+        self.assertNotIn("duration", res)
+
+    def test_delete_documents_batched_reports_failures(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=self._delete_response):
+            res = self.index.delete_documents(["a", "b", "missing", "c"], client_batch_size=2)
+
+        self.assertEqual("failed", res["status"])
+        self.assertEqual({"receivedDocumentIds": 4, "deletedDocuments": 3}, res["details"])
+
+    def test_delete_documents_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ids.txt")
+            with open(path, "w") as f:
+                f.write("a\nb\n\nc\n  d  \n")
+            with mock.patch("marqo._httprequests.HttpRequests.post",
+                            side_effect=self._delete_response) as mock_post:
+                res = self.index.delete_documents_from_file(path, client_batch_size=3)
+
+        self.assertEqual([["a", "b", "c"], ["d"]], [kwargs["body"] for _, kwargs in mock_post.call_args_list])
+        self.assertEqual(4, res["details"]["receivedDocumentIds"])
+
+    def test_delete_documents_batched_empty_ids(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            res = self.index.delete_documents([], client_batch_size=3)
+
+        mock_post.assert_not_called()
+        self.assertEqual({"receivedDocumentIds": 0, "deletedDocuments": 0}, res["details"])
+
+
+@mark.fixed
+class TestDeleteByFilter(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lock = threading.Lock()
+        self.documents = {f"doc{i:03d}": {"tenant": "acme" if i % 3 else "other"} for i in range(100)}
+        self.search_bodies = []
+
+    def _fake_post(self, path, body, index_name):
+        with self.lock:
+            if path.endswith("/search"):
+                self.search_bodies.append(body)
+                tenant = body["filter"].split(":")[1]
+                matches = sorted(_id for _id, doc in self.documents.items() if doc["tenant"] == tenant)
+                page = matches[body["offset"]:body["offset"] + body["limit"]]
+                return {"hits": [{"_id": _id} for _id in page]}
+            elif path.endswith("/documents/delete-batch"):
+                deleted = [_id for _id in body if self.documents.pop(_id, None) is not None]
+                return {"indexName": index_name, "type": "documentDeletion", "status": "succeeded",
+                        "details": {"receivedDocumentIds": len(body), "deletedDocuments": len(deleted)},
+                        "items": [{"_id": _id, "status": 200 if _id in deleted else 404} for _id in body]}
+            raise AssertionError(f"Unexpected request to {path}")
+
+    def test_delete_by_filter_deletes_all_matches(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post):
+            res = self.index.delete_by_filter("tenant:acme", page_size=10, client_concurrency=3)
+
+        self.assertEqual(66, res["details"]["deletedDocuments"])
+        self.assertEqual(34, len(self.documents))
+        self.assertTrue(all(doc["tenant"] == "other" for doc in self.documents.values()))
+
+        for body in self.search_bodies:
+            self.assertEqual(["_id"], body["attributesToRetrieve"])
+            self.assertFalse(body["showHighlights"])
+            self.assertEqual("LEXICAL", body["searchMethod"])
+
+    def test_delete_by_filter_respects_max_search_offset(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post):
+            res = self.index.delete_by_filter("tenant:acme", page_size=7, max_search_offset=20)
+
+        self.assertEqual(66, res["details"]["deletedDocuments"])
+        self.assertTrue(all(body["offset"] + body["limit"] <= 20 for body in self.search_bodies))
+
+    def test_delete_by_filter_no_matches(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post):
+            res = self.index.delete_by_filter("tenant:nobody")
+
+        self.assertEqual(0, res["details"]["deletedDocuments"])
+        self.assertEqual(1, len(self.search_bodies))
+        self.assertEqual(100, len(self.documents))
+
+    def test_delete_by_filter_stops_when_nothing_is_deleted(self):
+        def post(path, body, index_name):
+            if path.endswith("/search"):
+                return {"hits": [{"_id": "stuck"}]}
+            return {"status": "failed", "details": {"receivedDocumentIds": 1, "deletedDocuments": 0},
+                    "items": [{"_id": "stuck", "status": 500}]}
+
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=post):
+            res = self.index.delete_by_filter("tenant:acme")
+
+        self.assertEqual("failed", res["status"])
@@ -0,0 +1,186 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+from pytest import mark
+
+from marqo.errors import InvalidArgError, MarqoError
+from marqo.vectors import NpyRowWriter, embedding_side_paths, load_embeddings
+from tests.offline_test import OfflineTestCase
+
+
+class FakeIndexTestCase(OfflineTestCase):
+    """Serves search and get_documents requests from an in-memory dict of documents"""
+
+    def setUp(self):
+        super().setUp()
+        self.documents = {
+            f"doc{i:03d}": {"_id": f"doc{i:03d}", "title": f"title {i}", "price": float(i)} for i in range(25)
+        }
+        self.get_documents_paths = []
+
+        self.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post)
+        self.patch("marqo._httprequests.HttpRequests.get", side_effect=self._fake_get)
+
+    def _fake_post(self, path, body, index_name):
+        assert path.endswith("/search")
+        ids = sorted(self.documents)[body["offset"]:body["offset"] + body["limit"]]
+        return {"hits": [{"_id": _id, "_score": 1.0} for _id in ids]}
+
+    def _fake_get(self, path, body, index_name, response_decoder=None):
+        if response_decoder is not None:
+            return response_decoder(json.dumps(self._fake_get(path, body, index_name)).encode("utf-8"))
+        self.get_documents_paths.append(path)
+        results = []
+        for _id in body:
+            if _id not in self.documents:
+                results.append({"_id": _id, "_found": False})
+                continue
+            doc = {**self.documents[_id], "_found": True}
+            if "expose_facets=True" in path:
+                doc["_tensor_facets"] = [{"title": doc["title"], "_embedding": [doc["price"], 1.0]}]
+            results.append(doc)
+        return {"results": results}
+
+
+@mark.fixed
+class TestIterDocuments(FakeIndexTestCase):
+
+    def test_iter_documents_scans_whole_index(self):
+        docs = list(self.index.iter_documents(page_size=10))
+        self.assertEqual(list(self.documents.values()), docs)
+        self.assertEqual(3, len(self.get_documents_paths))
+
+    def test_iter_documents_by_ids_skips_missing(self):
+        docs = list(self.index.iter_documents(document_ids=iter(["doc001", "missing", "doc002"]), page_size=2))
+        self.assertEqual(["doc001", "doc002"], [doc["_id"] for doc in docs])
+        self.assertTrue(all("_found" not in doc for doc in docs))
+
+    def test_iter_documents_expose_facets(self):
+        docs = list(self.index.iter_documents(document_ids=["doc003"], expose_facets=True))
+        self.assertEqual([{"title": "title 3", "_embedding": [3.0, 1.0]}], docs[0]["_tensor_facets"])
+        self.assertIn("expose_facets=True", self.get_documents_paths[0])
+
+    def test_iter_documents_warns_when_truncated(self):
+        with mock.patch("marqo.index.mq_logger.warning") as mock_warning:
+            docs = list(self.index.iter_documents(page_size=10, max_search_offset=20))
+        self.assertEqual(20, len(docs))
+        mock_warning.assert_called_once()
+
+    def test_iter_documents_can_stop_early(self):
+        docs = self.index.iter_documents(page_size=5)
+        self.assertEqual("doc000", next(docs)["_id"])
+        docs.close()
+        # the current page and at most one prefetched page were requested
+        self.assertLessEqual(len(self.get_documents_paths), 2)
+
+
+@mark.fixed
+class TestExport(FakeIndexTestCase):
+
+    def test_export_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "export.jsonl")
+            num_docs = self.index.export(path, page_size=7)
+            with open(path) as f:
+                docs = [json.loads(line) for line in f]
+        self.assertEqual(25, num_docs)
+        self.assertEqual(list(self.documents.values()), docs)
+
+    def test_export_parquet(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "export.parquet")
+            num_docs = self.index.export(path, page_size=10, expose_facets=True)
+            table = pq.read_table(path)
+        self.assertEqual(25, num_docs)
+        self.assertEqual(25, table.num_rows)
+        rows = table.to_pylist()
+        self.assertEqual("doc004", rows[4]["_id"])
+        self.assertEqual([{"field": "title", "content": "title 4", "embedding": [4.0, 1.0]}],
+                         rows[4]["_tensor_facets"])
+
+    def test_export_unknown_format(self):
+        with self.assertRaises(InvalidArgError):
+            self.index.export("export.csv")
+
+
+@mark.fixed
+class TestExportEmbeddings(FakeIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.np = pytest.importorskip("numpy")
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "embeddings.npy")
+
+    def test_export_embeddings_float32(self):
+        exported = self.index.export_embeddings(self.path, page_size=10)
+
+        self.assertEqual((25, 2), exported["shape"])
+        loaded = load_embeddings(self.path)
+        self.assertIsInstance(loaded["embeddings"], self.np.memmap)
+        self.assertEqual(self.np.float32, loaded["embeddings"].dtype)
+        self.np.testing.assert_array_equal([[i, 1.0] for i in range(25)], loaded["embeddings"])
+        self.assertEqual(sorted(self.documents), list(loaded["ids"]))
+        self.assertEqual(["title"] * 25, list(loaded["keys"]))
+        self.assertIsNone(loaded["scales"])
+
+    def test_export_embeddings_float16(self):
+        self.index.export_embeddings(self.path, document_ids=["doc001", "doc002"], dtype="float16")
+
+        loaded = load_embeddings(self.path)
+        self.assertEqual(self.np.float16, loaded["embeddings"].dtype)
+        self.np.testing.assert_array_equal([[1.0, 1.0], [2.0, 1.0]], loaded["embeddings"])
+
+    def test_export_embeddings_int8(self):
+        exported = self.index.export_embeddings(self.path, dtype="int8", page_size=7)
+
+        loaded = load_embeddings(self.path)
+        self.assertEqual(self.np.int8, loaded["embeddings"].dtype)
+        self.assertEqual((25,), loaded["scales"].shape)
+        self.assertEqual(exported["scales"], embedding_side_paths(self.path)["scales"])
+        dequantized = load_embeddings(self.path, dequantize=True)["embeddings"]
+        self.np.testing.assert_allclose([[i, 1.0] for i in range(25)], dequantized, atol=0.1)
+
+    def test_float_export_replaces_int8_export(self):
+        self.index.export_embeddings(self.path, dtype="int8")
+        exported = self.index.export_embeddings(self.path)
+
+        self.assertIsNone(exported["scales"])
+        self.assertFalse(os.path.exists(embedding_side_paths(self.path)["scales"]))
+        loaded = load_embeddings(self.path, dequantize=True)
+        self.assertEqual(self.np.float32, loaded["embeddings"].dtype)
+        self.np.testing.assert_array_equal([[i, 1.0] for i in range(25)], loaded["embeddings"])
+        self.assertIsNone(loaded["scales"])
+
+    def test_export_embeddings_no_documents(self):
+        exported = self.index.export_embeddings(self.path, document_ids=["missing"])
+
+        self.assertEqual((0, 0), exported["shape"])
+        self.assertEqual((0, 0), self.np.load(self.path).shape)
+
+    def test_export_embeddings_invalid_dtype(self):
+        with self.assertRaises(InvalidArgError):
+            self.index.export_embeddings(self.path, dtype="float64")
+
+
+@mark.fixed
+class TestNpyRowWriter(unittest.TestCase):
+
+    def test_written_file_is_a_valid_npy_file(self):
+        np = pytest.importorskip("numpy")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "rows.npy")
+            writer = NpyRowWriter(path, "float32")
+            writer.write(np.arange(6, dtype=np.float64).reshape(2, 3))
+            writer.write(np.arange(6, 12).reshape(2, 3))
+            with self.assertRaises(MarqoError):
+                writer.write(np.zeros((1, 4)))
+            writer.close()
+
+            np.testing.assert_array_equal(np.arange(12, dtype=np.float32).reshape(4, 3), np.load(path))
@@ -0,0 +1,102 @@
+import random
+import unittest
+from unittest import mock
+
+import pytest
+from pytest import mark
+
+from marqo._fusion import _fuse_hits_python, fuse_hits
+from marqo.errors import InvalidArgError, MarqoError
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestHybridSearch(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lexical_hits = [{"_id": "a", "_score": 12.0}, {"_id": "b", "_score": 8.0}, {"_id": "c", "_score": 2.0}]
+        self.tensor_hits = [{"_id": "c", "_score": 0.9}, {"_id": "d", "_score": 0.8}, {"_id": "a", "_score": 0.5}]
+
+    def hybrid_search(self, **kwargs):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"result": [{"hits": self.lexical_hits}, {"hits": self.tensor_hits}]}
+            res = self.index.hybrid_search("hello", **kwargs)
+        return res, mock_post
+
+    def test_single_bulk_search_request(self):
+        _, mock_post = self.hybrid_search(limit=2, candidate_limit=5, filter_string="colour:red")
+        mock_post.assert_called_once()
+        self.assertEqual("indexes/bulk/search", mock_post.call_args.kwargs["path"])
+        queries = mock_post.call_args.kwargs["body"]["queries"]
+        self.assertEqual(["LEXICAL", "TENSOR"], [query["searchMethod"] for query in queries])
+        for query in queries:
+            self.assertEqual({"index": "my-index", "q": "hello", "limit": 5, "filter": "colour:red"},
+                             {key: query[key] for key in ["index", "q", "limit", "filter"]})
+
+    def test_rrf(self):
+        res, _ = self.hybrid_search(limit=4)
+        self.assertEqual(["a", "c", "b", "d"], [hit["_id"] for hit in res["hits"]])
+        self.assertAlmostEqual(1 / 61 + 1 / 63, res["hits"][0]["_score"])
+        self.assertEqual(12.0, res["hits"][0]["_lexical_score"])
+        self.assertEqual(0.5, res["hits"][0]["_tensor_score"])
+        self.assertIsNone(res["hits"][3]["_lexical_score"])
+
+    def test_weighted(self):
+        res, _ = self.hybrid_search(limit=2, fusion="weighted", lexical_weight=0.25)
+        # c: 0.25 * 0 + 0.75 * 1, a: 0.25 * 1 + 0.75 * 0
+        self.assertEqual(["c", "d"], [hit["_id"] for hit in res["hits"]])
+        self.assertAlmostEqual(0.75, res["hits"][0]["_score"])
+
+    def test_without_dedupe(self):
+        res, _ = self.hybrid_search(limit=10, dedupe=False)
+        self.assertEqual(6, len(res["hits"]))
+        self.assertEqual(["a", "c"], [hit["_id"] for hit in res["hits"][:2]])
+
+    def test_invalid_arguments(self):
+        for kwargs in [{"fusion": "max"}, {"lexical_weight": 1.5}, {"limit": 10, "candidate_limit": 5}]:
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(InvalidArgError):
+                    self.index.hybrid_search("hello", **kwargs)
+
+
+@mark.fixed
+class TestFuseHits(unittest.TestCase):
+
+    def setUp(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(0)
+        ids = [f"doc{i}" for i in range(1500)]
+        # rounded scores, so that many fused scores tie
+        self.lexical_hits = [{"_id": _id, "_score": round(rng.uniform(0, 20), 1), "title": _id}
+                             for _id in rng.sample(ids, 1000)]
+        self.tensor_hits = [{"_id": _id, "_score": round(rng.uniform(0.2, 1), 2), "title": _id}
+                            for _id in rng.sample(ids, 1000)]
+        self.lexical_hits.sort(key=lambda hit: -hit["_score"])
+        self.tensor_hits.sort(key=lambda hit: -hit["_score"])
+
+    def test_numpy_matches_the_fallback_on_long_lists(self):
+        for fusion in ("rrf", "weighted"):
+            for dedupe in (True, False):
+                for limit in (1, 10, 1000, 3000):
+                    kwargs = dict(limit=limit, fusion=fusion, rrf_k=60, lexical_weight=0.3, dedupe=dedupe)
+                    with self.subTest(**kwargs):
+                        self.assertEqual(_fuse_hits_python(self.lexical_hits, self.tensor_hits, **kwargs),
+                                         fuse_hits(self.lexical_hits, self.tensor_hits, **kwargs))
+
+    def test_numpy_matches_the_fallback_on_edge_cases(self):
+        constant = [{"_id": "a", "_score": 1.0}, {"_id": "b", "_score": 1.0}]
+        for lexical_hits, tensor_hits in [([], []), (constant, []), ([], constant), (constant, constant)]:
+            for fusion in ("rrf", "weighted"):
+                kwargs = dict(limit=3, fusion=fusion, rrf_k=60, lexical_weight=0.5, dedupe=True)
+                with self.subTest(lexical_hits=lexical_hits, tensor_hits=tensor_hits, fusion=fusion):
+                    self.assertEqual(_fuse_hits_python(lexical_hits, tensor_hits, **kwargs),
+                                     fuse_hits(lexical_hits, tensor_hits, **kwargs))
+
+    def test_falls_back_without_numpy(self):
+        kwargs = dict(limit=10, fusion="rrf", rrf_k=60, lexical_weight=0.5, dedupe=True)
+        with mock.patch("marqo._fusion.import_numpy", side_effect=MarqoError("no numpy")), \
+                mock.patch("marqo._fusion._fuse_hits_python", wraps=_fuse_hits_python) as mock_python:
+            hits = fuse_hits(self.lexical_hits, self.tensor_hits, **kwargs)
+        mock_python.assert_called_once()
+        self.assertEqual(_fuse_hits_python(self.lexical_hits, self.tensor_hits, **kwargs), hits)
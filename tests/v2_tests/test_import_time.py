@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+
+from pytest import mark
+
+
+def loaded_modules(statement):
+    """The heavy dependencies loaded by running `statement` in a fresh interpreter"""
+    check = "; import sys; print(','.join(m for m in ('requests', 'pydantic', 'packaging', 'asyncio') " \
+            "if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", statement + check], capture_output=True, text=True, check=True)
+    return [module for module in proc.stdout.strip().split(",") if module]
+
+
+@mark.fixed
+class TestImportTime(unittest.TestCase):
+
+    def test_import_marqo_loads_no_dependencies(self):
+        self.assertEqual([], loaded_modules("import marqo"))
+
+    def test_client_does_not_load_pydantic_or_packaging(self):
+        self.assertEqual(["requests"], loaded_modules("from marqo import Client; Client('http://localhost:8882')"))
+
+    def test_submodules_resolve_after_import_marqo(self):
+        proc = subprocess.run(
+            [sys.executable, "-c", "import marqo; print(marqo.errors.MarqoWebError.__name__, marqo.enums.__name__)"],
+            capture_output=True, text=True, check=True)
+        self.assertEqual("MarqoWebError marqo.enums", proc.stdout.strip())
+
+    def test_lazy_attributes(self):
+        import marqo
+        from marqo.client import Client
+        from marqo.enums import SearchMethods
+        self.assertIs(Client, marqo.Client)
+        self.assertIs(SearchMethods, marqo.SearchMethods)
+        self.assertIn("supported_marqo_version", dir(marqo))
+        with self.assertRaises(AttributeError):
+            marqo.not_an_attribute
@@ -15,7 +15,7 @@ class TestInitLogging(MarqoTestCase):
         self.client.index("this-index-will-never-exist")
         assert mock_warning.call_count == 0
 
-    @patch("requests.get")
+    @patch("marqo._httprequests.session.get")
     @patch("marqo.marqo_cloud_instance_mappings.mq_logger.warning")
     def test_index_init_creating(self, mock_warning, mock_get):
         """Test no logging on index instantiation when a cloud index is in a CREATING state"""
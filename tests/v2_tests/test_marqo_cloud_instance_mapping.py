@@ -275,7 +275,7 @@ class TestMarqoCloudInstanceMappings(MarqoTestCase):
             self.client.config.instance_mapping._urls_mapping["READY"].pop(test_index_name, '')
 
             with patch("marqo._httprequests.HttpRequests.post") as mock_post, \
-                    patch("requests.get") as mock_get:
+                    patch("marqo._httprequests.session.get") as mock_get:
                 # 1 for the initial refresh, 1 for the search
                 self.client.index(test_index_name).search("test")
                 assert mock_post.call_count == 1
@@ -367,7 +367,7 @@ class TestMarqoCloudInstanceMappings(MarqoTestCase):
             mock_post.side_effect = pass_through_post
 
         @mock.patch("marqo._httprequests.HttpRequests.post", mock_post)
-        @mock.patch("requests.get", mock_get)
+        @mock.patch("marqo._httprequests.session.get", mock_get)
         def run():
 
             self.client.index(test_index_name).search("test")
@@ -0,0 +1,124 @@
+import json
+from unittest import mock
+
+from pytest import mark
+
+from marqo.client import Client
+from marqo.errors import InvalidArgError
+from tests.marqo_stand_in import MarqoStandIn
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestProjectionProfiles(OfflineTestCase):
+
+    client_kwargs = {"unprojected_payload_warning_bytes": 100}
+
+    def setUp(self):
+        super().setUp()
+        self.index.register_projection("card", attributes_to_retrieve=["title", "price"])
+
+    def search_body(self, **kwargs):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"hits": []}
+            self.client.index("my-index").search("hello", **kwargs)
+        return mock_post.call_args.kwargs["body"]
+
+    def test_search_without_profile_is_unchanged(self):
+        body = self.search_body()
+        self.assertNotIn("attributesToRetrieve", body)
+        self.assertTrue(body["showHighlights"])
+
+    def test_search_with_named_profile(self):
+        body = self.search_body(projection="card")
+        self.assertEqual(["title", "price"], body["attributesToRetrieve"])
+        self.assertFalse(body["showHighlights"])
+
+    def test_explicit_arguments_override_profile(self):
+        body = self.search_body(projection="card", attributes_to_retrieve=["title"], show_highlights=True)
+        self.assertEqual(["title"], body["attributesToRetrieve"])
+        self.assertTrue(body["showHighlights"])
+
+    def test_default_profile_is_shared_by_index_handles(self):
+        self.index.set_default_projection("card")
+        self.assertEqual(["title", "price"], self.search_body()["attributesToRetrieve"])
+        self.assertNotIn("attributesToRetrieve", self.search_body(projection=False))
+        self.index.set_default_projection(None)
+        self.assertNotIn("attributesToRetrieve", self.search_body())
+
+    def test_unknown_profile(self):
+        with self.assertRaises(InvalidArgError):
+            self.search_body(projection="missing")
+        with self.assertRaises(InvalidArgError):
+            self.index.set_default_projection("missing")
+
+    def test_bulk_search_applies_profiles(self):
+        queries = [{"index": "my-index", "q": "a", "projection": "card"}, {"index": "my-index", "q": "b"}]
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"result": []}
+            self.client.bulk_search(queries)
+        sent = json.loads(mock_post.call_args.kwargs["body"])["queries"]
+        self.assertEqual(["title", "price"], sent[0]["attributesToRetrieve"])
+        self.assertFalse(sent[0]["showHighlights"])
+        self.assertIsNone(sent[1]["attributesToRetrieve"])
+        self.assertIn("projection", queries[0])
+
+    def test_get_documents_projects_client_side(self):
+        self.index.register_projection("title_only", attributes_to_retrieve=["title"], default=True)
+        with mock.patch("marqo._httprequests.HttpRequests.get") as mock_get:
+            mock_get.return_value = {"results": [
+                {"_id": "1", "_found": True, "title": "a", "description": "long"},
+                {"_id": "2", "_found": False},
+            ]}
+            res = self.index.get_documents(["1", "2"])
+        self.assertEqual([{"_id": "1", "_found": True, "title": "a"}, {"_id": "2", "_found": False}],
+                         res["results"])
+
+    def test_debug_mode_warns_about_large_unprojected_payloads(self):
+        with MarqoStandIn(hits_per_query=5, hit_bytes=50) as server, \
+                mock.patch("marqo.projections.mq_logger.warning") as mock_warning:
+            client = Client(server.url, unprojected_payload_warning_bytes=100)
+            client.create_index("my-index")
+            index = client.index("my-index")
+            index.register_projection("card", attributes_to_retrieve=["title", "price"])
+            index.search("hello")
+            index.search("hello", projection="card")
+            index.search("hello", projection=False)
+            client.bulk_search([{"index": "my-index", "q": "a", "projection": False}])
+            index.add_documents([{"_id": str(i), "text": "x" * 50} for i in range(5)], tensor_fields=["text"])
+            # reading whole documents on purpose, as export and copy_index do, is not warned about
+            index.get_documents([str(i) for i in range(5)], projection=False)
+            list(index.iter_documents())
+        mock_warning.assert_called_once()
+        self.assertIn(__file__, mock_warning.call_args.args[0])
+        self.assertIn("search on index `my-index`", mock_warning.call_args.args[0])
+
+    def test_raw_get_documents_is_not_warned_about(self):
+        with MarqoStandIn() as server, mock.patch("marqo.projections.mq_logger.warning") as mock_warning:
+            client = Client(server.url, unprojected_payload_warning_bytes=10)
+            client.create_index("my-index")
+            index = client.index("my-index")
+            index.add_documents([{"_id": str(i), "text": "x" * 50} for i in range(5)], tensor_fields=["text"])
+            ids = [str(i) for i in range(5)]
+            index.get_documents(ids, raw=True)
+            index.register_projection("card", attributes_to_retrieve=["title"], default=True)
+            res = index.get_documents(ids, raw=True)
+            mock_warning.assert_not_called()
+            # the default profile is not applied to raw responses
+            self.assertEqual("x" * 50, res.json()["results"][0]["text"])
+            index.set_default_projection(None)
+            index.get_documents(ids)
+        mock_warning.assert_called_once()
+
+    def test_warning_uses_the_response_body_size(self):
+        with MarqoStandIn(hits_per_query=1, hit_bytes=10) as server, \
+                mock.patch("marqo.projections.mq_logger.warning") as mock_warning:
+            client = Client(server.url, unprojected_payload_warning_bytes=500)
+            client.create_index("my-index")
+            client.index("my-index").search("hello")
+            mock_warning.assert_not_called()
+            client.index("my-index").search("hello", raw=True)
+            mock_warning.assert_not_called()
+            server.hit_bytes = 600
+            client.index("my-index").search("hello", raw=True)
+        mock_warning.assert_called_once()
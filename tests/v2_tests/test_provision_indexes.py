@@ -0,0 +1,106 @@
+import threading
+from unittest import mock
+
+from pytest import mark
+
+from marqo.errors import IndexAlreadyExistsError, InvalidArgError
+from tests.offline_test import OfflineTestCase
+
+
+def list_response(**statuses):
+    return {"results": [{"indexName": name, "indexStatus": status} for name, status in statuses.items()]}
+
+
+@mark.fixed
+class TestProvisionIndexes(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patch("marqo.cloud_helpers.time.sleep")
+
+    def make_cloud(self):
+        self.client.config.api_key = "key"
+        self.client.config.is_marqo_cloud = True
+
+    def test_create_indexes_locally_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def post(path, body=None, **kwargs):
+            barrier.wait()
+            return {"acknowledged": True, "index": path.split("/")[1]}
+
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=post) as mock_post, \
+                mock.patch("marqo._httprequests.HttpRequests.get") as mock_get:
+            res = self.client.create_indexes([{"index_name": f"index{i}", "model": "hf/e5-base-v2"}
+                                              for i in range(3)])
+
+        self.assertFalse(res["errors"])
+        self.assertEqual(["index0", "index1", "index2"], [item["indexName"] for item in res["items"]])
+        self.assertEqual([{"acknowledged": True, "index": f"index{i}"} for i in range(3)],
+                         [item["response"] for item in res["items"]])
+        self.assertEqual({"model": "hf/e5-base-v2"}, mock_post.call_args.kwargs["body"])
+        mock_get.assert_not_called()
+
+    def test_partial_failure(self):
+        def post(path, body=None, **kwargs):
+            if path == "indexes/taken":
+                raise IndexAlreadyExistsError("index taken already exists")
+            return {"acknowledged": True}
+
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=post):
+            res = self.client.create_indexes([{"index_name": "taken"}, {"index_name": "new"}])
+        self.assertTrue(res["errors"])
+        self.assertEqual({"indexName": "taken", "response": None, "error": "index taken already exists"},
+                         res["items"][0])
+        self.assertEqual({"indexName": "new", "response": {"acknowledged": True}}, res["items"][1])
+
+    def test_invalid_spec_only_fails_its_own_index(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", return_value={"acknowledged": True}) as mock_post:
+            res = self.client.create_indexes([{"index_name": "a"}, {"index_name": "bad", "not_a_setting": 1},
+                                              {"index_name": "bad-type", "type": "no-such-type"},
+                                              {"index_name": "c"}], max_workers=1)
+        self.assertTrue(res["errors"])
+        self.assertEqual(["a", "bad", "bad-type", "c"], [item["indexName"] for item in res["items"]])
+        self.assertEqual([{"acknowledged": True}, None, None, {"acknowledged": True}],
+                         [item["response"] for item in res["items"]])
+        self.assertIn("TypeError", res["items"][1]["error"])
+        self.assertIn("ValidationError", res["items"][2]["error"])
+        self.assertEqual(["indexes/a", "indexes/c"], [call.args[0] for call in mock_post.call_args_list])
+
+    def test_client_errors_are_not_reported_as_index_errors(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post", side_effect=AttributeError("bug")):
+            with self.assertRaises(AttributeError):
+                self.client.create_indexes([{"index_name": "a"}, {"index_name": "b"}])
+
+    def test_cloud_create_waits_for_all_indexes_together(self):
+        self.make_cloud()
+        polls = [list_response(a="CREATING", b="CREATING"), list_response(a="READY", b="FAILED")]
+        with mock.patch("marqo._httprequests.HttpRequests.post", return_value={"acknowledged": True}), \
+                mock.patch("marqo._httprequests.HttpRequests.get", side_effect=polls) as mock_get:
+            res = self.client.create_indexes([{"index_name": "a"}, {"index_name": "b"}])
+        self.assertEqual(2, mock_get.call_count)
+        mock_get.assert_called_with("indexes")
+        self.assertTrue(res["errors"])
+        self.assertEqual("READY", res["items"][0]["indexStatus"])
+        self.assertNotIn("error", res["items"][0])
+        self.assertEqual("FAILED", res["items"][1]["indexStatus"])
+        self.assertIn("FAILED", res["items"][1]["error"])
+
+    def test_cloud_delete_timeout_is_reported_per_index(self):
+        self.make_cloud()
+        with mock.patch("marqo._httprequests.HttpRequests.delete", return_value={"acknowledged": True}), \
+                mock.patch("marqo._httprequests.HttpRequests.get", return_value=list_response(a="DELETING")), \
+                mock.patch("marqo.cloud_helpers.time.monotonic", side_effect=[0, 1, 2, 3]):
+            res = self.client.delete_indexes(["a", "b"], timeout=1.5)
+        self.assertTrue(res["errors"])
+        self.assertEqual("DELETING", res["items"][0]["indexStatus"])
+        self.assertIn("error", res["items"][0])
+        self.assertEqual("DELETED", res["items"][1]["indexStatus"])
+        self.assertNotIn("error", res["items"][1])
+
+    def test_invalid_names(self):
+        for indexes in ([{"model": "x"}], [{"index_name": "a"}, {"index_name": "a"}]):
+            with self.subTest(indexes=indexes), self.assertRaises(InvalidArgError):
+                self.client.create_indexes(indexes)
+        with self.assertRaises(InvalidArgError):
+            self.client.delete_indexes(["a", ""])
@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pytest import mark
+
+from marqo.rate_limiter import RateLimit, TokenBucket, throttle
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestTokenBucket(unittest.TestCase):
+
+    def test_reserve_within_capacity_does_not_wait(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        for _ in range(5):
+            self.assertEqual(0.0, bucket.reserve(1))
+
+    def test_reserve_over_capacity_waits_for_debt(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.reserve(5)
+        wait = bucket.reserve(5)
+        self.assertAlmostEqual(0.5, wait, delta=0.05)
+
+    def test_reserve_larger_than_capacity_is_admitted(self):
+        bucket = TokenBucket(rate=100, capacity=10)
+        wait = bucket.reserve(50)
+        self.assertAlmostEqual(0.4, wait, delta=0.05)
+
+    def test_invalid_rate(self):
+        for rate in [0, -1]:
+            with self.subTest(rate=rate):
+                with self.assertRaises(ValueError):
+                    TokenBucket(rate=rate)
+
+
+@mark.fixed
+class TestRateLimit(unittest.TestCase):
+
+    def test_threads_share_one_budget(self):
+        limit = RateLimit(requests_per_second=20, burst_seconds=0.25)
+        start = time.monotonic()
+
+        def worker():
+            for _ in range(5):
+                limit.acquire()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 20 requests, 5 allowed as a burst, 15 more at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.7)
+
+    def test_throttle_serialises_body_only_when_counting_bytes(self):
+        body = {"documents": [{"_id": "1", "title": "hello"}]}
+        self.assertIs(body, throttle(RateLimit(docs_per_second=100), body, num_docs=1))
+        self.assertIs(body, throttle(None, body, num_docs=1))
+
+        serialised = throttle(RateLimit(bytes_per_second=10_000), body, num_docs=1)
+        self.assertEqual(json.dumps(body), serialised)
+
+    def test_throttle_counts_bytes(self):
+        limit = RateLimit(bytes_per_second=100)
+        with mock.patch.object(limit, "acquire") as mock_acquire:
+            throttle(limit, "x" * 42, num_docs=3)
+        mock_acquire.assert_called_once_with(num_docs=3, num_bytes=42)
+
+
+@mark.fixed
+class TestIndexRateLimiting(OfflineTestCase):
+
+    def setUp(self):
+        self.ingest_rate_limit = RateLimit(docs_per_second=1000)
+        self.search_rate_limit = RateLimit(requests_per_second=1000)
+        self.client_kwargs = {"ingest_rate_limit": self.ingest_rate_limit,
+                              "search_rate_limit": self.search_rate_limit}
+        super().setUp()
+
+    def test_batched_add_documents_acquires_per_batch(self):
+        docs = [{"_id": str(i), "text": "hello"} for i in range(10)]
+        with mock.patch.object(self.ingest_rate_limit, "acquire") as mock_acquire, \
+                mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"errors": False, "items": [], "processingTimeMs": 1}
+            self.index.add_documents(docs, client_batch_size=4, tensor_fields=["text"])
+
+        self.assertEqual([mock.call(num_docs=4, num_bytes=0), mock.call(num_docs=4, num_bytes=0),
+                          mock.call(num_docs=2, num_bytes=0)], mock_acquire.call_args_list)
+        self.assertEqual(3, mock_post.call_count)
+
+    def test_batched_update_documents_acquires_per_batch(self):
+        docs = [{"_id": str(i), "price": i} for i in range(5)]
+        with mock.patch.object(self.ingest_rate_limit, "acquire") as mock_acquire, \
+                mock.patch("marqo._httprequests.HttpRequests.patch") as mock_patch:
+            mock_patch.return_value = {"errors": False, "items": [], "processingTimeMs": 1}
+            self.index.update_documents(docs, client_batch_size=3)
+
+        self.assertEqual([mock.call(num_docs=3, num_bytes=0), mock.call(num_docs=2, num_bytes=0)],
+                         mock_acquire.call_args_list)
+
+    def test_search_acquires_from_search_limit(self):
+        with mock.patch.object(self.search_rate_limit, "acquire") as mock_search_acquire, \
+                mock.patch.object(self.ingest_rate_limit, "acquire") as mock_ingest_acquire, \
+                mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"hits": []}
+            self.index.search("hello")
+
+        mock_search_acquire.assert_called_once_with(num_docs=1, num_bytes=0)
+        mock_ingest_acquire.assert_not_called()
@@ -0,0 +1,45 @@
+import json
+from unittest import mock
+
+from pytest import mark
+
+from marqo.errors import InvalidArgError, MarqoWebError
+from marqo.results import RawResponse
+from tests.offline_test import OfflineTestCase, make_response
+
+
+@mark.fixed
+class TestRawResponses(OfflineTestCase):
+
+    def test_search_raw(self):
+        body = {"hits": [{"_id": "1", "_score": 1.0}], "query": "hello"}
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response(body)
+            res = self.index.search("hello", raw=True)
+        self.assertIsInstance(res, RawResponse)
+        self.assertEqual(json.dumps(body).encode("utf-8"), res.content)
+        self.assertEqual("application/json", res.content_type)
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(body, res.json())
+
+    def test_bulk_search_and_get_documents_raw(self):
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response({"result": []})
+            self.assertIsInstance(self.client.bulk_search([{"index": "my-index", "q": "a"}], raw=True), RawResponse)
+            mock_request.return_value = make_response({"results": []})
+            self.assertIsInstance(self.index.get_documents(["1"], raw=True), RawResponse)
+
+    def test_errors_are_raised_as_usual(self):
+        error = {"message": "index not found", "code": "index_not_found", "type": "invalid_request"}
+        with mock.patch("requests.sessions.Session.request") as mock_request:
+            mock_request.return_value = make_response(error, status_code=404)
+            with self.assertRaises(MarqoWebError) as cm:
+                self.index.search("hello", raw=True)
+        self.assertEqual("index_not_found", cm.exception.code)
+        self.assertEqual(404, cm.exception.status_code)
+
+    def test_invalid_combinations(self):
+        with self.assertRaises(InvalidArgError):
+            self.index.search("hello", raw=True, typed=True)
+        with self.assertRaises(InvalidArgError):
+            self.index.get_documents(["1"], raw=True, embedding_format="numpy")
@@ -0,0 +1,82 @@
+import json
+import unittest
+from array import array
+from unittest import mock
+
+from pytest import mark
+
+from marqo.results import Hit, SearchResult
+from tests.offline_test import OfflineTestCase
+
+
+def search_response(num_hits):
+    return {
+        "hits": [
+            {"_id": f"doc{i}", "title": f"title {i}", "tags": ["a", "ü"], "_highlights": [{"title": f"title {i}"}],
+             "_score": 1.0 - i / 10}
+            for i in range(num_hits)
+        ],
+        "query": "hello", "limit": 10, "offset": 0, "processingTimeMs": 12.5,
+    }
+
+
+@mark.fixed
+class TestSearchResult(unittest.TestCase):
+
+    def test_hits(self):
+        result = SearchResult.from_response(search_response(3))
+        self.assertEqual(3, len(result))
+        self.assertEqual(["doc0", "doc1", "doc2"], result.ids)
+        self.assertIsInstance(result.scores, array)
+        self.assertEqual([1.0, 0.9, 0.8], list(result.scores))
+        hit = result[1]
+        self.assertEqual(("doc1", 0.9), (hit.id, hit.score))
+        self.assertEqual("title 1", hit["title"])
+        self.assertEqual(["a", "ü"], hit.get("tags"))
+        self.assertIsNone(hit.get("missing"))
+        self.assertEqual([{"title": "title 1"}], hit.highlights)
+        self.assertEqual("doc2", result[-1]["_id"])
+        self.assertEqual(["doc1", "doc2"], [hit.id for hit in result[1:]])
+        with self.assertRaises(IndexError):
+            result[3]
+
+    def test_round_trip(self):
+        response = search_response(4)
+        result = SearchResult.from_response(json.loads(json.dumps(response)))
+        self.assertEqual(response, result.to_dict())
+        self.assertEqual(("hello", 12.5), (result.query, result.processing_time_ms))
+
+    def test_decoded_values_are_reused(self):
+        response = search_response(1)
+        hit = SearchResult.from_response(response)[0]
+        self.assertIs(hit.fields, hit.fields)
+        self.assertIs(response["hits"][0]["tags"], hit["tags"])
+
+    def test_hits_are_slotted(self):
+        hit = SearchResult.from_response(search_response(1))[0]
+        self.assertIsInstance(hit, Hit)
+        with self.assertRaises(AttributeError):
+            hit.extra = 1
+
+    def test_empty_result(self):
+        result = SearchResult.from_response({"hits": []})
+        self.assertEqual(0, len(result))
+        self.assertEqual([], list(result))
+
+
+@mark.fixed
+class TestTypedSearch(OfflineTestCase):
+
+    def test_search_typed(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = search_response(2)
+            result = self.client.index("my-index").search("hello", typed=True)
+        self.assertIsInstance(result, SearchResult)
+        self.assertEqual("title 1", result[1]["title"])
+
+    def test_bulk_search_typed(self):
+        with mock.patch("marqo._httprequests.HttpRequests.post") as mock_post:
+            mock_post.return_value = {"result": [search_response(2), search_response(1)]}
+            res = self.client.bulk_search([{"index": "my-index", "q": "a"}, {"index": "my-index", "q": "b"}],
+                                          typed=True)
+        self.assertEqual([2, 1], [len(result) for result in res["result"]])
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from pytest import mark
+
+from marqo.errors import InvalidArgError
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestSearchIter(OfflineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # 25 hits with scores 1.0, 0.96, 0.92, ...
+        self.hits = [{"_id": f"doc{i}", "_score": 1.0 - i * 0.04} for i in range(25)]
+        self.search_bodies = []
+        self.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post)
+
+    def _fake_post(self, path, body, index_name):
+        self.search_bodies.append(body)
+        return {"hits": self.hits[body["offset"]:body["offset"] + body["limit"]]}
+
+    def test_iterates_over_all_hits(self):
+        hits = list(self.index.search_iter("hello", page_size=10, search_method="LEXICAL"))
+        self.assertEqual(self.hits, hits)
+        self.assertEqual([(0, 10), (10, 10), (20, 10)],
+                         [(body["offset"], body["limit"]) for body in self.search_bodies])
+        self.assertTrue(all(body["searchMethod"] == "LEXICAL" for body in self.search_bodies))
+
+    def test_max_results(self):
+        hits = list(self.index.search_iter("hello", page_size=10, max_results=12))
+        self.assertEqual(self.hits[:12], hits)
+        self.assertEqual([(0, 10), (10, 2)], [(body["offset"], body["limit"]) for body in self.search_bodies])
+
+    def test_min_score_stops_without_fetching_more_pages(self):
+        hits = list(self.index.search_iter("hello", page_size=5, min_score=0.7))
+        self.assertEqual(self.hits[:8], hits)
+        self.assertEqual(2, len(self.search_bodies))
+
+    def test_max_search_offset_warns(self):
+        with mock.patch("marqo.index.mq_logger.warning") as mock_warning:
+            hits = list(self.index.search_iter("hello", page_size=10, max_search_offset=15))
+        self.assertEqual(self.hits[:15], hits)
+        mock_warning.assert_called_once()
+
+    def test_stopping_early(self):
+        hits = self.index.search_iter("hello", page_size=5)
+        self.assertEqual(self.hits[0], next(hits))
+        hits.close()
+        self.assertLessEqual(len(self.search_bodies), 2)
+
+    def test_invalid_arguments(self):
+        for kwargs in [{"page_size": 0}, {"max_results": -1}, {"limit": 5}, {"offset": 5},
+                       {"typed": True}, {"raw": True}]:
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(InvalidArgError):
+                    self.index.search_iter("hello", **kwargs)
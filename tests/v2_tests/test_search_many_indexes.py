@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from typing import Optional
+
+from pytest import mark
+
+from marqo.errors import InvalidArgError
+from marqo.instance_mappings import InstanceMappings
+from tests.offline_test import OfflineTestCase
+
+
+class ClusterMappings(InstanceMappings):
+    """Maps each index to one of several fake clusters"""
+
+    def __init__(self, index_to_cluster):
+        self.index_to_cluster = index_to_cluster
+
+    def get_index_base_url(self, index_name: str) -> str:
+        return self.index_to_cluster[index_name]
+
+    def get_control_base_url(self, path: str = "") -> str:
+        return "http://control"
+
+    def is_remote(self):
+        return False
+
+    def is_index_usage_allowed(self, index_name: str) -> bool:
+        return True
+
+    def index_http_error_handler(self, index_name: str, http_status: Optional[int] = None) -> None:
+        pass
+
+
+@mark.fixed
+class TestSearchManyIndexes(OfflineTestCase):
+
+    index_name = "a"
+
+    def setUp(self):
+        self.mappings = ClusterMappings({"a": "http://cluster1", "b": "http://cluster1", "c": "http://cluster2"})
+        self.client_kwargs = {"url": None, "instance_mappings": self.mappings}
+        super().setUp()
+        self.scores = {"a": [0.9, 0.5, 0.1], "b": [0.8, 0.7], "c": [30.0, 10.0]}
+        self.requests = []
+        self.lock = threading.Lock()
+
+        self.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post)
+
+    def _fake_post(self, path, body, index_name):
+        queries = json.loads(body)["queries"]
+        with self.lock:
+            self.requests.append((self.mappings.get_index_base_url(index_name), [q["index"] for q in queries]))
+        time.sleep(0.2)
+        return {"result": [
+            {"hits": [{"_id": f"{q['index']}{i}", "_score": score}
+                      for i, score in enumerate(self.scores[q["index"]][:q["limit"]])]}
+            for q in queries
+        ]}
+
+    def test_one_request_per_cluster_sent_concurrently(self):
+        start = time.monotonic()
+        self.client.search_many_indexes("hello", ["a", "b", "c"], limit=3)
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual([("http://cluster1", ["a", "b"]), ("http://cluster2", ["c"])], sorted(self.requests))
+
+    def test_raw_scores_are_merged(self):
+        res = self.client.search_many_indexes("hello", ["a", "b", "c"], limit=4)
+        self.assertEqual(["c0", "c1", "a0", "b0"], [hit["_id"] for hit in res["hits"]])
+        self.assertEqual(["c", "c", "a", "b"], [hit["_index"] for hit in res["hits"]])
+
+    def test_max_normalization(self):
+        res = self.client.search_many_indexes("hello", ["a", "b", "c"], limit=4, normalize_scores="max")
+        self.assertEqual(["a0", "b0", "c0", "b1"], [hit["_id"] for hit in res["hits"]])
+        self.assertEqual([1.0, 1.0, 1.0, 0.875], [round(hit["_score"], 6) for hit in res["hits"]])
+        self.assertEqual(30.0, res["hits"][2]["_raw_score"])
+
+    def test_max_normalization_of_non_positive_scores(self):
+        self.scores.update(a=[-0.2, -0.6, -1.0], b=[0.0, -0.5])
+        res = self.client.search_many_indexes("hello", ["a", "b", "c"], limit=10, normalize_scores="max")
+        self.assertEqual(["a0", "b0", "c0", "a1", "c1", "a2", "b1"], [hit["_id"] for hit in res["hits"]])
+        self.assertEqual([1.0, 1.0, 1.0, 0.5, 0.333333, 0.0, 0.0], [round(hit["_score"], 6) for hit in res["hits"]])
+        self.assertEqual(-0.6, res["hits"][3]["_raw_score"])
+
+    def test_minmax_normalization(self):
+        res = self.client.search_many_indexes("hello", ["a", "c"], limit=10, normalize_scores="minmax")
+        self.assertEqual([1.0, 1.0, 0.5, 0.0, 0.0], [hit["_score"] for hit in res["hits"]])
+
+    def test_invalid_arguments(self):
+        for kwargs in [{"index_names": []}, {"index_names": ["a", "a"]},
+                       {"index_names": ["a"], "normalize_scores": "zscore"}]:
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(InvalidArgError):
+                    self.client.search_many_indexes("hello", **kwargs)
+
+
+@mark.fixed
+class TestBulkSearchPlanner(OfflineTestCase):
+
+    index_name = "a"
+
+    def setUp(self):
+        self.mappings = ClusterMappings({"a": "http://cluster1", "b": "http://cluster1", "c": "http://cluster2"})
+        self.client_kwargs = {"url": None, "instance_mappings": self.mappings}
+        super().setUp()
+        self.requests = []
+        self.lock = threading.Lock()
+
+        self.patch("marqo._httprequests.HttpRequests.post", side_effect=self._fake_post)
+
+    def _fake_post(self, path, body, index_name):
+        queries = json.loads(body)["queries"]
+        with self.lock:
+            self.requests.append((self.mappings.get_index_base_url(index_name), [q["q"] for q in queries]))
+        time.sleep(0.2)
+        return {"result": [{"hits": [], "query": q["q"]} for q in queries], "processingTimeMs": 1}
+
+    def queries(self, *indexes):
+        return [{"index": index, "q": f"{index}{position}"} for position, index in enumerate(indexes)]
+
+    def test_mixed_clusters_are_rejected_by_default(self):
+        with self.assertRaises(InvalidArgError):
+            self.client.bulk_search(self.queries("a", "c"))
+
+    def test_split_by_cluster_restores_order(self):
+        start = time.monotonic()
+        res = self.client.bulk_search(self.queries("c", "a", "c", "b"), split_by_cluster=True)
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(["c0", "a1", "c2", "b3"], [result["query"] for result in res["result"]])
+        self.assertEqual([("http://cluster1", ["a1", "b3"]), ("http://cluster2", ["c0", "c2"])],
+                         sorted(self.requests))
+
+    def test_groups_are_split_into_batches(self):
+        res = self.client.bulk_search(self.queries("a", "b", "a", "c", "a"), split_by_cluster=True,
+                                      client_batch_size=2, client_concurrency=1)
+        self.assertEqual(["a0", "b1", "a2", "c3", "a4"], [result["query"] for result in res["result"]])
+        self.assertEqual([("http://cluster1", ["a0", "b1"]), ("http://cluster1", ["a2", "a4"]),
+                          ("http://cluster2", ["c3"])], self.requests)
+
+    def test_invalid_queries_fail_before_any_request(self):
+        with self.assertRaises(InvalidArgError):
+            self.client.bulk_search(self.queries("a", "c") + [{"index": "a", "limit": "many"}], split_by_cluster=True)
+        self.assertEqual([], self.requests)
+
+    def test_invalid_arguments(self):
+        for kwargs in [{"split_by_cluster": True, "raw": True}, {"client_batch_size": 0},
+                       {"split_by_cluster": True, "client_concurrency": 0}]:
+            with self.subTest(kwargs=kwargs), self.assertRaises(InvalidArgError):
+                self.client.bulk_search(self.queries("a"), **kwargs)
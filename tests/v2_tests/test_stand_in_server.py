@@ -0,0 +1,66 @@
+import unittest
+
+from pytest import mark
+
+from marqo.client import Client
+from marqo.errors import MarqoWebError
+from marqo.marqo_cloud_instance_mappings import MarqoCloudInstanceMappings
+from marqo.results import SearchResult
+from tests.marqo_stand_in import MarqoStandIn
+
+
+@mark.fixed
+class TestStandInServer(unittest.TestCase):
+    """End-to-end client calls against the local Marqo stand-in"""
+
+    def setUp(self):
+        self.server = MarqoStandIn(hits_per_query=5, hit_bytes=10).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.client.create_index("my-index")
+        self.index = self.client.index("my-index")
+
+    def test_documents_round_trip(self):
+        self.index.add_documents([{"_id": str(i), "title": f"doc {i}"} for i in range(5)],
+                                 tensor_fields=["title"], client_batch_size=2)
+        self.index.update_documents([{"_id": "1", "title": "updated"}, {"_id": "2", "title": "updated"}],
+                                    client_batch_size=1, client_concurrency=2)
+        self.index.delete_documents(["0"])
+
+        res = self.index.get_documents(["0", "1", "3"])
+        self.assertEqual([False, True, True], [doc["_found"] for doc in res["results"]])
+        self.assertEqual("updated", res["results"][1]["title"])
+        self.assertEqual("doc 3", self.index.get_document("3")["title"])
+        self.assertEqual(4, self.index.get_stats()["numberOfDocuments"])
+
+    def test_search_and_bulk_search(self):
+        res = self.index.search("hello", limit=3, attributes_to_retrieve=["_id"])
+        self.assertEqual(["0", "1", "2"], [hit["_id"] for hit in res["hits"]])
+        self.assertNotIn("text", res["hits"][0])
+
+        res = self.client.bulk_search([{"index": "my-index", "q": "a", "limit": 10},
+                                       {"index": "my-index", "q": "b", "limit": 1}], typed=True)
+        self.assertIsInstance(res["result"][0], SearchResult)
+        self.assertEqual([5, 1], [len(result) for result in res["result"]])
+
+    def test_errors(self):
+        with self.assertRaises(MarqoWebError) as cm:
+            self.client.create_index("my-index")
+        self.assertEqual("index_already_exists", cm.exception.code)
+        with self.assertRaises(MarqoWebError) as cm:
+            self.client.index("missing").search("hello")
+        self.assertEqual(404, cm.exception.status_code)
+
+    def test_cloud_mappings(self):
+        mappings = MarqoCloudInstanceMappings(self.server.url, api_key="key")
+        self.assertEqual(self.server.url, mappings.get_index_base_url("my-index"))
+        cloud_client = Client(url=None, instance_mappings=mappings, api_key="key")
+        self.assertEqual(["my-index"], [index["indexName"] for index in cloud_client.get_indexes()["results"]])
+
+    def test_latency(self):
+        self.server.latency = 0.05
+        self.index.search("hello")
+        requests_before = self.server.request_count
+        res = self.client.bulk_search([{"index": "my-index", "q": "a"}], client_batch_size=1)
+        self.assertEqual(1, self.server.request_count - requests_before)
+        self.assertEqual(50, res["result"][0]["processingTimeMs"])
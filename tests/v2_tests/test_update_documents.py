@@ -0,0 +1,75 @@
+import threading
+import time
+from unittest import mock
+
+from pytest import mark
+
+from marqo.errors import InvalidArgError
+from tests.offline_test import OfflineTestCase
+
+
+@mark.fixed
+class TestBatchUpdateDocuments(OfflineTestCase):
+
+    def test_concurrent_batches_return_results_in_order(self):
+        def patch(path, body, index_name):
+            ids = [doc["_id"] for doc in body["documents"]]
+            # make earlier batches slower, so they complete last
+            time.sleep(0.05 * (10 - int(ids[0])) / 10)
+            return {"errors": False, "items": [{"_id": _id} for _id in ids], "processingTimeMs": 1}
+
+        docs = [{"_id": str(i), "price": i} for i in range(10)]
+        with mock.patch("marqo._httprequests.HttpRequests.patch", side_effect=patch):
+            results = self.index.update_documents(docs, client_batch_size=2, client_concurrency=4)
+
+        self.assertEqual([[str(i), str(i + 1)] for i in range(0, 10, 2)],
+                         [[item["_id"] for item in res["items"]] for res in results])
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def patch(path, body, index_name):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return {"errors": False, "items": [], "processingTimeMs": 1}
+
+        docs = [{"_id": str(i), "price": i} for i in range(40)]
+        with mock.patch("marqo._httprequests.HttpRequests.patch", side_effect=patch) as mock_patch:
+            self.index.update_documents(docs, client_batch_size=2, client_concurrency=3)
+
+        self.assertEqual(20, mock_patch.call_count)
+        self.assertLessEqual(max_in_flight, 3)
+        self.assertGreater(max_in_flight, 1)
+
+    def test_batches_sharing_an_id_are_sent_in_order(self):
+        sent = []
+
+        def patch(path, body, index_name):
+            docs = body["documents"]
+            if docs[0]["_id"] == "a":
+                # the first update of "a" is slow, the second one must still be sent after it
+                time.sleep(0.1)
+            sent.append([(doc["_id"], doc["price"]) for doc in docs])
+            return {"errors": False, "items": [], "processingTimeMs": 1}
+
+        docs = [{"_id": "a", "price": 1}, {"_id": "b", "price": 1},
+                {"_id": "c", "price": 1}, {"_id": "a", "price": 2}]
+        with mock.patch("marqo._httprequests.HttpRequests.patch", side_effect=patch):
+            self.index.update_documents(docs, client_batch_size=1, client_concurrency=4)
+
+        updates_of_a = [batch[0][1] for batch in sent if batch[0][0] == "a"]
+        self.assertEqual([1, 2], updates_of_a)
+
+    def test_invalid_client_concurrency(self):
+        for client_concurrency in [0, -1, 1.5]:
+            with self.subTest(client_concurrency=client_concurrency):
+                with self.assertRaises(InvalidArgError):
+                    self.index.update_documents([{"_id": "1"}], client_batch_size=1,
+                                                client_concurrency=client_concurrency)
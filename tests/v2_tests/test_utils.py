@@ -57,3 +57,14 @@ class TestUtils(unittest.TestCase):
         ]
         expected = "key=John+Doe+%26+Jane+Smith&key=email%40example.com&key=100%25+free&key=file%2Fpath%2Fname.txt&key=query%3Fparam%3Dvalue&key=color%3Ablue&key=name%5B0%5D%3DJohn&key=price%3D20%24+%28discounted%29&key=comment%3DHello%2C+world%21&key=math%3D3%2B2%3D5&key=John%23Doe&key=note%3Eimportant%3Creminder&key=text%2Abold%2A&key=a%5E2+%2B+b%5E2+%3D+c%5E2&key=a%7Cb%7Cc&key=%7Bx%3A+1%2C+y%3A+2%7D&key=a~b&key=a%60b&key=text%5Cexample&key=quote%3A+%22hello+world%22&key=quote%3A+%27hello+world%27&key=John%3BDoe"
         assert expected == utils.convert_list_to_query_params(q, values)
+
+    def test_chunk_iterable(self):
+        test_cases = [
+            (range(5), 2, [[0, 1], [2, 3], [4]]),
+            (range(4), 2, [[0, 1], [2, 3]]),
+            ([], 3, []),
+            ((x for x in "abc"), 5, [["a", "b", "c"]]),
+        ]
+        for iterable, chunk_size, expected in test_cases:
+            with self.subTest(chunk_size=chunk_size, expected=expected):
+                assert expected == list(utils.chunk_iterable(iterable, chunk_size))